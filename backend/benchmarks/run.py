@@ -0,0 +1,430 @@
+"""
+Throughput benchmarks for the solvers, the API and project I/O.
+
+    cd backend
+    python -m benchmarks.run                   # run everything, compare with benchmarks/baseline.json
+    python -m benchmarks.run -k irregular      # only benchmarks whose name contains "irregular"
+    python -m benchmarks.run --threshold 0.4   # flag drops of more than 40 % in ops/sec
+    python -m benchmarks.run --save-baseline   # record this machine's numbers as the baseline
+
+Each benchmark reports operations per second (rows per second for batch paths) and
+percentiles of single-call latency. The exit status is 1 when any benchmark is slower than
+its baseline by more than the threshold, so the runner can gate CI. Baselines are
+machine specific: record one on the machine that runs the comparison.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from hydro_agent.core.curb_inlets.on_grade import solve_curb_inlet_on_grade, solve_curb_inlet_on_grade_batch
+from hydro_agent.core.curb_inlets.schemas import CurbInletOnGradeInput
+from hydro_agent.core.manning.channels import (
+    calculate_irregular_geometry,
+    solve_normal_depth,
+    solve_normal_depth_batch,
+)
+from hydro_agent.core.manning.hydrograph import solve_hydrograph
+from hydro_agent.core.manning.rating import rating_curve
+from hydro_agent.core.manning.schemas import ChannelInput, ChannelType, HydrographInput, RatingCurveInput, SolveFor
+from hydro_agent.core.spread import solve_spread, solve_spread_batch
+from hydro_agent.projects.models import Project, Scenario
+from hydro_agent.projects.streaming import ProjectReader
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# Allowed drop in ops/sec before a benchmark counts as a regression
+DEFAULT_THRESHOLD = 0.25
+# Each timed sample repeats the workload for at least this long, so fast calls are measurable
+MIN_SAMPLE_TIME = 1e-3
+
+BATCH_ROWS = 10_000
+PROJECT_SCENARIOS = 2_000
+
+
+class Benchmark(NamedTuple):
+    name: str
+    setup: Callable[[str], Callable[[], object]]  # workdir -> workload
+    rows: int = 1  # items processed per call
+
+
+class Measurement(NamedTuple):
+    ops_per_sec: float
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    samples: int
+
+
+class Comparison(NamedTuple):
+    name: str
+    ratio: float  # current / baseline ops_per_sec
+    threshold: float
+    regressed: bool
+
+
+# --- Workloads -------------------------------------------------------------
+
+
+def _prismatic(channel_type: ChannelType, **dimensions) -> Callable[[str], Callable[[], object]]:
+    def setup(workdir):
+        params = ChannelInput(type=channel_type, discharge=150.0, slope=0.002, mannings_n=0.015, **dimensions)
+        return lambda: solve_normal_depth(params)
+    return setup
+
+
+def _valley(count: int):
+    """A smooth valley cross-section of `count` (station, elevation) points."""
+    stations = np.linspace(0.0, 200.0, count)
+    elevations = 10.0 * ((stations - 100.0) / 100.0) ** 2 + 0.2 * np.sin(stations / 7.0)
+    return [(float(x), float(z)) for x, z in zip(stations, elevations)]
+
+
+def _irregular_geometry(count: int):
+    def setup(workdir):
+        points = _valley(count)
+        return lambda: calculate_irregular_geometry(3.0, points)
+    return setup
+
+
+def _irregular_solve(count: int):
+    def setup(workdir):
+        params = ChannelInput(
+            type=ChannelType.IRREGULAR, discharge=800.0, slope=0.001, mannings_n=0.035,
+            station_elevation_points=_valley(count),
+        )
+        return lambda: solve_normal_depth(params)
+    return setup
+
+
+def _irregular_rating(count: int, simplify_tolerance=None):
+    def setup(workdir):
+        points = np.array(_valley(count))
+        params = RatingCurveInput(
+            channel=ChannelInput(
+                type=ChannelType.IRREGULAR, slope=0.001, mannings_n=0.035,
+                stations=points[:, 0], elevations=points[:, 1], simplify_tolerance=simplify_tolerance,
+            ),
+        )
+        return lambda: rating_curve(params)
+    return setup
+
+
+def _gutter(workdir):
+    params = ChannelInput(
+        type=ChannelType.GUTTER, solve_for=SolveFor.SPREAD, discharge=4.0, slope=0.01, mannings_n=0.016,
+        gutter_width=2.0, gutter_cross_slope=0.06, road_cross_slope=0.02,
+    )
+    return lambda: solve_normal_depth(params)
+
+
+def _spread(workdir):
+    return lambda: solve_spread(4.0, 0.01, 0.016, 2.0, 0.06, 0.02)
+
+
+def _curb_inlet_params(discharge: float = 6.0) -> CurbInletOnGradeInput:
+    return CurbInletOnGradeInput(
+        discharge_cfs=discharge, longitudinal_slope=0.01, gutter_width_ft=2.0, gutter_cross_slope=0.06,
+        road_cross_slope=0.02, mannings_n=0.016, curb_opening_length_ft=10.0, local_depression_depth_in=2.0,
+    )
+
+
+def _curb_inlet(workdir):
+    params = _curb_inlet_params()
+    return lambda: solve_curb_inlet_on_grade(params)
+
+
+def _batch_discharge() -> np.ndarray:
+    return np.random.default_rng(0).uniform(1.0, 500.0, BATCH_ROWS)
+
+
+def _channel_batch(workdir):
+    Q = _batch_discharge()
+    return lambda: solve_normal_depth_batch(Q, 10.0, 2.0, 2.0, 0.001, 0.013)
+
+
+def _hydrograph(workdir):
+    params = HydrographInput(
+        channel=ChannelInput(type=ChannelType.TRAPEZOIDAL, bottom_width=10.0, side_slope=2.0, slope=0.001, mannings_n=0.013),
+        discharge=_batch_discharge(),
+    )
+    return lambda: solve_hydrograph(params)
+
+
+def _spread_batch(workdir):
+    Q = _batch_discharge() / 50.0
+    return lambda: solve_spread_batch(Q, 0.01, 0.016, 2.0, 0.06, 0.02)
+
+
+def _curb_inlet_batch(workdir):
+    Q = _batch_discharge() / 50.0
+    return lambda: solve_curb_inlet_on_grade_batch(Q, 0.01, 2.0, 0.06, 0.02, 0.016, 10.0, 2.0)
+
+
+def _client():
+    from fastapi.testclient import TestClient
+    from hydro_agent.api.main import app
+    return TestClient(app)
+
+
+def _api_channel_solve(workdir):
+    client = _client()
+    body = {"type": "trapezoidal", "bottom_width": 10, "side_slope": 2, "slope": 0.001, "mannings_n": 0.013}
+    # A new discharge every call, so the result cache never answers
+    discharges = itertools.count(1)
+
+    def run():
+        response = client.post("/api/manning/channels/solve", json={**body, "discharge": 1.0 + next(discharges) * 1e-6})
+        response.raise_for_status()
+    return run
+
+
+def _api_solve_batch(workdir):
+    client = _client()
+    rows = [
+        {"type": "trapezoidal", "discharge": float(q), "bottom_width": 10, "side_slope": 2, "slope": 0.001, "mannings_n": 0.013}
+        for q in _batch_discharge()[:1000]
+    ]
+    payload = json.dumps(rows)
+
+    def run():
+        response = client.post("/api/manning/channels/solve-batch", content=payload, headers={"content-type": "application/json"})
+        response.raise_for_status()
+    return run
+
+
+def _project(count: int = PROJECT_SCENARIOS) -> Project:
+    scenarios = [
+        Scenario(id=f"s{i}", title=f"Channel {i}", inputs={
+            "type": "trapezoidal", "discharge": 10.0 + i, "width": 10, "leftSideSlope": 2, "rightSideSlope": 2,
+            "slope": 0.001, "manningsN": 0.013, "units": "imperial",
+        })
+        for i in range(count)
+    ]
+    project = Project(name="Benchmark", scenarios=scenarios)
+    project.solve_all(workers=1)
+    return project
+
+
+def _project_save(workdir):
+    project = _project()
+    path = os.path.join(workdir, "save.json")
+    return lambda: project.save_to_file(path, stream=True, save_index=True)
+
+
+def _saved_project(workdir) -> str:
+    path = os.path.join(workdir, "load.json")
+    if not os.path.exists(path):
+        _project().save_to_file(path, stream=True, save_index=True)
+    return path
+
+
+def _project_load(workdir):
+    path = _saved_project(workdir)
+    return lambda: Project.load_from_file(path)
+
+
+def _project_reader_get(workdir):
+    path = _saved_project(workdir)
+    ids = itertools.cycle([f"s{i}" for i in range(0, PROJECT_SCENARIOS, 97)])
+
+    def run():
+        with ProjectReader(path) as reader:
+            return reader.get(next(ids))
+    return run
+
+
+def _project_solve(workdir):
+    project = _project(200)
+    return lambda: project.solve_all(workers=1, force=True)
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("channel.rectangular", _prismatic(ChannelType.RECTANGULAR, bottom_width=8.0)),
+    Benchmark("channel.trapezoidal", _prismatic(ChannelType.TRAPEZOIDAL, bottom_width=8.0, left_side_slope=2.0, right_side_slope=3.0)),
+    Benchmark("channel.triangular", _prismatic(ChannelType.TRIANGULAR, left_side_slope=3.0, right_side_slope=3.0)),
+    Benchmark("channel.gutter", _gutter),
+    Benchmark("irregular.geometry.10", _irregular_geometry(10)),
+    Benchmark("irregular.geometry.100", _irregular_geometry(100)),
+    Benchmark("irregular.geometry.5000", _irregular_geometry(5000)),
+    Benchmark("irregular.solve.10", _irregular_solve(10)),
+    Benchmark("irregular.solve.100", _irregular_solve(100)),
+    Benchmark("irregular.solve.5000", _irregular_solve(5000)),
+    Benchmark("irregular.rating.20000", _irregular_rating(20000)),
+    Benchmark("irregular.rating.20000.simplified", _irregular_rating(20000, simplify_tolerance=0.001)),
+    Benchmark("spread.solve", _spread),
+    Benchmark("curb_inlet.on_grade", _curb_inlet),
+    Benchmark("batch.channels", _channel_batch, BATCH_ROWS),
+    Benchmark("batch.hydrograph", _hydrograph, BATCH_ROWS),
+    Benchmark("batch.spread", _spread_batch, BATCH_ROWS),
+    Benchmark("batch.curb_inlets", _curb_inlet_batch, BATCH_ROWS),
+    Benchmark("api.channel_solve", _api_channel_solve),
+    Benchmark("api.solve_batch", _api_solve_batch, 1000),
+    Benchmark("project.save", _project_save, PROJECT_SCENARIOS),
+    Benchmark("project.load", _project_load, PROJECT_SCENARIOS),
+    Benchmark("project.reader_get", _project_reader_get),
+    Benchmark("project.solve_all", _project_solve, 200),
+]
+
+
+# --- Measurement -----------------------------------------------------------
+
+
+def measure(func: Callable[[], object], rows: int = 1, min_time: float = 0.5, min_samples: int = 5) -> Measurement:
+    """
+    Time func until at least min_time has elapsed and min_samples samples were taken.
+
+    Calls shorter than MIN_SAMPLE_TIME are repeated within a sample for the throughput
+    (ops/sec and mean), and each such sample also times one call on its own. Latency
+    percentiles are always over single-call times, so rare slow calls are not averaged
+    away.
+    """
+    start = time.perf_counter()
+    func()  # Warm-up: imports, caches, allocations
+    once = time.perf_counter() - start
+    repeat = max(1, int(MIN_SAMPLE_TIME / max(once, 1e-9)))
+
+    latencies: List[float] = []
+    calls = 0
+    total = 0.0
+    while total < min_time or len(latencies) < min_samples:
+        if repeat > 1:
+            start = time.perf_counter()
+            for _ in range(repeat):
+                func()
+            total += time.perf_counter() - start
+            calls += repeat
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        latencies.append(elapsed)
+        calls += 1
+        total += elapsed
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]).tolist()
+    return Measurement(calls * rows / total, total / calls, p50, p95, p99, len(latencies))
+
+
+def run_benchmarks(names: Optional[str] = None, min_time: float = 0.5) -> Dict[str, Measurement]:
+    """Run the benchmarks whose name contains `names` (all by default), in a temporary working directory."""
+    results: Dict[str, Measurement] = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for benchmark in BENCHMARKS:
+            if names and names not in benchmark.name:
+                continue
+            results[benchmark.name] = measure(benchmark.setup(workdir), benchmark.rows, min_time)
+    return results
+
+
+# --- Baselines -------------------------------------------------------------
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"benchmarks": {}}
+
+
+def save_baseline(results: Dict[str, Measurement], path: str = BASELINE_PATH, threshold: float = DEFAULT_THRESHOLD):
+    """Write results as the baseline, keeping per-benchmark thresholds and entries not re-run."""
+    baseline = load_baseline(path)
+    entries = baseline.get("benchmarks", {})
+    for name, measurement in results.items():
+        entry = {**entries.get(name, {}), **measurement._asdict()}
+        entries[name] = entry
+    data = {
+        "machine": {"python": platform.python_version(), "platform": platform.platform(), "processor": platform.machine()},
+        "threshold": baseline.get("threshold", threshold),
+        "benchmarks": dict(sorted(entries.items())),
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+        f.write("\n")
+
+
+def compare(results: Dict[str, Measurement], baseline: Dict, threshold: Optional[float] = None) -> List[Comparison]:
+    """
+    Compare ops/sec with the baseline. A benchmark regresses when its throughput falls
+    below (1 - threshold) of the baseline; the threshold is, in order of precedence,
+    the argument, the benchmark's own "threshold" entry, the file's "threshold", or
+    DEFAULT_THRESHOLD. Benchmarks missing from the baseline are skipped.
+    """
+    comparisons = []
+    entries = baseline.get("benchmarks", {})
+    for name, measurement in results.items():
+        entry = entries.get(name)
+        if not entry or not entry.get("ops_per_sec"):
+            continue
+        limit = threshold
+        if limit is None:
+            limit = entry.get("threshold", baseline.get("threshold", DEFAULT_THRESHOLD))
+        ratio = measurement.ops_per_sec / entry["ops_per_sec"]
+        comparisons.append(Comparison(name, ratio, limit, ratio < 1.0 - limit))
+    return comparisons
+
+
+def _format_time(seconds: float) -> str:
+    if seconds >= 1.0:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} µs"
+
+
+def report(results: Dict[str, Measurement], comparisons: List[Comparison]) -> str:
+    by_name = {c.name: c for c in comparisons}
+    width = max([len(name) for name in results] + [9])
+    lines = [f"{'benchmark':<{width}}  {'ops/sec':>12}  {'p50':>10}  {'p95':>10}  {'p99':>10}  vs baseline"]
+    for name, m in results.items():
+        comparison = by_name.get(name)
+        versus = ""
+        if comparison:
+            versus = f"{comparison.ratio:6.2f}x" + ("  REGRESSION" if comparison.regressed else "")
+        lines.append(
+            f"{name:<{width}}  {m.ops_per_sec:>12,.0f}  {_format_time(m.p50):>10}  "
+            f"{_format_time(m.p95):>10}  {_format_time(m.p99):>10}  {versus}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the hydro-agent performance benchmarks.")
+    parser.add_argument("-k", dest="names", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--min-time", type=float, default=0.5, help="seconds to time each benchmark (default 0.5)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--threshold", type=float, help="allowed fractional drop in ops/sec (overrides the baseline's)")
+    parser.add_argument("--save-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.names, args.min_time)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({name: m._asdict() for name, m in results.items()}, f, indent=2)
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline, args.threshold if args.threshold is not None else DEFAULT_THRESHOLD)
+        print(report(results, []))
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    comparisons = compare(results, load_baseline(args.baseline), args.threshold)
+    print(report(results, comparisons))
+    regressions = [c.name for c in comparisons if c.regressed]
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
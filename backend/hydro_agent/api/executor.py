@@ -0,0 +1,133 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Iterable, Optional
+
+from ..core.metrics import Family
+
+EXECUTOR_KINDS = ("thread", "process", "inline")
+
+
+class ExecutorBusy(Exception):
+    """The solve queue is full; the API answers 503 with Retry-After."""
+
+
+class SolveTimeout(Exception):
+    """A solve did not finish within its timeout; the API answers 504."""
+
+
+class SolveExecutor:
+    """
+    Runs blocking solver calls off the event loop with bounded concurrency.
+
+    kind "thread" (the default) or "process" runs calls on a pool of `workers`; at most
+    `max_queue` further calls wait for a worker, and run() raises ExecutorBusy instead
+    of queueing more, so an overloaded server sheds load instead of growing a backlog.
+    A call that has not finished `timeout` seconds after submission raises SolveTimeout;
+    it is cancelled if still queued, and a call already running keeps its worker slot
+    until it returns, so the concurrency limit holds. Threads keep the event loop
+    responsive (solves release the GIL between bytecodes); processes also run solves
+    in parallel, with each worker keeping its own result cache and metrics. "inline"
+    calls the function directly on the event loop, as before this executor existed.
+    """
+
+    def __init__(self, kind: str = "thread", workers: Optional[int] = None, max_queue: int = 64, timeout: Optional[float] = 30.0):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind: {kind}. Use one of {', '.join(EXECUTOR_KINDS)}.")
+        self.kind = kind
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    @classmethod
+    def from_env(cls) -> "SolveExecutor":
+        """Configured by HYDRO_AGENT_EXECUTOR, HYDRO_AGENT_SOLVE_WORKERS, HYDRO_AGENT_SOLVE_QUEUE and HYDRO_AGENT_SOLVE_TIMEOUT (seconds, 0 for none)."""
+        timeout = float(os.environ.get("HYDRO_AGENT_SOLVE_TIMEOUT", "30"))
+        return cls(
+            kind=os.environ.get("HYDRO_AGENT_EXECUTOR", "thread"),
+            workers=int(os.environ.get("HYDRO_AGENT_SOLVE_WORKERS", "0")) or None,
+            max_queue=int(os.environ.get("HYDRO_AGENT_SOLVE_QUEUE", "64")),
+            timeout=timeout or None,
+        )
+
+    def _get_pool(self) -> Executor:
+        with self._lock:
+            if self._pool is None:
+                if self.kind == "process":
+                    self._pool = ProcessPoolExecutor(max_workers=self.workers)
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hydro-solve")
+            return self._pool
+
+    def _release(self, future):
+        with self._lock:
+            self.in_flight -= 1
+
+    def queued(self) -> int:
+        """Calls waiting for a worker."""
+        return max(0, self.in_flight - self.workers)
+
+    async def run(self, func: Callable, *args, wait: bool = False, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run func(*args, **kwargs) on the pool and return its result (or raise its exception).
+
+        wait=True always queues the call, for work already admitted such as the later
+        chunks of a streaming batch. timeout overrides the executor's default.
+        """
+        if self.kind == "inline":
+            return func(*args, **kwargs)
+        with self._lock:
+            if not wait and self.in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorBusy("Server busy: too many solves queued. Retry later.")
+            self.in_flight += 1
+        pool = self._get_pool()
+        try:
+            future = pool.submit(partial(func, *args, **kwargs))
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+
+        limit = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), limit)
+        except asyncio.TimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            raise SolveTimeout(f"Solve did not finish within {limit:g} s.") from None
+        except BrokenExecutor:
+            # A worker process died; start a fresh pool for later calls
+            with self._lock:
+                if self._pool is pool:
+                    self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def executor_collector(executor: SolveExecutor):
+    """A metrics registry collector reporting the executor's load and shed requests."""
+    def collect() -> Iterable[Family]:
+        yield "hydro_agent_executor_in_flight", "gauge", "Solves running or queued on the executor.", [({}, executor.in_flight)]
+        yield "hydro_agent_executor_queued", "gauge", "Solves waiting for a worker.", [({}, executor.queued())]
+        yield "hydro_agent_executor_workers", "gauge", "Executor worker count.", [({"kind": executor.kind}, executor.workers)]
+        yield "hydro_agent_executor_rejected_total", "counter", "Solves rejected with 503 because the queue was full.", [({}, executor.rejected)]
+        yield "hydro_agent_executor_timeouts_total", "counter", "Solves that exceeded their timeout (504).", [({}, executor.timeouts)]
+    return collect
+
+
+default_executor = SolveExecutor.from_env()
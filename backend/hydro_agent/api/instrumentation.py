@@ -0,0 +1,85 @@
+import time
+from typing import Iterable
+
+from ..core.cache import ResultCache
+from ..core.metrics import Family, registry
+
+REQUEST_DURATION = registry.histogram(
+    "hydro_agent_http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response, per route template.",
+    ("method", "route", "status"),
+)
+PHASE_DURATION = registry.histogram(
+    "hydro_agent_request_phase_duration_seconds",
+    "Time spent validating, solving and serializing inside batch endpoints.",
+    ("route", "phase"),
+)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware observing REQUEST_DURATION for every HTTP request.
+
+    Durations run to the final body message, so streamed responses are timed in full.
+    Requests that match no route are recorded under route="unmatched" to keep the
+    label set bounded. A pure ASGI wrapper rather than BaseHTTPMiddleware, which
+    would buffer each response through an extra task.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not registry.enabled:
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            REQUEST_DURATION.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status),
+            )
+
+
+def cache_collector(cache: ResultCache):
+    """A registry collector reporting a result cache's counters and size at scrape time."""
+    def collect() -> Iterable[Family]:
+        stats = cache.stats()
+        yield "hydro_agent_cache_hits_total", "counter", "Result cache hits (memory and disk).", [({}, stats["hits"])]
+        yield "hydro_agent_cache_disk_hits_total", "counter", "Result cache hits served from the SQLite tier.", [({}, stats["disk_hits"])]
+        yield "hydro_agent_cache_misses_total", "counter", "Result cache misses.", [({}, stats["misses"])]
+        yield "hydro_agent_cache_evictions_total", "counter", "Entries evicted from the result cache.", [({}, stats["evictions"])]
+        yield "hydro_agent_cache_hit_ratio", "gauge", "Hits per lookup since the cache was last cleared.", [({}, stats["hit_rate"])]
+        yield "hydro_agent_cache_entries", "gauge", "Entries in the in-memory result cache.", [({}, stats["size"])]
+    return collect
+
+
+class phase_timer:
+    """Context manager observing PHASE_DURATION for one phase of a request (no-op when metrics are off)."""
+
+    __slots__ = ("route", "phase", "start")
+
+    def __init__(self, route: str, phase: str):
+        self.route = route
+        self.phase = phase
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if registry.enabled:
+            PHASE_DURATION.observe(time.perf_counter() - self.start, self.route, self.phase)
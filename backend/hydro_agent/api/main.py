@@ -1,11 +1,60 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+import logging
+import os
+from typing import Any, Dict
+
+from fastapi import FastAPI, APIRouter, Body, HTTPException, Request, Response
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from ..core.manning.channels import solve_normal_depth
-from ..core.manning.schemas import ChannelInput, ChannelResult
-from ..export.formatters import to_markdown, to_csv, to_plain_text
-from ..core.curb_inlets.on_grade import solve_curb_inlet_on_grade
-from ..core.curb_inlets.schemas import CurbInletOnGradeInput, CurbInletOnGradeResult
+from pydantic import ValidationError
+from ..core.manning.channels import solve_normal_depth_many
+from ..core.manning.schemas import (
+    ChannelDesignInput,
+    ChannelDesignResult,
+    ChannelInput,
+    ChannelResult,
+    DirectStepInput,
+    HydrographInput,
+    HydrographResult,
+    ProfileResult,
+    RatingCurveInput,
+    RatingCurveResult,
+    StandardStepInput,
+)
+from ..core.manning.rating import rating_curve
+from ..core.manning.hydrograph import solve_hydrograph
+from ..core.manning.gvf import direct_step_profile, standard_step_profile
+from ..core.manning.design import design_channel
+from ..export.formatters import (
+    BULK_COLUMNS,
+    BULK_FORMATS,
+    TableFormatter,
+    channel_rows,
+    to_csv,
+    to_markdown,
+    to_plain_text,
+)
+from ..core.metrics import registry as metrics_registry
+from ..core.cache import default_cache, solve_normal_depth_cached, solve_curb_inlet_on_grade_cached
+from ..core.curb_inlets.cascade import solve_curb_inlet_cascade
+from ..core.curb_inlets.schemas import (
+    CurbInletCascadeInput,
+    CurbInletCascadeResult,
+    CurbInletOnGradeInput,
+    CurbInletOnGradeResult,
+)
 from ..projects.models import Project, Scenario
+from .executor import ExecutorBusy, SolveTimeout, default_executor, executor_collector
+from .instrumentation import MetricsMiddleware, cache_collector, phase_timer
+from .ndjson import UnbufferedStreamingResponse, iter_json_records, chunked, error_line, result_line
+from .sessions import default_session_store, session_collector, solve_step
+
+logger = logging.getLogger(__name__)
+
+# Rows validated and solved together per chunk of a batch request
+BATCH_CHUNK_SIZE = 1000
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "markdown": "text/markdown", "text": "text/plain"}
+# Largest design sweep one request may ask for (about 300k candidates/s per core)
+DESIGN_MAX_CANDIDATES = int(os.environ.get("HYDRO_AGENT_DESIGN_CANDIDATES", "2000000"))
 
 app = FastAPI(
     title="Hydro Agent API",
@@ -20,43 +69,280 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(MetricsMiddleware)
+metrics_registry.add_collector(cache_collector(default_cache))
+metrics_registry.add_collector(executor_collector(default_executor))
+metrics_registry.add_collector(session_collector(default_session_store))
 
 router = APIRouter(prefix="/api")
 
+
+async def run_solver(func, *args, **kwargs):
+    """
+    Run a blocking solver on the default executor and map its failures to HTTP errors:
+    ValueError -> 400, full queue -> 503 with Retry-After, timeout -> 504, anything
+    else -> 500 (logged with its traceback).
+    """
+    try:
+        return await default_executor.run(func, *args, **kwargs)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ExecutorBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except SolveTimeout as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except Exception:
+        logger.exception("Solver %s failed", getattr(func, "__name__", func))
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+async def _solve_many(params_list, admit: bool = False):
+    """
+    solve_normal_depth_many for one chunk of a streaming batch, on the executor; failures
+    become per-row errors. admit=True applies the executor's queue limit (raising
+    ExecutorBusy) for the first chunk of a request; later chunks are already admitted.
+    """
+    try:
+        return await default_executor.run(solve_normal_depth_many, params_list, wait=not admit)
+    except ExecutorBusy:
+        raise
+    except SolveTimeout as e:
+        return [ValueError(str(e))] * len(params_list)
+    except Exception:
+        logger.exception("Batch chunk of %d rows failed", len(params_list))
+        return [ValueError("Internal server error")] * len(params_list)
+
+
+async def _solve_chunks(request: Request):
+    """
+    Decode, validate and solve the rows of a batch request body (JSON array or NDJSON)
+    in chunks of BATCH_CHUNK_SIZE. Yields each chunk as (index, params, outcome) rows in
+    order: outcome is the ChannelResult, the ValueError from decoding or solving, or
+    the validation error list (params is None for rows that did not validate).
+    """
+    content_type = request.headers.get("content-type", "")
+    ndjson = "ndjson" in content_type or "jsonl" in content_type
+    route = request.scope["route"].path
+    records = iter_json_records(request.stream(), ndjson=ndjson)
+    admit = True
+    async for chunk in chunked(records, BATCH_CHUNK_SIZE):
+        rows = []
+        valid = []
+        with phase_timer(route, "validate"):
+            for index, record in chunk:
+                if isinstance(record, ValueError):
+                    rows.append((index, None, record))
+                    continue
+                try:
+                    params = ChannelInput.model_validate(record)
+                except ValidationError as e:
+                    rows.append((index, None, e.errors(include_url=False, include_context=False)))
+                    continue
+                valid.append(len(rows))
+                rows.append((index, params, None))
+        with phase_timer(route, "solve"):
+            outcomes = await _solve_many([rows[slot][1] for slot in valid], admit=admit)
+        admit = False
+        for slot, outcome in zip(valid, outcomes):
+            index, params, _ = rows[slot]
+            rows[slot] = (index, params, outcome)
+        yield rows
+
+
+async def _admit_batch(request: Request):
+    """
+    Start _solve_chunks and solve its first chunk before the response begins, so a full
+    executor queue answers 503 with Retry-After instead of queueing the whole batch.
+    Returns the chunks, first one included.
+    """
+    chunks = _solve_chunks(request)
+    try:
+        first = await anext(chunks, None)
+    except ExecutorBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+    async def admitted():
+        if first is None:
+            return
+        yield first
+        async for rows in chunks:
+            yield rows
+
+    return admitted()
+
+
 @router.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
+@router.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters and size of the solver result cache."""
+    return default_cache.stats()
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Request latency, solver, irregular-section and cache metrics in the Prometheus text
+    format. Disabled (404) when HYDRO_AGENT_METRICS=0.
+    """
+    if not metrics_registry.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @router.post("/manning/channels/solve", response_model=ChannelResult)
 async def solve_channel(params: ChannelInput):
     """
     Solve for normal depth in an open channel using Manning's Equation.
     """
-    try:
-        result = solve_normal_depth(params)
-        return result
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail="Internal server error")
+    return await run_solver(solve_normal_depth_cached, params)
+
+@router.post("/manning/sessions", status_code=201)
+async def open_session():
+    """
+    Open a solve session for an interactive client. Edits are then posted to
+    /manning/sessions/{session_id}/solve; the session closes after
+    HYDRO_AGENT_SESSION_TTL seconds without one.
+    """
+    session = default_session_store.open()
+    return {"session_id": session.id, "ttl": default_session_store.ttl}
+
+@router.post("/manning/sessions/{session_id}/solve", response_model=ChannelResult)
+async def solve_session(session_id: str, changes: Dict[str, Any] = Body(...)):
+    """
+    Apply an edit to a session's channel and solve it.
+
+    The body holds only the ChannelInput fields that changed (the first edit holds
+    them all). The session keeps the irregular section prepared while its points are
+    not resent, and warm-starts the solve from its previous normal and critical depth.
+    Unknown or expired sessions answer 404, so the client can open a new one and send
+    its full input.
+    """
+    session = default_session_store.get(session_id)
+    if session is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired session")
+    async with session.lock:
+        try:
+            params = session.apply(changes)
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=e.errors(include_url=False, include_context=False))
+        section, result = await run_solver(solve_step, params, session.section, session.depth, session.critical_depth)
+        session.record(section, result)
+    return result
+
+@router.delete("/manning/sessions/{session_id}", status_code=204)
+async def close_session(session_id: str):
+    if not default_session_store.close(session_id):
+        raise HTTPException(status_code=404, detail="Unknown or expired session")
+    return Response(status_code=204)
+
+@router.post("/manning/channels/solve-batch")
+async def solve_channel_batch(request: Request):
+    """
+    Solve many channels in one request.
+
+    The body is either a JSON array of ChannelInput objects or an NDJSON stream
+    (Content-Type: application/x-ndjson). Rows are decoded, validated and solved in
+    chunks and streamed back as NDJSON lines of {"index", "result"} or
+    {"index", "error"}, so one bad row does not fail the whole request. When the
+    solve queue is full the request is refused with 503 before any row is streamed.
+    """
+    route = request.scope["route"].path
+    chunks = await _admit_batch(request)
+
+    async def stream():
+        async for rows in chunks:
+            with phase_timer(route, "serialize"):
+                lines = []
+                for index, _, outcome in rows:
+                    if isinstance(outcome, ChannelResult):
+                        lines.append(result_line(index, outcome.model_dump_json()))
+                    else:
+                        lines.append(error_line(index, outcome if isinstance(outcome, list) else str(outcome)))
+            yield "".join(lines)
+
+    return UnbufferedStreamingResponse(stream(), media_type="application/x-ndjson")
+
+@router.post("/manning/channels/rating-curve", response_model=RatingCurveResult)
+async def channel_rating_curve(params: RatingCurveInput):
+    """
+    Generate a stage-discharge table over a depth (or WSE) range with adaptive sampling.
+    """
+    return await run_solver(rating_curve, params)
+
+@router.post("/manning/channels/hydrograph", response_model=HydrographResult)
+async def channel_hydrograph(params: HydrographInput):
+    """
+    Depth, velocity and Froude number (and spread, for gutters) at every timestep of
+    a discharge hydrograph. discharge may be a base64 float64 buffer for long series.
+    """
+    return await run_solver(solve_hydrograph, params)
+
+@router.post("/manning/channels/design", response_model=ChannelDesignResult)
+async def channel_design(params: ChannelDesignInput):
+    """
+    Sweep trapezoidal section parameters against design constraints; returns the
+    feasible minimum-cost section and the Pareto front.
+
+    The sweep runs serially on one executor worker, whatever workers asks for, and
+    grids beyond DESIGN_MAX_CANDIDATES are refused, so one request can neither start
+    its own process pool nor run far past its timeout.
+    """
+    params = params.model_copy(update={"workers": 1})
+    return await run_solver(design_channel, params, max_candidates=DESIGN_MAX_CANDIDATES)
+
+@router.post("/manning/profiles/standard-step", response_model=ProfileResult)
+async def standard_step(params: StandardStepInput):
+    """
+    Water surface profiles through a reach of cross sections (standard step).
+    """
+    return await run_solver(standard_step_profile, params)
+
+@router.post("/manning/profiles/direct-step", response_model=ProfileResult)
+async def direct_step(params: DirectStepInput):
+    """
+    Water surface profiles along a prismatic reach (direct step).
+    """
+    return await run_solver(direct_step_profile, params)
 
 @router.post("/manning/channels/export")
 async def export_channel(params: ChannelInput, format: str = "markdown"):
     """
     Export channel calculation in various formats.
     """
-    try:
-        result = solve_normal_depth(params)
-        if format == "markdown":
-            return {"content": to_markdown(params, result)}
-        elif format == "csv":
-            return {"content": to_csv(params, result)}
-        elif format == "text":
-            return {"content": to_plain_text(params, result)}
-        else:
-            raise HTTPException(status_code=400, detail="Invalid format")
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    formatters = {"markdown": to_markdown, "csv": to_csv, "text": to_plain_text}
+    if format not in formatters:
+        raise HTTPException(status_code=400, detail="Invalid format")
+    result = await run_solver(solve_normal_depth_cached, params)
+    return {"content": formatters[format](params, result)}
+
+
+@router.post("/manning/channels/export-batch")
+async def export_channel_batch(request: Request, format: str = "csv"):
+    """
+    Solve many channels and stream them as one CSV, Markdown or plain-text table.
+
+    The body is the same as for solve-batch (JSON array or NDJSON). Rows are solved in
+    chunks and written as they complete; rows that fail validation or solving keep
+    their place in the table with the message in the error column.
+    """
+    if format not in BULK_FORMATS:
+        raise HTTPException(status_code=400, detail="Invalid format")
+    route = request.scope["route"].path
+    chunks = await _admit_batch(request)
+
+    async def stream():
+        formatter = TableFormatter(BULK_COLUMNS, format)
+        yield formatter.header()
+        async for rows in chunks:
+            with phase_timer(route, "serialize"):
+                pairs = [
+                    (params, ValueError(outcome) if isinstance(outcome, list) else outcome)
+                    for _, params, outcome in rows
+                ]
+                yield formatter.format_rows(channel_rows(pairs))
+
+    return UnbufferedStreamingResponse(stream(), media_type=EXPORT_MEDIA_TYPES[format])
 
 
 @router.post("/curb-inlets/on-grade/solve", response_model=CurbInletOnGradeResult)
@@ -64,13 +350,14 @@ async def solve_curb_inlet_on_grade_endpoint(params: CurbInletOnGradeInput):
     """
     Solve curb opening inlet (on-grade) interception using HEC-22 methodology.
     """
-    try:
-        result = solve_curb_inlet_on_grade(params)
-        return result
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception:
-        raise HTTPException(status_code=500, detail="Internal server error")
+    return await run_solver(solve_curb_inlet_on_grade_cached, params)
+
+@router.post("/curb-inlets/on-grade/cascade", response_model=CurbInletCascadeResult)
+async def solve_curb_inlet_cascade_endpoint(params: CurbInletCascadeInput):
+    """
+    Solve a chain or tree of on-grade curb inlets with bypass flow carried downstream.
+    """
+    return await run_solver(solve_curb_inlet_cascade, params)
 
 @router.post("/projects/validate", response_model=Project)
 async def validate_project(project: Project):
@@ -79,6 +366,19 @@ async def validate_project(project: Project):
     """
     return project
 
+def _solve_project(project: Project, force: bool) -> Project:
+    # Returns the project so a process executor sends the solved copy back
+    project.solve_all(force=force)
+    return project
+
+@router.post("/projects/solve", response_model=Project)
+async def solve_project_endpoint(project: Project, force: bool = False):
+    """
+    Solve every scenario of a project whose inputs changed since its stored input_hash.
+    Failed scenarios keep their error message instead of results.
+    """
+    return await run_solver(_solve_project, project, force)
+
 app.include_router(router)
 
 if __name__ == "__main__":
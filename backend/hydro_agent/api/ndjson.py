@@ -0,0 +1,132 @@
+import codecs
+import json
+from typing import Any, AsyncIterator, List, Tuple
+
+from starlette.requests import ClientDisconnect
+from starlette.responses import StreamingResponse
+
+_decoder = json.JSONDecoder()
+
+_WHITESPACE = " \t\r\n"
+
+
+async def iter_json_records(chunks: AsyncIterator[bytes], ndjson: bool) -> AsyncIterator[Any]:
+    """
+    Incrementally decode a request body into records without buffering it whole.
+
+    With ndjson=True each non-blank line is one JSON value. Otherwise the body is a
+    JSON array whose elements are decoded one at a time as they arrive. A record that
+    cannot be decoded is yielded as a ValueError so the caller can report it per row;
+    a malformed array stops iteration after that error, as does a body that is not
+    valid UTF-8.
+    """
+    try:
+        async for record in _iter_records(_iter_text(chunks), ndjson):
+            yield record
+    except UnicodeDecodeError:
+        yield ValueError("Request body is not valid UTF-8.")
+
+
+async def _iter_text(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    # One incremental decoder per body, so characters split across chunks decode whole
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+async def _iter_records(texts: AsyncIterator[str], ndjson: bool) -> AsyncIterator[Any]:
+    buffer = ""
+    if ndjson:
+        async for text in texts:
+            buffer += text
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                if line.strip():
+                    yield _decode_line(line)
+        if buffer.strip():
+            yield _decode_line(buffer)
+        return
+
+    started = False
+    async for text in texts:
+        buffer += text
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    yield ValueError("Request body must be a JSON array or NDJSON stream.")
+                    return
+                started = True
+                pos += 1
+                continue
+            if buffer[pos] == ",":
+                pos += 1
+                continue
+            if buffer[pos] == "]":
+                return
+            try:
+                value, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Element is incomplete; wait for more data
+                break
+            yield value
+            pos = end
+        buffer = buffer[pos:]
+    if buffer.strip():
+        yield ValueError("Request body ended before the JSON array was closed.")
+
+
+def _decode_line(line: str) -> Any:
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError as e:
+        return ValueError(f"Invalid JSON: {e.msg}")
+
+
+async def chunked(records: AsyncIterator[Any], size: int) -> AsyncIterator[List[Tuple[int, Any]]]:
+    """Group records into lists of at most size (index, record) pairs."""
+    chunk = []
+    index = 0
+    async for record in records:
+        chunk.append((index, record))
+        index += 1
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def error_line(index: int, message: Any) -> str:
+    return json.dumps({"index": index, "error": message}) + "\n"
+
+
+def result_line(index: int, result_json: str) -> str:
+    return '{"index": %d, "result": %s}\n' % (index, result_json)
+
+
+class UnbufferedStreamingResponse(StreamingResponse):
+    """
+    Streaming response whose body is produced while the request body is still being
+    read (NDJSON results, streamed export tables). Starlette's default
+    StreamingResponse listens for http.disconnect on the same receive channel, which
+    would swallow request body messages, so this variant only streams and treats a
+    failed send as a client disconnect.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
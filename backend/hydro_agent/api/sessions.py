@@ -0,0 +1,160 @@
+"""
+Solve sessions for interactive clients.
+
+A session holds one channel being edited: its inputs, its prepared irregular section
+and the normal and critical depth of its last solve. Each edit sends only the fields
+that changed. They are merged into the stored inputs, the section is reused unless its
+points, type or simplification changed, and the solve is warm-started from the last
+depths, so a slider drag on a large survey neither re-sends nor re-prepares it.
+"""
+import asyncio
+import os
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from ..core.manning.channels import irregular_section, solve_normal_depth
+from ..core.manning.schemas import ChannelInput, ChannelResult, ChannelType
+from ..core.metrics import Family
+
+# Irregular section points, in either encoding; edits that omit all of them keep the
+# session's points (and, with the fields below, its prepared section)
+POINT_FIELDS = ("station_elevation_points", "stations", "elevations")
+SECTION_FIELDS = ("type", "simplify_tolerance")
+
+
+class SolveSession:
+    """One client's channel: merged inputs, prepared section and last solution."""
+
+    def __init__(self, session_id: str):
+        self.id = session_id
+        self.params: Optional[ChannelInput] = None
+        self.section = None
+        self.depth: Optional[float] = None
+        self.critical_depth: Optional[float] = None
+        self.solves = 0
+        self.last_used = time.monotonic()
+        # Serializes the edits of one session; different sessions solve concurrently
+        self.lock = asyncio.Lock()
+
+    def apply(self, changes: Dict[str, Any]) -> ChannelInput:
+        """
+        Merge changed ChannelInput fields into the session's inputs and validate them.
+
+        Points in changes replace the stored points (in whichever encoding they use);
+        otherwise the stored points are carried over without revalidating them. The
+        prepared section is dropped when the points, type or simplify_tolerance change.
+        Raises pydantic.ValidationError and leaves the session unchanged on bad input.
+        """
+        if self.params is None:
+            params = ChannelInput.model_validate(changes)
+            section_changed = True
+        else:
+            merged = self.params.model_dump(exclude=set(POINT_FIELDS))
+            merged.update(changes)
+            params = ChannelInput.model_validate(merged)
+            if any(field in changes for field in POINT_FIELDS):
+                section_changed = True
+            else:
+                params = params.model_copy(update={field: getattr(self.params, field) for field in POINT_FIELDS})
+                section_changed = any(getattr(params, f) != getattr(self.params, f) for f in SECTION_FIELDS)
+        self.params = params
+        if section_changed:
+            self.section = None
+        return params
+
+    def record(self, section, result: ChannelResult):
+        """Keep the section a solve used and its depths to warm-start the next edit."""
+        self.section = section
+        self.depth = result.depth if result.depth > 0 else None
+        self.critical_depth = result.critical_depth if result.critical_depth > 0 else None
+        self.solves += 1
+
+
+def solve_step(params: ChannelInput, section, depth: Optional[float], critical_depth: Optional[float]) -> Tuple[Any, ChannelResult]:
+    """
+    One warm-started session solve, run on the executor. Prepares the irregular section
+    when the session has none and returns it with the result for the next edit.
+    """
+    if params.type == ChannelType.IRREGULAR and section is None:
+        section = irregular_section(params)
+    result = solve_normal_depth(params, section, initial_depth=depth, initial_critical_depth=critical_depth)
+    return section, result
+
+
+class SessionStore:
+    """
+    Open solve sessions in least recently used order.
+
+    Sessions idle for more than `ttl` seconds expire, and opening one beyond
+    `max_sessions` closes the least recently used. Only the event loop touches the
+    store, so it needs no lock.
+    """
+
+    def __init__(self, max_sessions: int = 256, ttl: Optional[float] = 1800.0):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions: "OrderedDict[str, SolveSession]" = OrderedDict()
+        self.opened = 0
+        self.expired = 0
+        self.evicted = 0
+
+    @classmethod
+    def from_env(cls) -> "SessionStore":
+        """Configured by HYDRO_AGENT_SESSIONS and HYDRO_AGENT_SESSION_TTL (seconds, 0 for none)."""
+        ttl = float(os.environ.get("HYDRO_AGENT_SESSION_TTL", "1800"))
+        return cls(max_sessions=int(os.environ.get("HYDRO_AGENT_SESSIONS", "256")), ttl=ttl or None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _expire(self, now: float):
+        if self.ttl is None:
+            return
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_used <= self.ttl:
+                break
+            self._sessions.popitem(last=False)
+            self.expired += 1
+
+    def open(self) -> SolveSession:
+        now = time.monotonic()
+        self._expire(now)
+        session = SolveSession(secrets.token_urlsafe(16))
+        self._sessions[session.id] = session
+        self.opened += 1
+        if len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+            self.evicted += 1
+        return session
+
+    def get(self, session_id: str) -> Optional[SolveSession]:
+        """The open session with this id, marked as used, or None if it expired or never existed."""
+        now = time.monotonic()
+        self._expire(now)
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.last_used = now
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def close(self, session_id: str) -> bool:
+        return self._sessions.pop(session_id, None) is not None
+
+    def clear(self):
+        self._sessions.clear()
+
+
+def session_collector(store: SessionStore):
+    """A metrics registry collector reporting open, expired and evicted solve sessions."""
+    def collect() -> Iterable[Family]:
+        yield "hydro_agent_sessions_open", "gauge", "Open solve sessions.", [({}, len(store))]
+        yield "hydro_agent_sessions_opened_total", "counter", "Solve sessions opened.", [({}, store.opened)]
+        yield "hydro_agent_sessions_expired_total", "counter", "Solve sessions closed after their idle timeout.", [({}, store.expired)]
+        yield "hydro_agent_sessions_evicted_total", "counter", "Solve sessions closed to stay within the session limit.", [({}, store.evicted)]
+    return collect
+
+
+default_session_store = SessionStore.from_env()
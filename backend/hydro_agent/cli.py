@@ -0,0 +1,220 @@
+"""
+Command line and stdio worker for agent tool calls.
+
+    python -m hydro_agent ops                                   # list operations
+    python -m hydro_agent manning.solve '{"type": "rectangular", ...}'
+    echo '{"type": "rectangular", ...}' | python -m hydro_agent manning.solve
+    python -m hydro_agent serve                                 # JSON-lines worker on stdin/stdout
+    python -m hydro_agent http --port 8000                      # the REST API (needs uvicorn)
+
+Single-shot mode imports only the modules the operation needs (never FastAPI or
+uvicorn), prints the result as JSON and exits 0; invalid input or a solver error
+prints {"error": ...} and exits 1.
+
+serve reads one request per line, {"id": ..., "op": "manning.solve", "params": {...}},
+and writes one line per request, {"id": ..., "result": ...} or {"id": ..., "error": ...},
+flushing after each, so one process answers any number of calls with warm imports.
+Unexpected exceptions are answered with "Internal error" and their traceback is
+written to stderr.
+"""
+import argparse
+import json
+import sys
+import traceback
+from typing import Any, Callable, Dict, IO, List, Optional
+
+
+def _manning_solve(params):
+    from .core.manning.channels import solve_normal_depth
+    from .core.manning.schemas import ChannelInput
+    return solve_normal_depth(ChannelInput.model_validate(params))
+
+
+def _manning_solve_many(params):
+    from .core.manning.channels import solve_normal_depth_many
+    from .core.manning.schemas import ChannelInput
+    if not isinstance(params, list):
+        raise ValueError("params must be a list of channel inputs")
+    outcomes = solve_normal_depth_many([ChannelInput.model_validate(p) for p in params])
+    return [
+        {"error": str(outcome)} if isinstance(outcome, Exception) else {"result": outcome.model_dump(mode="json")}
+        for outcome in outcomes
+    ]
+
+
+def _manning_rating_curve(params):
+    from .core.manning.rating import rating_curve
+    from .core.manning.schemas import RatingCurveInput
+    return rating_curve(RatingCurveInput.model_validate(params))
+
+
+def _manning_hydrograph(params):
+    from .core.manning.hydrograph import solve_hydrograph
+    from .core.manning.schemas import HydrographInput
+    return solve_hydrograph(HydrographInput.model_validate(params))
+
+
+def _manning_design(params):
+    from .core.manning.design import design_channel
+    from .core.manning.schemas import ChannelDesignInput
+    return design_channel(ChannelDesignInput.model_validate(params))
+
+
+def _manning_standard_step(params):
+    from .core.manning.gvf import standard_step_profile
+    from .core.manning.schemas import StandardStepInput
+    return standard_step_profile(StandardStepInput.model_validate(params))
+
+
+def _manning_direct_step(params):
+    from .core.manning.gvf import direct_step_profile
+    from .core.manning.schemas import DirectStepInput
+    return direct_step_profile(DirectStepInput.model_validate(params))
+
+
+def _manning_export(params, format: str = "markdown"):
+    from .core.manning.channels import solve_normal_depth
+    from .core.manning.schemas import ChannelInput
+    from .export.formatters import to_csv, to_markdown, to_plain_text
+    formatters = {"markdown": to_markdown, "csv": to_csv, "text": to_plain_text}
+    if format not in formatters:
+        raise ValueError(f"Invalid format: {format}. Use one of {', '.join(formatters)}.")
+    channel = ChannelInput.model_validate(params)
+    return {"content": formatters[format](channel, solve_normal_depth(channel))}
+
+
+def _curb_inlet_on_grade(params):
+    from .core.curb_inlets.on_grade import solve_curb_inlet_on_grade
+    from .core.curb_inlets.schemas import CurbInletOnGradeInput
+    return solve_curb_inlet_on_grade(CurbInletOnGradeInput.model_validate(params))
+
+
+def _curb_inlet_cascade(params):
+    from .core.curb_inlets.cascade import solve_curb_inlet_cascade
+    from .core.curb_inlets.schemas import CurbInletCascadeInput
+    return solve_curb_inlet_cascade(CurbInletCascadeInput.model_validate(params))
+
+
+def _project_solve(params, force: bool = False):
+    from .projects.models import Project
+    project = Project.model_validate(params)
+    project.solve_all(workers=1, force=force)
+    return project
+
+
+# Operation name -> handler(params, **options); options are the request's other keys
+OPERATIONS: Dict[str, Callable[..., Any]] = {
+    "manning.solve": _manning_solve,
+    "manning.solve_many": _manning_solve_many,
+    "manning.rating_curve": _manning_rating_curve,
+    "manning.hydrograph": _manning_hydrograph,
+    "manning.design": _manning_design,
+    "manning.standard_step": _manning_standard_step,
+    "manning.direct_step": _manning_direct_step,
+    "manning.export": _manning_export,
+    "curb_inlets.on_grade": _curb_inlet_on_grade,
+    "curb_inlets.cascade": _curb_inlet_cascade,
+    "projects.solve": _project_solve,
+}
+
+
+def _to_json(value: Any) -> str:
+    if hasattr(value, "model_dump_json"):
+        return value.model_dump_json()
+    return json.dumps(value)
+
+
+def _error_message(error: Exception) -> Any:
+    """A ValidationError's error list (as the API returns with 422), else the message."""
+    errors = getattr(error, "errors", None)
+    if callable(errors):
+        return errors(include_url=False, include_context=False)
+    return str(error)
+
+
+def call(op: str, params: Any, **options) -> str:
+    """Run one operation and return its result as JSON. Raises KeyError for unknown operations."""
+    handler = OPERATIONS[op]
+    return _to_json(handler(params, **options))
+
+
+def handle_line(line: str) -> Optional[str]:
+    """One JSON-lines request to its response line (without newline); None for blank lines."""
+    if not line.strip():
+        return None
+    request_id = None
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("Request must be a JSON object")
+        request_id = request.get("id")
+        op = request.get("op")
+        if op not in OPERATIONS:
+            raise ValueError(f"Unknown op: {op!r}. Use one of {', '.join(OPERATIONS)}.")
+        options = {k: v for k, v in request.items() if k not in ("id", "op", "params")}
+        result = call(op, request.get("params"), **options)
+    except Exception as e:
+        if isinstance(e, json.JSONDecodeError):
+            message = f"Invalid JSON: {e.msg}"
+        elif isinstance(e, (ValueError, TypeError)):
+            message = _error_message(e)
+        else:
+            # stdout carries the responses; the traceback goes to stderr for whoever runs the worker
+            print(f"hydro_agent: request {request_id!r} failed with an unexpected error", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            message = "Internal error"
+        return json.dumps({"id": request_id, "error": message})
+    return '{"id": %s, "result": %s}' % (json.dumps(request_id), result)
+
+
+def serve(stdin: IO[str], stdout: IO[str]):
+    """Answer JSON-lines requests from stdin until EOF; the core solvers are imported up front."""
+    from .core.manning import channels  # noqa: F401  (warm the solver imports before the first request)
+    from .core.curb_inlets import on_grade  # noqa: F401
+    for line in stdin:
+        response = handle_line(line)
+        if response is not None:
+            stdout.write(response + "\n")
+            stdout.flush()
+
+
+def main(argv: Optional[List[str]] = None, stdin: IO[str] = None, stdout: IO[str] = None) -> int:
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    parser = argparse.ArgumentParser(prog="python -m hydro_agent", description="Hydro Agent solvers for scripts and agents.")
+    parser.add_argument("command", help="an operation (see 'ops'), 'ops', 'serve' or 'http'")
+    parser.add_argument("params", nargs="?", default="-", help="operation input as JSON; '-' or omitted reads stdin")
+    parser.add_argument("--format", help="manning.export format: markdown, csv or text")
+    parser.add_argument("--force", action="store_true", help="projects.solve: re-solve unchanged scenarios")
+    parser.add_argument("--host", default="127.0.0.1", help="http: bind address")
+    parser.add_argument("--port", type=int, default=8000, help="http: port")
+    args = parser.parse_args(argv)
+
+    if args.command == "ops":
+        stdout.write("\n".join(OPERATIONS) + "\n")
+        return 0
+    if args.command == "serve":
+        serve(stdin, stdout)
+        return 0
+    if args.command == "http":
+        import uvicorn
+        uvicorn.run("hydro_agent.api.main:app", host=args.host, port=args.port)
+        return 0
+    if args.command not in OPERATIONS:
+        parser.error(f"unknown command {args.command!r}; run 'python -m hydro_agent ops' for the operation list")
+
+    options = {}
+    if args.format:
+        options["format"] = args.format
+    if args.force:
+        options["force"] = True
+    try:
+        params = json.loads(stdin.read() if args.params == "-" else args.params)
+        stdout.write(call(args.command, params, **options) + "\n")
+    except json.JSONDecodeError as e:
+        stdout.write(json.dumps({"error": f"Invalid JSON: {e.msg}"}) + "\n")
+        return 1
+    except (ValueError, TypeError) as e:
+        stdout.write(json.dumps({"error": _error_message(e)}) + "\n")
+        return 1
+    return 0
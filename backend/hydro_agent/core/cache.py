@@ -0,0 +1,230 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Type
+
+import numpy as np
+from pydantic import BaseModel
+
+from .curb_inlets.on_grade import solve_curb_inlet_on_grade
+from .curb_inlets.schemas import CurbInletOnGradeInput, CurbInletOnGradeResult
+from .manning.channels import solve_normal_depth
+from .manning.schemas import ChannelInput, ChannelResult, ChannelType, SolveFor
+from .manning.simplify import section_tolerance
+
+# Geometry fields that affect the result for each channel type
+_CHANNEL_FIELDS = {
+    ChannelType.RECTANGULAR: ("bottom_width",),
+    ChannelType.TRAPEZOIDAL: ("bottom_width", "left_side_slope", "right_side_slope"),
+    ChannelType.TRIANGULAR: ("left_side_slope", "right_side_slope"),
+    ChannelType.IRREGULAR: ("station_elevation_points",),
+    ChannelType.GUTTER: ("gutter_width", "gutter_cross_slope", "road_cross_slope"),
+}
+
+
+def _digest(namespace: str, canonical: Dict[str, Any]) -> str:
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{namespace}|{payload}".encode()).hexdigest()
+
+
+def _section_digest(params: ChannelInput) -> str:
+    """Hash of an irregular section's points in station order, the same for either input encoding."""
+    if params.stations is not None:
+        x, z = params.stations, params.elevations
+    else:
+        points = np.asarray(params.station_elevation_points, dtype=float).reshape(-1, 2)
+        x, z = points[:, 0], points[:, 1]
+    order = np.argsort(x, kind="stable")
+    return hashlib.sha256(np.column_stack((x[order], z[order])).astype("<f8").tobytes()).hexdigest()
+
+
+def channel_key(params: ChannelInput) -> str:
+    """
+    Canonical hash of a validated ChannelInput.
+
+    Only fields that affect the result for the channel type and solve mode are
+    included; the deprecated side_slope is folded into left/right slopes and
+    station-elevation points (or stations/elevations arrays) are hashed in station
+    order (stable, as the solver does), with the simplification tolerance when one
+    applies.
+    """
+    channel_type = params.type
+    default_mode = SolveFor.SPREAD if channel_type == ChannelType.GUTTER else SolveFor.DEPTH
+    solve_for = params.solve_for or default_mode
+    if channel_type == ChannelType.GUTTER and solve_for == SolveFor.DEPTH:
+        solve_for = SolveFor.SPREAD
+
+    values = {
+        "left_side_slope": params.left_side_slope if params.left_side_slope > 0 else params.side_slope,
+        "right_side_slope": params.right_side_slope if params.right_side_slope > 0 else params.side_slope,
+    }
+    if channel_type == ChannelType.IRREGULAR:
+        values["station_elevation_points"] = _section_digest(params)
+    canonical = {
+        "type": channel_type.value,
+        "solve_for": solve_for.value,
+        "units": params.units.value,
+        "slope": params.slope,
+        "mannings_n": params.mannings_n,
+    }
+    for name in _CHANNEL_FIELDS.get(channel_type, ()):
+        canonical[name] = values.get(name, getattr(params, name))
+    if channel_type == ChannelType.IRREGULAR and section_tolerance(params) > 0:
+        canonical["simplify_tolerance"] = section_tolerance(params)
+
+    if solve_for == SolveFor.DISCHARGE:
+        if channel_type == ChannelType.IRREGULAR:
+            canonical["known_wse"] = params.known_wse
+        elif channel_type == ChannelType.GUTTER:
+            canonical["spread"] = params.spread or 0.0
+        else:
+            canonical["known_depth"] = params.known_depth
+    else:
+        canonical["discharge"] = params.discharge
+    return _digest("manning.channels", canonical)
+
+
+def curb_inlet_key(params: CurbInletOnGradeInput) -> str:
+    """Canonical hash of a validated CurbInletOnGradeInput."""
+    return _digest("curb_inlets.on_grade", params.model_dump(mode="json"))
+
+
+class ResultCache:
+    """
+    Two-tier cache of solver results keyed by canonical input hashes.
+
+    The first tier is an in-process LRU of result models. The optional second tier is
+    a SQLite table of result JSON shared across processes and restarts; entries found
+    there are promoted into the LRU. Both tiers are size-bounded (least recently used
+    entries are evicted first). Hit and miss counters are available from stats().
+    """
+
+    def __init__(self, maxsize: int = 4096, db_path: Optional[str] = None, max_db_entries: int = 100_000):
+        self.maxsize = maxsize
+        self.db_path = db_path
+        self.max_db_entries = max_db_entries
+        self._memory: "OrderedDict[str, BaseModel]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_puts = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, key: str, model: Type[BaseModel]) -> Optional[BaseModel]:
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return result
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+                    self._db.commit()
+                    result = model.model_validate_json(row[0])
+                    self._remember(key, result)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return result
+            self.misses += 1
+            return None
+
+    def put(self, key: str, result: BaseModel):
+        with self._lock:
+            self._remember(key, result)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, value, accessed) VALUES (?, ?, ?)",
+                    (key, result.model_dump_json(), time.time()),
+                )
+                self._db_puts += 1
+                # Trim the table periodically rather than on every insert
+                if self._db_puts % 256 == 0:
+                    self._trim_db()
+                self._db.commit()
+
+    def _remember(self, key: str, result: BaseModel):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _trim_db(self):
+        count = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        excess = count - self.max_db_entries
+        if excess > 0:
+            self._db.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY accessed LIMIT ?)",
+                (excess,),
+            )
+            self.evictions += excess
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+            self.hits = self.disk_hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._memory),
+                "maxsize": self.maxsize,
+                "db_path": self.db_path,
+            }
+
+
+default_cache = ResultCache(
+    maxsize=int(os.environ.get("HYDRO_AGENT_CACHE_SIZE", "4096")),
+    db_path=os.environ.get("HYDRO_AGENT_CACHE_DB") or None,
+)
+
+
+def solve_normal_depth_cached(params: ChannelInput, cache: Optional[ResultCache] = None) -> ChannelResult:
+    """solve_normal_depth through the result cache; hits get a fresh timestamp."""
+    cache = cache or default_cache
+    key = channel_key(params)
+    result = cache.get(key, ChannelResult)
+    if result is not None:
+        return result.model_copy(update={"timestamp": datetime.now().isoformat()})
+    result = solve_normal_depth(params)
+    cache.put(key, result)
+    return result
+
+
+def solve_curb_inlet_on_grade_cached(
+    params: CurbInletOnGradeInput, cache: Optional[ResultCache] = None
+) -> CurbInletOnGradeResult:
+    """solve_curb_inlet_on_grade through the result cache; hits get a fresh timestamp."""
+    cache = cache or default_cache
+    key = curb_inlet_key(params)
+    result = cache.get(key, CurbInletOnGradeResult)
+    if result is not None:
+        return result.model_copy(update={"timestamp": datetime.now(timezone.utc)})
+    result = solve_curb_inlet_on_grade(params)
+    cache.put(key, result)
+    return result
@@ -1,7 +1,12 @@
 from datetime import datetime, timezone
 import math
+from typing import Dict, NamedTuple
+
+import numpy as np
 
 from .schemas import CurbInletOnGradeInput, CurbInletOnGradeResult
+from ..metrics import instrument_solver
+from ..spread import gutter_flow_parts, solve_spread, solve_spread_batch
 
 
 # HEC-22 3rd ed / TxDOT equations used as placeholders for 4th ed.
@@ -83,41 +88,41 @@ def _flow_and_geometry_for_spread(
     return q_total, q_depressed, q_road, depth_at_curb, depth_at_w, gutter_depression_ft, area_total
 
 
+@instrument_solver("curb_inlet_on_grade", type="curb")
 def solve_curb_inlet_on_grade(params: CurbInletOnGradeInput) -> CurbInletOnGradeResult:
-    discharge = params.discharge_cfs
-    slope = params.longitudinal_slope
-    gutter_width = params.gutter_width_ft
-    gutter_cross_slope = params.gutter_cross_slope
-    road_cross_slope = params.road_cross_slope
-    mannings_n = params.mannings_n
-    curb_opening_length = params.curb_opening_length_ft
-    local_depression_depth_in = params.local_depression_depth_in
+    return CurbInletOnGradeResult(
+        **_evaluate_on_grade(
+            params.discharge_cfs,
+            params.longitudinal_slope,
+            params.gutter_width_ft,
+            params.gutter_cross_slope,
+            params.road_cross_slope,
+            params.mannings_n,
+            params.curb_opening_length_ft,
+            params.local_depression_depth_in,
+        ),
+        timestamp=datetime.now(timezone.utc),
+    )
 
+
+def _evaluate_on_grade(
+    discharge: float,
+    slope: float,
+    gutter_width: float,
+    gutter_cross_slope: float,
+    road_cross_slope: float,
+    mannings_n: float,
+    curb_opening_length: float,
+    local_depression_depth_in: float,
+) -> Dict[str, float]:
+    """On-grade curb inlet equations for one inlet; returns the result fields (no timestamp)."""
     if road_cross_slope <= 0 or gutter_cross_slope <= 0:
         raise ValueError("Cross slopes must be greater than zero.")
 
-    # Solve spread (T) by bisection so that computed gutter flow equals discharge.
-    lo = 0.0
-    hi = max(gutter_width, 1.0)
-    for _ in range(80):
-        q_hi, *_rest = _flow_and_geometry_for_spread(
-            hi, slope, mannings_n, gutter_width, gutter_cross_slope, road_cross_slope
-        )
-        if q_hi >= discharge:
-            break
-        hi *= 1.5
-
-    for _ in range(100):
-        mid = 0.5 * (lo + hi)
-        q_mid, *_rest = _flow_and_geometry_for_spread(
-            mid, slope, mannings_n, gutter_width, gutter_cross_slope, road_cross_slope
-        )
-        if q_mid < discharge:
-            lo = mid
-        else:
-            hi = mid
-
-    spread_ft = 0.5 * (lo + hi)
+    # Solve spread (T) so that computed gutter flow equals discharge.
+    spread_ft = solve_spread(
+        discharge, slope, mannings_n, gutter_width, gutter_cross_slope, road_cross_slope
+    ).root
     q_total, q_depressed, _q_road, depth_ft, _depth_at_w, gutter_depression_ft, flow_area_ft2 = _flow_and_geometry_for_spread(
         spread_ft, slope, mannings_n, gutter_width, gutter_cross_slope, road_cross_slope
     )
@@ -152,7 +157,7 @@ def solve_curb_inlet_on_grade(params: CurbInletOnGradeInput) -> CurbInletOnGrade
 
     total_depression_in = gutter_depression_in + local_depression_depth_in
 
-    return CurbInletOnGradeResult(
+    return dict(
         efficiency_percent=efficiency * 100,
         intercepted_flow_cfs=intercepted_flow,
         bypass_flow_cfs=bypass_flow,
@@ -166,5 +171,81 @@ def solve_curb_inlet_on_grade(params: CurbInletOnGradeInput) -> CurbInletOnGrade
         equivalent_cross_slope=equivalent_cross_slope,
         length_factor=length_factor,
         total_interception_length_ft=total_interception_length_ft,
-        timestamp=datetime.now(timezone.utc),
+    )
+
+
+class CurbInletBatchResult(NamedTuple):
+    """Per-row arrays from solve_curb_inlet_on_grade_batch (same names as CurbInletOnGradeResult)."""
+    efficiency_percent: np.ndarray
+    intercepted_flow_cfs: np.ndarray
+    bypass_flow_cfs: np.ndarray
+    spread_ft: np.ndarray
+    depth_ft: np.ndarray
+    flow_area_ft2: np.ndarray
+    velocity_fps: np.ndarray
+    equivalent_cross_slope: np.ndarray
+    length_factor: np.ndarray
+    total_interception_length_ft: np.ndarray
+    converged: np.ndarray
+
+
+@instrument_solver("curb_inlet_on_grade_batch", batch=True, type="curb")
+def solve_curb_inlet_on_grade_batch(
+    discharge_cfs,
+    longitudinal_slope,
+    gutter_width_ft,
+    gutter_cross_slope,
+    road_cross_slope,
+    mannings_n,
+    curb_opening_length_ft,
+    local_depression_depth_in=0.0,
+) -> CurbInletBatchResult:
+    """
+    Vectorized solve_curb_inlet_on_grade over broadcast arrays of inlet inputs.
+
+    Same equations as the scalar solver, with spreads from solve_spread_batch. Rows
+    with zero discharge intercept nothing; rows with invalid input are NaN with
+    converged = False.
+    """
+    Q, S, W, Sg, Sx, n, L, local_in = (
+        np.array(a, dtype=float)
+        for a in np.broadcast_arrays(
+            discharge_cfs, longitudinal_slope, gutter_width_ft, gutter_cross_slope,
+            road_cross_slope, mannings_n, curb_opening_length_ft, local_depression_depth_in,
+        )
+    )
+    spread = solve_spread_batch(Q, S, n, W, Sg, Sx)
+    T = spread.root
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        flow = gutter_flow_parts(T, S, n, W, Sg, Sx)
+        flow_area_ft2 = flow.area
+        velocity_fps = np.where(flow_area_ft2 > 0, Q / flow_area_ft2, 0.0)
+
+        ratio_depressed = np.where(flow.discharge > 0, flow.discharge_in_gutter / flow.discharge, 0.0)
+        total_depression_ft = flow.gutter_depression + local_in / 12.0
+        equivalent_cross_slope = np.where(
+            W <= 0, Sx, Sx + (total_depression_ft / np.where(W > 0, W, 1.0)) * ratio_depressed
+        )
+        total_interception_length_ft = LENGTH_COEFF * (Q ** LENGTH_Q_EXP) * (S ** LENGTH_S_EXP) * (
+            (1 / (n * equivalent_cross_slope)) ** LENGTH_NS_EXP
+        )
+        length_factor = np.where(
+            total_interception_length_ft > 0, L / total_interception_length_ft, 0.0
+        )
+
+    efficiency = 1 - (1 - np.clip(length_factor, 0.0, 1.0)) ** 1.8
+    intercepted_flow = efficiency * Q
+    return CurbInletBatchResult(
+        efficiency_percent=efficiency * 100,
+        intercepted_flow_cfs=intercepted_flow,
+        bypass_flow_cfs=Q - intercepted_flow,
+        spread_ft=T,
+        depth_ft=flow.depth_at_curb,
+        flow_area_ft2=flow_area_ft2,
+        velocity_fps=velocity_fps,
+        equivalent_cross_slope=equivalent_cross_slope,
+        length_factor=length_factor,
+        total_interception_length_ft=total_interception_length_ft,
+        converged=spread.converged,
     )
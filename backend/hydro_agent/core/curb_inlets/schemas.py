@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import List, Optional
 
 
 class CurbInletOnGradeInput(BaseModel):
@@ -29,3 +30,42 @@ class CurbInletOnGradeResult(BaseModel):
     length_factor: float
     total_interception_length_ft: float
     timestamp: datetime
+
+
+class CascadeInlet(BaseModel):
+    """One on-grade curb inlet in a cascade; its bypass flow joins the inlet named by downstream_id."""
+    id: str
+    downstream_id: Optional[str] = Field(None, description="Inlet receiving this inlet's bypass flow (None: leaves the system)")
+    local_inflow_cfs: float = Field(0.0, ge=0, description="Runoff entering the gutter directly upstream of this inlet")
+    longitudinal_slope: float = Field(..., gt=0)
+    gutter_width_ft: float = Field(..., gt=0)
+    gutter_cross_slope: float = Field(..., gt=0)
+    road_cross_slope: float = Field(..., gt=0)
+    mannings_n: float = Field(..., gt=0)
+    curb_opening_length_ft: float = Field(..., gt=0)
+    local_depression_depth_in: float = Field(0.0, ge=0)
+    local_depression_width_in: float = Field(0.0, ge=0)
+
+
+class CurbInletCascadeInput(BaseModel):
+    inlets: List[CascadeInlet] = Field(..., min_length=1)
+
+
+class CascadeInletResult(BaseModel):
+    id: str
+    level: int = Field(..., description="Topological level (0 for inlets with no upstream inlets)")
+    discharge_cfs: float = Field(..., description="Approach flow: local inflow plus upstream bypass")
+    efficiency_percent: float
+    intercepted_flow_cfs: float
+    bypass_flow_cfs: float
+    spread_ft: float
+    depth_ft: float
+    velocity_fps: float
+
+
+class CurbInletCascadeResult(BaseModel):
+    inlets: List[CascadeInletResult]
+    total_inflow_cfs: float
+    total_intercepted_cfs: float
+    system_bypass_cfs: float = Field(..., description="Bypass leaving the system from inlets with no downstream inlet")
+    timestamp: datetime
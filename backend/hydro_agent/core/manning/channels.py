@@ -1,7 +1,16 @@
 import math
 from datetime import datetime
-from typing import List, Tuple
+from typing import List, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+
 from .schemas import ChannelInput, ChannelResult, ChannelType, Units, SolveFor
+from .critical import critical_depth, critical_flow_batch, section_critical_depth
+from .sections import PreparedSection
+from .simplify import get_simplified_section, section_tolerance
+from ..metrics import instrument_solver
+from ..spread import solve_spread
+from ..roots import bracketed_newton, bracketed_newton_batch, expand_bracket, expand_bracket_batch, warm_bracket
 
 def _flow_and_geometry_for_gutter(
     spread: float,
@@ -162,6 +171,8 @@ def _solve_gutter_flow(params: ChannelInput) -> ChannelResult:
     
     final_spread = 0.0
     final_Q = 0.0
+    iterations = None
+    residual = None
 
     if solve_for == SolveFor.DISCHARGE:
         final_spread = params.spread or 0.0
@@ -169,31 +180,16 @@ def _solve_gutter_flow(params: ChannelInput) -> ChannelResult:
             final_spread, S, n, W, Sg, Sx, k
         )
     elif solve_for == SolveFor.SPREAD or solve_for == SolveFor.DEPTH:
-        # Solve for Spread given Q using bisection
+        # Solve for Spread given Q (closed form or safeguarded Newton)
         Q_target = params.discharge
         if Q_target is None or Q_target <= 0:
             raise ValueError("Discharge Q is required to solve for spread.")
-        
-        lo = 0.0
-        hi = max(W, 10.0)
-        # Find upper bound
-        for _ in range(20):
-            q_test, *_ = _flow_and_geometry_for_gutter(hi, S, n, W, Sg, Sx, k)
-            if q_test >= Q_target:
-                break
-            hi *= 2.0
-        
-        # Bisection
-        for _ in range(100):
-            mid = (lo + hi) / 2.0
-            q_mid, *_ = _flow_and_geometry_for_gutter(mid, S, n, W, Sg, Sx, k)
-            if q_mid < Q_target:
-                lo = mid
-            else:
-                hi = mid
-        
-        final_spread = (lo + hi) / 2.0
+
+        root = solve_spread(Q_target, S, n, W, Sg, Sx, k)
+        final_spread = root.root
         final_Q = Q_target
+        iterations = root.iterations
+        residual = root.residual
     else:
         raise ValueError(f"Unsupported solve_for mode for gutter: {solve_for}")
 
@@ -238,14 +234,42 @@ def _solve_gutter_flow(params: ChannelInput) -> ChannelResult:
         gutter_depression=depression,
         spread=final_spread,
         discharge=final_Q,
+        iterations=iterations,
+        residual=residual,
         timestamp=datetime.now().isoformat()
     )
 
-def solve_normal_depth(params: ChannelInput) -> ChannelResult:
+def _flow_regime(froude: float) -> str:
+    if froude > 1.001:
+        return "Supercritical"
+    if froude < 0.999:
+        return "Subcritical"
+    return "Critical"
+
+@instrument_solver("normal_depth")
+def solve_normal_depth(
+    params: ChannelInput, section=None, initial_depth: float = None, initial_critical_depth: float = None
+) -> ChannelResult:
     """
-    Newton-Raphson solver for normal depth in open channels.
+    Safeguarded Newton solver for normal depth in open channels.
     Based on Manning's Equation: Q = (k/n) * A * R^(2/3) * S^(1/2)
     For Gutter type, can also solve for Spread or Discharge.
+
+    Normal and critical depth are both found with roots.bracketed_newton, which keeps
+    a sign-change bracket and falls back to bisection, so every channel type converges
+    in a bounded number of iterations. The result reports the iteration count and the
+    final residual of the normal depth solve.
+
+    section: optional precomputed geometry for irregular channels, either a
+    PreparedSection or a HydraulicTable from htab.get_hydraulic_table. When omitted,
+    the station-elevation points are prepared once per call. Pass the same section
+    to repeated solves on one survey to skip re-sorting and re-validating it.
+
+    initial_depth, initial_critical_depth: optional warm start from an earlier solve
+    of a similar input (e.g. the previous edit in a solve session). The normal depth
+    bracket is built around initial_depth (roots.warm_bracket) and the critical depth
+    Newton starts from initial_critical_depth when it lies in its bracket; the result
+    is the same as a cold solve, usually in fewer iterations.
     """
     # Gutter-specific logic
     if params.type == ChannelType.GUTTER:
@@ -254,8 +278,7 @@ def solve_normal_depth(params: ChannelInput) -> ChannelResult:
     channel_type = params.type
     solve_for = params.solve_for or SolveFor.DEPTH
     units = params.units
-    points = params.station_elevation_points
-    
+
     b = params.bottom_width
     zL = params.left_side_slope if params.left_side_slope > 0 else params.side_slope
     zR = params.right_side_slope if params.right_side_slope > 0 else params.side_slope
@@ -270,44 +293,46 @@ def solve_normal_depth(params: ChannelInput) -> ChannelResult:
 
     min_elev = None
     max_elev = None
-    if channel_type == ChannelType.IRREGULAR and points:
-        min_elev = min(p[1] for p in points)
-        max_elev = max(p[1] for p in points)
+    if channel_type == ChannelType.IRREGULAR and section is None:
+        section = irregular_section(params)
+
+    # geometry(y) -> (A, P, T, dP/dy, dT/dy)
+    if channel_type == ChannelType.RECTANGULAR:
+        def geometry(y):
+            return b * y, b + 2 * y, b, 2.0, 0.0
+    elif channel_type in (ChannelType.TRAPEZOIDAL, ChannelType.TRIANGULAR):
+        bw = b if channel_type == ChannelType.TRAPEZOIDAL else 0.0
+        z = zL + zR
+        dPdy = math.sqrt(1 + zL * zL) + math.sqrt(1 + zR * zR)
+
+        def geometry(y):
+            return bw * y + 0.5 * z * y * y, bw + y * dPdy, bw + z * y, dPdy, z
+    elif channel_type == ChannelType.IRREGULAR:
+        if section is None:
+            raise ValueError("Station-Elevation points are required for irregular channels.")
+        min_elev = section.min_elevation
+        max_elev = section.max_elevation
+        geometry = section.geometry
+    else:
+        raise ValueError(f"Unknown channel type: {channel_type}")
 
     final_y = 0.0
     final_Q = 0.0
+    iterations = None
+    residual = None
 
     if solve_for == SolveFor.DISCHARGE:
         # Solve for Discharge given Depth (or WSE for Irregular)
         if channel_type == ChannelType.IRREGULAR:
             if params.known_wse is None:
                 raise ValueError("Known WSE is required to solve for discharge in irregular channels.")
-            if min_elev is None:
-                raise ValueError("Station-Elevation points are required for irregular channels.")
             final_y = max(0.0, params.known_wse - min_elev)
         else:
             if params.known_depth is None:
                 raise ValueError("Known depth is required to solve for discharge.")
             final_y = params.known_depth
         
-        # Calculate geometry at final_y
-        if channel_type == ChannelType.RECTANGULAR:
-            final_A = b * final_y
-            final_P = b + 2 * final_y
-            T = b
-        elif channel_type == ChannelType.TRAPEZOIDAL:
-            final_A = b * final_y + 0.5 * (zL + zR) * final_y * final_y
-            final_P = b + final_y * math.sqrt(1 + zL * zL) + final_y * math.sqrt(1 + zR * zR)
-            T = b + (zL + zR) * final_y
-        elif channel_type == ChannelType.TRIANGULAR:
-            final_A = 0.5 * (zL + zR) * final_y * final_y
-            final_P = final_y * math.sqrt(1 + zL * zL) + final_y * math.sqrt(1 + zR * zR)
-            T = (zL + zR) * final_y
-        elif channel_type == ChannelType.IRREGULAR:
-            final_A, final_P, T, _, _ = calculate_irregular_geometry(final_y, points)
-        else:
-            raise ValueError(f"Unknown channel type: {channel_type}")
-
+        final_A, final_P, T, _, _ = geometry(final_y)
         R = final_A / final_P if final_P > 0 else 0
         
         # Calculate Discharge Q
@@ -319,162 +344,49 @@ def solve_normal_depth(params: ChannelInput) -> ChannelResult:
         if Q is None:
             raise ValueError("Discharge Q is required for standard channel types.")
         final_Q = Q
-        
-        # Solver settings
-        y = 1.0  # initial guess
-        if channel_type == ChannelType.IRREGULAR and points:
-            y = (max_elev - min_elev) * 0.2 if max_elev > min_elev else 1.0
-            if y == 0: y = 1.0
-
-        max_iterations = 100
-        tolerance = 1e-7
-
-        for i in range(max_iterations):
-            dTdy = 0.0 
-            
-            if channel_type == ChannelType.RECTANGULAR:
-                A = b * y
-                P = b + 2 * y
-                dAdy = b
-                dPdy = 2
-            elif channel_type == ChannelType.TRAPEZOIDAL:
-                A = b * y + 0.5 * (zL + zR) * y * y
-                P = b + y * math.sqrt(1 + zL * zL) + y * math.sqrt(1 + zR * zR)
-                dAdy = b + (zL + zR) * y
-                dPdy = math.sqrt(1 + zL * zL) + math.sqrt(1 + zR * zR)
-            elif channel_type == ChannelType.TRIANGULAR:
-                A = 0.5 * (zL + zR) * y * y
-                P = y * math.sqrt(1 + zL * zL) + y * math.sqrt(1 + zR * zR)
-                dAdy = (zL + zR) * y
-                dPdy = math.sqrt(1 + zL * zL) + math.sqrt(1 + zR * zR)
-            elif channel_type == ChannelType.IRREGULAR:
-                A, P, T, dPdy, dTdy = calculate_irregular_geometry(y, points)
-                dAdy = T
-            else:
-                raise ValueError(f"Unknown channel type: {channel_type}")
-
-            if P == 0:
-                y = 0.01
-                continue
-
-            R = A / P
-            f = kn * A * math.pow(R, 2/3) * sqrt_S - Q
-
-            dRdy = (dAdy * P - A * dPdy) / (P * P)
-            
-            if R <= 0:
-                y = 0.01
-                continue
-                
-            dfdy = kn * sqrt_S * (dAdy * math.pow(R, 2/3) + A * (2/3) * math.pow(R, -1/3) * dRdy)
-
-            if abs(dfdy) < 1e-12:
-                y += 0.1
-                continue
-
-            next_y = y - f / dfdy
-            
-            if next_y <= 0:
-                next_y = y * 0.5
-
-            if abs(next_y - y) < tolerance:
-                final_y = next_y
-                break
-            
-            y = next_y
-            if y <= 0:
-                y = 0.01
+        log_Q = math.log(kn * sqrt_S) - math.log(Q)
+
+        # ln(Q(y) / Q): increasing in y, scale-free, and well suited to Newton
+        def normal_residual(y):
+            A, P, T, dPdy, _ = geometry(y)
+            if A <= 0 or P <= 0:
+                return -math.inf, 0.0
+            f = (5 / 3) * math.log(A) - (2 / 3) * math.log(P) + log_Q
+            return f, (5 / 3) * T / A - (2 / 3) * dPdy / P
+
+        if initial_depth is not None and initial_depth > 0:
+            lo, hi, x0 = warm_bracket(normal_residual, initial_depth)
         else:
-             raise ValueError("Solver failed to converge after 100 iterations.")
-
-        # Recompute geometry at final_y
-        if channel_type == ChannelType.RECTANGULAR:
-            final_A = b * final_y
-            final_P = b + 2 * final_y
-            T = b
-        elif channel_type == ChannelType.TRAPEZOIDAL:
-            final_A = b * final_y + 0.5 * (zL + zR) * final_y * final_y
-            final_P = b + final_y * math.sqrt(1 + zL * zL) + final_y * math.sqrt(1 + zR * zR)
-            T = b + (zL + zR) * final_y
-        elif channel_type == ChannelType.TRIANGULAR:
-            final_A = 0.5 * (zL + zR) * final_y * final_y
-            final_P = final_y * math.sqrt(1 + zL * zL) + final_y * math.sqrt(1 + zR * zR)
-            T = (zL + zR) * final_y
-        elif channel_type == ChannelType.IRREGULAR:
-            final_A, final_P, T, _, _ = calculate_irregular_geometry(final_y, points)
+            # Initial guess
+            y = 1.0
+            if channel_type == ChannelType.IRREGULAR and max_elev > min_elev:
+                y = (max_elev - min_elev) * 0.2
+            lo, hi = expand_bracket(normal_residual, 0.0, y)
+            x0 = hi
+        root = bracketed_newton(normal_residual, lo, hi, x0=x0)
+        if not root.converged:
+            raise ValueError(f"Solver failed to converge after {root.iterations} iterations.")
+        final_y = root.root
+        iterations = root.iterations
+        residual = root.residual
+
+        final_A, final_P, T, _, _ = geometry(final_y)
 
     # --- Common Calculations (Velocity, Critical Depth, etc.) ---
     final_V = final_Q / final_A if final_A > 0 else 0
     R = final_A / final_P if final_P > 0 else 0
     D = final_A / T if T > 0 else 0
     Froude = final_V / math.sqrt(g * D) if D > 0 else 0
-    
-    regime = "Critical"
-    if Froude > 1.001:
-        regime = "Supercritical"
-    elif Froude < 0.999:
-        regime = "Subcritical"
+    regime = _flow_regime(Froude)
 
     # --- Critical Depth (yc) Calculation ---
-    yc = 1.0  # initial guess
-    if channel_type == ChannelType.RECTANGULAR:
-        yc = math.pow(final_Q * final_Q / (g * b * b), 1/3)
+    if channel_type == ChannelType.IRREGULAR:
+        yc = section_critical_depth(section, final_Q, g, x0=initial_critical_depth).root
     else:
-        # Newton-Raphson for yc
-        for _ in range(100):
-            if channel_type == ChannelType.TRAPEZOIDAL:
-                Ac = b * yc + 0.5 * (zL + zR) * yc * yc
-                Tc = b + (zL + zR) * yc
-                dAdyc = Tc
-                dTdyc = zL + zR
-            elif channel_type == ChannelType.TRIANGULAR:
-                Ac = 0.5 * (zL + zR) * yc * yc
-                Tc = (zL + zR) * yc
-                dAdyc = Tc
-                dTdyc = zL + zR
-            elif channel_type == ChannelType.IRREGULAR:
-                Ac, _, Tc, _, dTdyc = calculate_irregular_geometry(yc, points)
-                dAdyc = Tc
-            
-            if Ac <= 0:
-                yc = 0.01
-                continue
-                
-            f_yc = (final_Q * final_Q * Tc) / (g * math.pow(Ac, 3)) - 1
-            
-            numerator = (dTdyc * math.pow(Ac, 3) - Tc * 3 * math.pow(Ac, 2) * dAdyc)
-            denominator = math.pow(Ac, 6)
-            
-            if abs(denominator) < 1e-12:
-                yc += 0.1
-                continue
-                
-            dfdyc = (final_Q * final_Q / g) * numerator / denominator
-            
-            if abs(dfdyc) < 1e-12:
-                yc += 0.1
-                continue
-            
-            next_yc = yc - f_yc / dfdyc
-            if abs(next_yc - yc) < 1e-7:
-                yc = next_yc
-                break
-            yc = next_yc
-            if yc <= 0: yc = 0.01
+        yc = critical_depth(final_Q, *_prismatic_dimensions(params), g, x0=initial_critical_depth).root
 
     # Critical Slope (Sc)
-    if channel_type == ChannelType.RECTANGULAR:
-        Ac_final = b * yc
-        Pc_final = b + 2 * yc
-    elif channel_type == ChannelType.TRAPEZOIDAL:
-        Ac_final = b * yc + 0.5 * (zL + zR) * yc * yc
-        Pc_final = b + yc * math.sqrt(1 + zL * zL) + yc * math.sqrt(1 + zR * zR)
-    elif channel_type == ChannelType.TRIANGULAR:
-        Ac_final = 0.5 * (zL + zR) * yc * yc
-        Pc_final = yc * math.sqrt(1 + zL * zL) + yc * math.sqrt(1 + zR * zR)
-    elif channel_type == ChannelType.IRREGULAR:
-        Ac_final, Pc_final, _, _, _ = calculate_irregular_geometry(yc, points)
-    
+    Ac_final, Pc_final, _, _, _ = geometry(yc)
     Rc_final = Ac_final / Pc_final if Pc_final > 0 else 0
     if Ac_final > 0 and Rc_final > 0:
         Sc = math.pow(final_Q / (kn * Ac_final * math.pow(Rc_final, 2/3)), 2)
@@ -501,5 +413,228 @@ def solve_normal_depth(params: ChannelInput) -> ChannelResult:
         velocity_head=hv,
         specific_energy=E,
         discharge=final_Q,
+        iterations=iterations,
+        residual=residual,
+        simplification=getattr(section, "simplification", None),
         timestamp=datetime.now().isoformat()
     )
+
+class ChannelBatchResult(NamedTuple):
+    """Per-row result arrays from solve_normal_depth_batch (same names as ChannelResult)."""
+    depth: np.ndarray
+    area: np.ndarray
+    wetted_perimeter: np.ndarray
+    hydraulic_radius: np.ndarray
+    top_width: np.ndarray
+    velocity: np.ndarray
+    froude_number: np.ndarray
+    critical_depth: np.ndarray
+    critical_slope: np.ndarray
+    velocity_head: np.ndarray
+    specific_energy: np.ndarray
+    iterations: np.ndarray
+    residual: np.ndarray
+    converged: np.ndarray
+
+def _prismatic_geometry(y, b, zL, zR):
+    """
+    Vectorized Area, Wetted Perimeter, Top Width, dP/dy and dT/dy for prismatic sections.
+    Rectangular sections are zL = zR = 0, triangular sections are b = 0.
+    """
+    z = zL + zR
+    dPdy = np.sqrt(1 + zL * zL) + np.sqrt(1 + zR * zR)
+    A = b * y + 0.5 * z * y * y
+    P = b + y * dPdy
+    T = b + z * y
+    return A, P, T, dPdy, z
+
+def _prismatic_dimensions(params: ChannelInput) -> Tuple[float, float, float]:
+    """(b, zL, zR) of a rectangular, trapezoidal or triangular input as a general trapezoid."""
+    left = params.left_side_slope if params.left_side_slope > 0 else params.side_slope
+    right = params.right_side_slope if params.right_side_slope > 0 else params.side_slope
+    if params.type == ChannelType.RECTANGULAR:
+        return params.bottom_width, 0.0, 0.0
+    if params.type == ChannelType.TRIANGULAR:
+        return 0.0, left, right
+    return params.bottom_width, left, right
+
+def irregular_section(params: ChannelInput):
+    """
+    PreparedSection for an irregular channel's points, from stations/elevations arrays
+    or station_elevation_points; None when fewer than two points were given.
+    Dense sections are decimated first when simplify.section_tolerance asks for it
+    (cached per survey and tolerance, so repeated calls on one survey pay once).
+    """
+    if params.point_count() < 2:
+        return None
+    if params.stations is not None:
+        section = PreparedSection.from_arrays(params.stations, params.elevations)
+    else:
+        section = PreparedSection(params.station_elevation_points)
+    tolerance = section_tolerance(params)
+    if tolerance > 0:
+        section = get_simplified_section(section, tolerance)
+    return section
+
+def channel_geometry(params: ChannelInput, section=None):
+    """
+    Vectorized geometry for one non-gutter channel.
+    Returns (geometry, min_elevation, max_elevation) where geometry(y) maps an array of
+    depths to (A, P, T, dP/dy, dT/dy); the elevations are None for prismatic sections.
+    section: optional PreparedSection or HydraulicTable for irregular channels.
+    """
+    if params.type == ChannelType.IRREGULAR:
+        if section is None:
+            section = irregular_section(params)
+            if section is None:
+                raise ValueError("Station-Elevation points are required for irregular channels.")
+        return section.geometry_array, section.min_elevation, section.max_elevation
+    if params.type in (ChannelType.RECTANGULAR, ChannelType.TRAPEZOIDAL, ChannelType.TRIANGULAR):
+        b, zL, zR = _prismatic_dimensions(params)
+        return (lambda y: _prismatic_geometry(np.asarray(y, dtype=float), b, zL, zR)), None, None
+    raise ValueError(f"Unsupported channel type for geometry: {params.type}")
+
+@instrument_solver("normal_depth_batch", batch=True, type="prismatic")
+def solve_normal_depth_batch(
+    discharge,
+    bottom_width,
+    left_side_slope,
+    right_side_slope,
+    slope,
+    mannings_n,
+    units: Units = Units.IMPERIAL,
+    max_iterations: int = 100,
+    tolerance: float = 1e-9,
+    critical: bool = True,
+) -> ChannelBatchResult:
+    """
+    Vectorized normal depth solver for rectangular, trapezoidal and triangular sections.
+
+    All array arguments are broadcast together; each row is a general trapezoid
+    (rectangular: zL = zR = 0, triangular: b = 0). Safeguarded Newton
+    (roots.bracketed_newton_batch) runs on every row at once and stops iterating
+    rows as they converge. Rows with invalid input (non-positive Q, S or n, or zero
+    width with vertical sides) come back as NaN with converged = False instead of
+    raising. critical=False skips the critical depth and slope solve (returned as NaN).
+    """
+    Q, b, zL, zR, S, n = (
+        np.array(a, dtype=float)
+        for a in np.broadcast_arrays(
+            discharge, bottom_width, left_side_slope, right_side_slope, slope, mannings_n
+        )
+    )
+    k = 1.0 if units == Units.METRIC else 1.49
+    g = 9.81 if units == Units.METRIC else 32.174
+
+    valid = (Q > 0) & (S > 0) & (n > 0) & (b >= 0) & (zL >= 0) & (zR >= 0) & ((b > 0) | (zL + zR > 0))
+    kn = np.where(valid, k / np.where(valid, n, 1.0), np.nan)
+    sqrt_S = np.sqrt(np.where(valid, S, np.nan))
+    log_Q = np.log(np.where(valid, Q, np.nan))
+
+    # Normal depth: ln(kn * sqrt(S) * A^(5/3) / P^(2/3)) - ln(Q) = 0
+    def normal_residual(idx, y):
+        A, P, T, dPdy, _ = _prismatic_geometry(y, b[idx], zL[idx], zR[idx])
+        h = np.log(kn[idx] * sqrt_S[idx]) + (5.0 / 3.0) * np.log(A) - (2.0 / 3.0) * np.log(P) - log_Q[idx]
+        return h, (5.0 / 3.0) * T / A - (2.0 / 3.0) * dPdy / P
+
+    lo0 = np.where(valid, 0.0, np.nan)
+    hi0 = np.where(valid, 1.0, np.nan)
+    lo, hi = expand_bracket_batch(normal_residual, lo0, hi0)
+    normal = bracketed_newton_batch(normal_residual, lo, hi, x0=hi, tolerance=tolerance, max_iterations=max_iterations)
+    y = normal.root
+
+    if critical:
+        flow = critical_flow_batch(Q, b, zL, zR, n, units=units, tolerance=tolerance, max_iterations=max_iterations)
+        yc = np.where(valid, flow.depth, np.nan)
+        Sc = np.where(valid, flow.slope, np.nan)
+        converged = normal.converged & flow.converged
+    else:
+        yc = Sc = np.full(Q.shape, np.nan)
+        converged = normal.converged
+
+    A, P, T, _, _ = _prismatic_geometry(y, b, zL, zR)
+    R = A / P
+    V = Q / A
+    D = A / T
+    Froude = V / np.sqrt(g * D)
+
+    hv = V * V / (2 * g)
+    return ChannelBatchResult(
+        depth=y,
+        area=A,
+        wetted_perimeter=P,
+        hydraulic_radius=R,
+        top_width=T,
+        velocity=V,
+        froude_number=Froude,
+        critical_depth=yc,
+        critical_slope=Sc,
+        velocity_head=hv,
+        specific_energy=y + hv,
+        iterations=normal.iterations,
+        residual=normal.residual,
+        converged=converged,
+    )
+
+def _is_batchable(params: ChannelInput) -> bool:
+    if not (
+        params.type in (ChannelType.RECTANGULAR, ChannelType.TRAPEZOIDAL, ChannelType.TRIANGULAR)
+        and (params.solve_for or SolveFor.DEPTH) == SolveFor.DEPTH
+        and params.discharge is not None
+    ):
+        return False
+    # Sections with no flow area are left to solve_normal_depth, for its error message
+    b, zL, zR = _prismatic_dimensions(params)
+    return b > 0 or zL + zR > 0
+
+def solve_normal_depth_many(params_list: Sequence[ChannelInput]) -> List[Union[ChannelResult, ValueError]]:
+    """
+    Solve a list of channel inputs, returning a ChannelResult or the ValueError raised
+    for each entry (in input order). Prismatic depth solves are grouped per unit system
+    and routed through solve_normal_depth_batch; everything else uses solve_normal_depth,
+    so every entry fails with the same ValueError the scalar solver raises.
+    """
+    outcomes: List[Union[ChannelResult, ValueError, None]] = [None] * len(params_list)
+    groups = {}
+    for i, params in enumerate(params_list):
+        if _is_batchable(params):
+            groups.setdefault(params.units, []).append(i)
+            continue
+        try:
+            outcomes[i] = solve_normal_depth(params)
+        except ValueError as e:
+            outcomes[i] = e
+
+    for units, indices in groups.items():
+        rows = [params_list[i] for i in indices]
+        b, zL, zR = zip(*(_prismatic_dimensions(params) for params in rows))
+        batch = solve_normal_depth_batch(
+            [p.discharge for p in rows], b, zL, zR,
+            [p.slope for p in rows], [p.mannings_n for p in rows],
+            units=units,
+        )
+        timestamp = datetime.now().isoformat()
+        columns = {name: getattr(batch, name).tolist() for name in batch._fields}
+        for j, i in enumerate(indices):
+            if not columns["converged"][j]:
+                outcomes[i] = ValueError(f"Solver failed to converge after {columns['iterations'][j]} iterations.")
+                continue
+            outcomes[i] = ChannelResult(
+                depth=columns["depth"][j],
+                area=columns["area"][j],
+                wetted_perimeter=columns["wetted_perimeter"][j],
+                hydraulic_radius=columns["hydraulic_radius"][j],
+                velocity=columns["velocity"][j],
+                froude_number=columns["froude_number"][j],
+                top_width=columns["top_width"][j],
+                flow_regime=_flow_regime(columns["froude_number"][j]),
+                critical_depth=columns["critical_depth"][j],
+                critical_slope=columns["critical_slope"][j],
+                velocity_head=columns["velocity_head"][j],
+                specific_energy=columns["specific_energy"][j],
+                discharge=rows[j].discharge,
+                iterations=columns["iterations"][j],
+                residual=columns["residual"][j],
+                timestamp=timestamp,
+            )
+    return outcomes
@@ -0,0 +1,259 @@
+import math
+import weakref
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+from .schemas import Units
+from ..roots import (
+    RootBatchResult,
+    RootResult,
+    bracketed_newton,
+    bracketed_newton_batch,
+    expand_bracket,
+    expand_bracket_batch,
+)
+
+# Per-section (depths, running max of ln(A^3/T)) at the breakpoint depths
+_breakpoint_tables: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+class CriticalBatchResult(NamedTuple):
+    """Per-row critical flow arrays from critical_flow_batch."""
+    depth: np.ndarray
+    slope: np.ndarray
+    iterations: np.ndarray
+    converged: np.ndarray
+
+
+def critical_seed(discharge, bottom_width, left_side_slope, right_side_slope, g: float):
+    """
+    Explicit critical depth estimates for general trapezoids (vectorized).
+
+    Returns (seed, upper). Rectangular (zL = zR = 0) and triangular (b = 0) rows are
+    exact closed forms: yc = (Q^2 / (g b^2))^(1/3) and yc = (8 Q^2 / (g z^2))^(1/5)
+    with z = zL + zR. A trapezoid carries more A^3/T than either its rectangular or
+    its triangular part at the same depth, so the smaller of those two depths is an
+    upper bound on its critical depth; the seed is Straub's approximation
+    yc = 0.81 (Q^2 / (g m^0.75 b^1.25))^0.27 - b / (30 m) with m = z / 2, clipped
+    into (0, upper].
+    """
+    Q, b, zL, zR = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (discharge, bottom_width, left_side_slope, right_side_slope))
+    )
+    z = zL + zR
+    q2_g = Q * Q / g
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rect = np.where(b > 0, np.cbrt(q2_g / (b * b)), np.inf)
+        tri = np.where(z > 0, np.power(8.0 * q2_g / (z * z), 0.2), np.inf)
+        upper = np.minimum(rect, tri)
+        m = 0.5 * z
+        straub = 0.81 * np.power(q2_g / (np.power(m, 0.75) * np.power(b, 1.25)), 0.27) - b / (30.0 * m)
+    seed = np.where((straub > 0) & (straub < upper), straub, upper)
+    return seed, upper
+
+
+def critical_depth(
+    discharge: float,
+    bottom_width: float,
+    left_side_slope: float,
+    right_side_slope: float,
+    g: float,
+    tolerance: float = 1e-9,
+    max_iterations: int = 100,
+    x0: float = None,
+) -> RootResult:
+    """
+    Critical depth of one rectangular, trapezoidal or triangular section.
+
+    Closed form for rectangles and triangles; trapezoids run bracketed Newton on
+    ln(A^3 / T) - ln(Q^2 / g) inside [0, upper] from the Straub seed (critical_seed),
+    which typically converges in two or three iterations. x0 (e.g. a previous
+    critical depth) replaces the seed when it lies inside the bracket.
+    """
+    if discharge is None or discharge <= 0:
+        return RootResult(0.0, 0, 0.0, True)
+    b = bottom_width
+    zL = left_side_slope
+    zR = right_side_slope
+    z = zL + zR
+    if b <= 0 and z <= 0:
+        raise ValueError("Channel has no flow area; check bottom width and side slopes.")
+    q2_g = discharge * discharge / g
+    if z <= 0:
+        return RootResult((q2_g / (b * b)) ** (1.0 / 3.0), 0, 0.0, True)
+    if b <= 0:
+        return RootResult((8.0 * q2_g / (z * z)) ** 0.2, 0, 0.0, True)
+
+    seed, upper = critical_seed(discharge, b, zL, zR, g)
+    if x0 is not None and 0.0 < x0 <= upper:
+        seed = x0
+    log_q2_g = math.log(q2_g)
+
+    def residual(y):
+        A = b * y + 0.5 * z * y * y
+        T = b + z * y
+        return 3.0 * math.log(A) - math.log(T) - log_q2_g, 3.0 * T / A - z / T
+
+    return bracketed_newton(
+        residual, 0.0, float(upper), x0=float(seed), tolerance=tolerance, max_iterations=max_iterations
+    )
+
+
+def critical_flow_batch(
+    discharge,
+    bottom_width,
+    left_side_slope,
+    right_side_slope,
+    mannings_n,
+    units: Units = Units.IMPERIAL,
+    tolerance: float = 1e-9,
+    max_iterations: int = 100,
+) -> CriticalBatchResult:
+    """
+    Vectorized critical depth and critical slope for many prismatic sections.
+
+    Each row is a general trapezoid (rectangular: zL = zR = 0, triangular: b = 0).
+    Closed-form rows are filled directly; only true trapezoids iterate, all at once,
+    from their Straub seeds. Critical slope is Sc = (Q / (k/n A Rc^(2/3)))^2.
+    Rows with Q = 0 are 0; rows with invalid input are NaN with converged = False.
+    """
+    Q, b, zL, zR, n = (
+        np.array(a, dtype=float)
+        for a in np.broadcast_arrays(discharge, bottom_width, left_side_slope, right_side_slope, mannings_n)
+    )
+    k = 1.0 if units == Units.METRIC else 1.49
+    g = 9.81 if units == Units.METRIC else 32.174
+    z = zL + zR
+
+    valid = (Q >= 0) & (n > 0) & (b >= 0) & (zL >= 0) & (zR >= 0) & ((b > 0) | (z > 0))
+    flowing = valid & (Q > 0)
+    seed, upper = critical_seed(np.where(flowing, Q, 1.0), b, zL, zR, g)
+
+    yc = np.where(flowing, seed, np.where(valid, 0.0, np.nan))
+    iterations = np.zeros(Q.shape, dtype=int)
+    converged = valid.copy()
+
+    rows = np.flatnonzero(flowing & (b > 0) & (z > 0))
+    if rows.size:
+        bt, zt = b[rows], z[rows]
+        log_q2_g = np.log(Q[rows] ** 2 / g)
+
+        def residual(idx, y):
+            A = bt[idx] * y + 0.5 * zt[idx] * y * y
+            T = bt[idx] + zt[idx] * y
+            return 3.0 * np.log(A) - np.log(T) - log_q2_g[idx], 3.0 * T / A - zt[idx] / T
+
+        root = bracketed_newton_batch(
+            residual, np.zeros(rows.size), upper[rows], x0=seed[rows],
+            tolerance=tolerance, max_iterations=max_iterations,
+        )
+        yc[rows] = root.root
+        iterations[rows] = root.iterations
+        converged[rows] = root.converged
+
+    A = b * yc + 0.5 * z * yc * yc
+    P = b + yc * (np.sqrt(1 + zL * zL) + np.sqrt(1 + zR * zR))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        conveyance = (k / n) * A * np.power(A / P, 2.0 / 3.0)
+        Sc = np.where(flowing, (Q / conveyance) ** 2, np.where(valid, 0.0, np.nan))
+    return CriticalBatchResult(depth=yc, slope=Sc, iterations=iterations, converged=converged)
+
+
+def _breakpoint_table(section) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Breakpoint depths of a PreparedSection (or HydraulicTable rows) and the running
+    maximum of ln(A^3 / T) there, memoized per section object.
+    """
+    table = _breakpoint_tables.get(section)
+    if table is None:
+        depths = np.asarray(getattr(section, "breakpoints", getattr(section, "depth", None)), dtype=float)
+        depths = depths[depths > 0]
+        A, _, T, _, _ = section.geometry_array(depths)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_f = np.where((A > 0) & (T > 0), 3.0 * np.log(A) - np.log(T), -np.inf)
+        table = (depths, np.maximum.accumulate(log_f) if log_f.size else log_f)
+        _breakpoint_tables[section] = table
+    return table
+
+
+def _section_residual(geometry, log_q2_g):
+    def residual(y):
+        A, _, T, _, dTdy = geometry(y)
+        if A <= 0 or T <= 0:
+            return -math.inf, 0.0
+        return 3.0 * math.log(A) - math.log(T) - log_q2_g, 3.0 * T / A - dTdy / T
+    return residual
+
+
+def section_critical_depth(
+    section, discharge: float, g: float, tolerance: float = 1e-9, max_iterations: int = 100, x0: float = None
+) -> RootResult:
+    """
+    Critical depth of an irregular section (PreparedSection or HydraulicTable).
+
+    A^3/T is smooth between breakpoint depths, so the first breakpoint interval over
+    which it reaches Q^2/g brackets the (lowest) critical depth. Newton runs inside
+    that interval from a log-linear interpolation of A^3/T across it, or from x0
+    (e.g. a previous critical depth) when x0 lies inside the interval.
+    """
+    if discharge is None or discharge <= 0:
+        return RootResult(0.0, 0, 0.0, True)
+    depths, log_f = _breakpoint_table(section)
+    log_q2_g = math.log(discharge * discharge / g)
+    residual = _section_residual(section.geometry, log_q2_g)
+
+    i = int(np.searchsorted(log_f, log_q2_g))
+    if i >= depths.size:
+        top = float(depths[-1]) if depths.size else 0.0
+        lo, hi = expand_bracket(residual, top, 2.0 * top if top > 0 else 1.0)
+        return bracketed_newton(residual, lo, hi, x0=hi, tolerance=tolerance, max_iterations=max_iterations)
+
+    lo = float(depths[i - 1]) if i > 0 else 0.0
+    hi = float(depths[i])
+    if x0 is None or not lo < x0 <= hi:
+        x0 = hi
+        if i > 0 and math.isfinite(log_f[i - 1]) and log_f[i] > log_f[i - 1]:
+            x0 = lo + (log_q2_g - log_f[i - 1]) / (log_f[i] - log_f[i - 1]) * (hi - lo)
+    return bracketed_newton(residual, lo, hi, x0=x0, tolerance=tolerance, max_iterations=max_iterations)
+
+
+def section_critical_depths(
+    section, discharge, g: float, tolerance: float = 1e-9, max_iterations: int = 100
+) -> RootBatchResult:
+    """Vectorized section_critical_depth for an array of discharges on one section."""
+    Q = np.asarray(discharge, dtype=float)
+    positive = Q > 0
+    depths, log_f = _breakpoint_table(section)
+    log_q2_g = np.log(np.where(positive, Q * Q / g, np.nan))
+
+    def residual(idx, y):
+        A, _, T, _, dTdy = section.geometry_array(y)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return 3.0 * np.log(A) - np.log(T) - log_q2_g[idx], 3.0 * T / A - dTdy / T
+
+    padded_depths = np.concatenate(([0.0], depths))
+    padded_f = np.concatenate(([-np.inf], log_f))
+    i = np.searchsorted(log_f, np.where(positive, log_q2_g, -np.inf)) + 1
+    above = i > depths.size
+    i = np.minimum(i, depths.size)
+    lo = np.where(positive, padded_depths[i - 1], np.nan)
+    hi = np.where(positive, padded_depths[i], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fraction = (log_q2_g - padded_f[i - 1]) / (padded_f[i] - padded_f[i - 1])
+    x0 = np.where(np.isfinite(fraction), lo + fraction * (hi - lo), hi)
+
+    if above.any():
+        top = float(depths[-1]) if depths.size else 0.0
+        lo = np.where(above, top, lo)
+        hi = np.where(above, 2.0 * top if top > 0 else 1.0, hi)
+        lo, hi = expand_bracket_batch(residual, lo, hi)
+        x0 = np.where(above, hi, x0)
+
+    root = bracketed_newton_batch(residual, lo, hi, x0=x0, tolerance=tolerance, max_iterations=max_iterations)
+    return RootBatchResult(
+        np.where(positive, root.root, 0.0),
+        root.iterations,
+        np.where(positive, root.residual, 0.0),
+        root.converged | ~positive,
+    )
@@ -0,0 +1,192 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from .channels import _prismatic_geometry, solve_normal_depth_batch
+from .schemas import (
+    ChannelDesignInput,
+    ChannelDesignResult,
+    DesignCandidate,
+    DesignConstraints,
+    DesignRange,
+)
+
+# Candidates solved per vectorized call (and per task handed to a worker process)
+DESIGN_CHUNK_SIZE = 65536
+# Sweeps smaller than this are evaluated in-process; pool start-up would dominate
+PARALLEL_THRESHOLD = 500_000
+MAX_CANDIDATES = 200_000_000
+# Candidates compared against the running front at a time in pareto_front
+_PARETO_BLOCK = 256
+
+# Columns of the candidate rows passed between workers; names match DesignCandidate
+COLUMNS = (
+    "bottom_width", "left_side_slope", "right_side_slope", "mannings_n", "slope",
+    "depth", "velocity", "froude_number", "channel_depth", "top_width", "cost",
+)
+
+
+def _range_values(value: Union[float, DesignRange, None], name: str) -> np.ndarray:
+    if isinstance(value, DesignRange):
+        if value.values is not None:
+            values = np.asarray(value.values, dtype=float)
+        elif value.min is None:
+            raise ValueError(f"{name}: give either values or min (and max) for the design range.")
+        elif value.max is None or value.count == 1:
+            values = np.array([value.min])
+        elif value.max < value.min:
+            raise ValueError(f"{name}: max must not be below min.")
+        else:
+            values = np.linspace(value.min, value.max, value.count)
+    else:
+        values = np.array([value], dtype=float)
+    if not np.all(np.isfinite(values)) or np.any(values < 0):
+        raise ValueError(f"{name}: design values must be finite and non-negative.")
+    return values
+
+
+def pareto_front(points) -> np.ndarray:
+    """
+    Indices of the non-dominated rows of an (N, k) array of objectives to minimize,
+    ordered by the first objective. Of identical rows only the first is kept.
+
+    Rows are sorted lexicographically, so a row can only be dominated by rows before
+    it; two objectives need one running minimum, more objectives are checked a block
+    at a time against the front found so far.
+    """
+    points = np.asarray(points, dtype=float)
+    if points.ndim != 2:
+        raise ValueError("Objectives must be a 2-D array (candidates x objectives).")
+    if points.shape[0] == 0:
+        return np.empty(0, dtype=np.intp)
+    order = np.lexsort(points.T[::-1])
+    ranked = points[order]
+    if ranked.shape[1] == 1:
+        return order[:1]
+    if ranked.shape[1] == 2:
+        best_before = np.minimum.accumulate(ranked[:, 1])
+        keep = np.ones(ranked.shape[0], dtype=bool)
+        keep[1:] = ranked[1:, 1] < best_before[:-1]
+        return order[keep]
+
+    front = ranked[:0]
+    kept = []
+    for start in range(0, ranked.shape[0], _PARETO_BLOCK):
+        block = ranked[start:start + _PARETO_BLOCK]
+        dominated = (front[None, :, :] <= block[:, None, :]).all(axis=2).any(axis=1)
+        earlier = np.tri(block.shape[0], k=-1, dtype=bool)
+        dominated |= ((block[None, :, :] <= block[:, None, :]).all(axis=2) & earlier).any(axis=1)
+        survivors = np.flatnonzero(~dominated)
+        front = np.concatenate([front, block[survivors]])
+        kept.append(start + survivors)
+    return order[np.concatenate(kept)]
+
+
+def _evaluate_chunk(task) -> Tuple[int, int, Optional[np.ndarray], np.ndarray]:
+    """
+    Solve grid positions [start, stop) and reduce them to (evaluated, feasible,
+    minimum-cost row, Pareto front rows). Module level so worker processes can run it.
+    """
+    start, stop, axes, symmetric, settings = task
+    Q, units, excavation_cost, lining_cost, limits, objective_columns = settings
+    shape = tuple(axis.size for axis in axes)
+    positions = np.unravel_index(np.arange(start, stop), shape)
+    b, zL, zR, n, S = (axis[position] for axis, position in zip(axes, positions))
+    if symmetric:
+        zR = zL
+
+    solved = solve_normal_depth_batch(Q, b, zL, zR, S, n, units=units, critical=False)
+    y = solved.depth
+    channel_depth = y + limits["freeboard"]
+    A, P, T, _, _ = _prismatic_geometry(channel_depth, b, zL, zR)
+    cost = excavation_cost * A + lining_cost * P
+    rows = np.column_stack([b, zL, zR, n, S, y, solved.velocity, solved.froude_number, channel_depth, T, cost])
+
+    feasible = solved.converged.copy()
+    for column, limit, upper in (
+        (y, limits["max_depth"], True),
+        (solved.velocity, limits["min_velocity"], False),
+        (solved.velocity, limits["max_velocity"], True),
+        (solved.froude_number, limits["min_froude"], False),
+        (solved.froude_number, limits["max_froude"], True),
+        (channel_depth, limits["max_channel_depth"], True),
+        (T, limits["max_top_width"], True),
+    ):
+        if limit is not None:
+            feasible &= (column <= limit) if upper else (column >= limit)
+
+    rows = rows[feasible]
+    if rows.shape[0] == 0:
+        return stop - start, 0, None, rows
+    best = rows[np.argmin(rows[:, -1])]
+    front = rows[pareto_front(rows[:, objective_columns])]
+    return stop - start, rows.shape[0], best, front
+
+
+def _candidate(row: np.ndarray) -> DesignCandidate:
+    return DesignCandidate(**{name: float(value) for name, value in zip(COLUMNS, row)})
+
+
+def design_channel(params: ChannelDesignInput, max_candidates: int = MAX_CANDIDATES) -> ChannelDesignResult:
+    """
+    Sweep a grid of trapezoidal sections (b, zL, zR, n, S) for one design discharge.
+
+    Every grid point is solved with solve_normal_depth_batch in chunks of
+    DESIGN_CHUNK_SIZE; sweeps of PARALLEL_THRESHOLD candidates or more are spread over
+    a process pool. Each chunk is reduced to its feasible minimum-cost row and its own
+    Pareto front, so only those rows cross process boundaries; the global front is
+    the front of the chunk fronts. Grids larger than max_candidates raise ValueError.
+    """
+    symmetric = params.right_side_slope is None
+    axes = [
+        _range_values(params.bottom_width, "bottom_width"),
+        _range_values(params.left_side_slope, "left_side_slope"),
+        np.zeros(1) if symmetric else _range_values(params.right_side_slope, "right_side_slope"),
+        _range_values(params.mannings_n, "mannings_n"),
+        _range_values(params.slope, "slope"),
+    ]
+    total = int(np.prod([axis.size for axis in axes], dtype=np.int64))
+    if total > max_candidates:
+        raise ValueError(f"Design grid has {total} candidates; the limit is {max_candidates}.")
+
+    constraints: DesignConstraints = params.constraints
+    objective_columns = [COLUMNS.index(objective.value) for objective in params.objectives]
+    settings = (
+        params.discharge, params.units, params.excavation_cost, params.lining_cost,
+        constraints.model_dump(), objective_columns,
+    )
+    tasks = [
+        (start, min(start + DESIGN_CHUNK_SIZE, total), axes, symmetric, settings)
+        for start in range(0, total, DESIGN_CHUNK_SIZE)
+    ]
+
+    workers = params.workers or os.cpu_count() or 1
+    if workers > 1 and total >= PARALLEL_THRESHOLD:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            outcomes = list(pool.map(_evaluate_chunk, tasks))
+    else:
+        outcomes = [_evaluate_chunk(task) for task in tasks]
+
+    evaluated = sum(outcome[0] for outcome in outcomes)
+    feasible = sum(outcome[1] for outcome in outcomes)
+    best_rows = [outcome[2] for outcome in outcomes if outcome[2] is not None]
+    fronts = [outcome[3] for outcome in outcomes if outcome[3].shape[0]]
+
+    best = None
+    front: List[DesignCandidate] = []
+    if best_rows:
+        best_rows = np.vstack(best_rows)
+        best = _candidate(best_rows[np.argmin(best_rows[:, -1])])
+        rows = np.vstack(fronts)
+        front = [_candidate(rows[i]) for i in pareto_front(rows[:, objective_columns])]
+
+    return ChannelDesignResult(
+        evaluated=evaluated,
+        feasible=feasible,
+        best=best,
+        pareto_front=front,
+        timestamp=datetime.now().isoformat(),
+    )
@@ -0,0 +1,330 @@
+import math
+from datetime import datetime
+from typing import Optional, Sequence
+
+import numpy as np
+
+from .channels import _prismatic_dimensions, channel_geometry, irregular_section
+from .critical import critical_flow_batch, section_critical_depths
+from .schemas import (
+    BoundaryType,
+    ChannelInput,
+    ChannelType,
+    DirectStepInput,
+    ProfileBoundary,
+    ProfileRegime,
+    ProfileResult,
+    StandardStepInput,
+    Units,
+    WaterSurfaceProfile,
+)
+from .sections import PreparedSection
+from ..roots import bracketed_newton_batch, expand_bracket_batch
+
+# Direct step depths approach the limiting depth to within this fraction of the
+# boundary offset (the normal depth is only reached asymptotically)
+DIRECT_STEP_APPROACH = 1e-3
+
+
+class _Section:
+    """Geometry of one cross section prepared once and shared by every discharge."""
+
+    def __init__(self, channel: ChannelInput, invert_elevation: float, section=None):
+        if channel.type == ChannelType.IRREGULAR and section is None:
+            section = irregular_section(channel)
+        self.channel = channel
+        self.section = section
+        self.geometry, min_elev, _ = channel_geometry(channel, section)
+        self.invert = min_elev if min_elev is not None else invert_elevation
+        self.kn = (1.0 if channel.units == Units.METRIC else 1.49) / channel.mannings_n
+
+    def critical_depths(self, Q: np.ndarray, g: float) -> np.ndarray:
+        if self.section is not None:
+            return section_critical_depths(self.section, Q, g).root
+        return critical_flow_batch(
+            Q, *_prismatic_dimensions(self.channel), self.channel.mannings_n, units=self.channel.units
+        ).depth
+
+    def normal_depths(self, Q: np.ndarray, slope: float) -> np.ndarray:
+        log_q = np.log(Q) - math.log(self.kn * math.sqrt(slope))
+
+        def residual(idx, y):
+            A, P, T, dP, _ = self.geometry(y)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                f = (5.0 / 3.0) * np.log(A) - (2.0 / 3.0) * np.log(P) - log_q[idx]
+                return f, (5.0 / 3.0) * T / A - (2.0 / 3.0) * dP / P
+
+        lo, hi = expand_bracket_batch(residual, np.zeros(Q.shape), np.ones(Q.shape))
+        root = bracketed_newton_batch(residual, lo, hi, x0=hi)
+        if not root.converged.all():
+            raise ValueError("Normal depth failed to converge at the boundary section.")
+        return root.root
+
+    def conveyance(self, y: np.ndarray):
+        """Flow area and conveyance K = k/n A R^(2/3) at depths y."""
+        A, P, _, _, _ = self.geometry(y)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            K = self.kn * A * np.power(np.where(P > 0, A / P, 0.0), 2.0 / 3.0)
+        return A, K
+
+
+def _discharges(values: Sequence[float]) -> np.ndarray:
+    Q = np.asarray(values, dtype=float)
+    if Q.ndim != 1 or not np.all(Q > 0):
+        raise ValueError("Discharges must be greater than zero.")
+    return Q
+
+
+def _gravity(channels: Sequence[ChannelInput]) -> float:
+    units = {channel.units for channel in channels}
+    if len(units) > 1:
+        raise ValueError("All sections of a profile must use the same units.")
+    return 9.81 if units.pop() == Units.METRIC else 32.174
+
+
+def _boundary_values(boundary: ProfileBoundary, count: int) -> np.ndarray:
+    if not boundary.values:
+        raise ValueError(f"Boundary values are required for a {boundary.type.value} boundary.")
+    values = np.asarray(boundary.values, dtype=float)
+    if values.size == 1:
+        return np.full(count, values[0])
+    if values.size != count:
+        raise ValueError("Provide one boundary value per discharge or a single value for all.")
+    return values
+
+
+def _boundary_depths(boundary: ProfileBoundary, section: _Section, invert: float, Q: np.ndarray, yc: np.ndarray):
+    """Depth at the boundary section for every discharge."""
+    if boundary.type == BoundaryType.CRITICAL_DEPTH:
+        return yc.copy()
+    if boundary.type == BoundaryType.NORMAL_DEPTH:
+        return section.normal_depths(Q, boundary.slope or section.channel.slope)
+    values = _boundary_values(boundary, Q.size)
+    if boundary.type == BoundaryType.KNOWN_WSE:
+        values = values - invert
+    if np.any(values <= 0):
+        raise ValueError("Boundary water surface must be above the channel invert.")
+    return values
+
+
+def _profile(Q, station, invert, y, A, T, yc, assumed, g) -> WaterSurfaceProfile:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        V = np.where(A > 0, Q / A, 0.0)
+        froude = np.where(T > 0, V / np.sqrt(g * A / T), 0.0)
+    return WaterSurfaceProfile(
+        discharge=float(Q),
+        station=np.asarray(station, dtype=float).tolist(),
+        invert_elevation=np.asarray(invert, dtype=float).tolist(),
+        depth=y.tolist(),
+        water_surface_elevation=(invert + y).tolist(),
+        energy_grade_elevation=(invert + y + V * V / (2 * g)).tolist(),
+        velocity=V.tolist(),
+        froude_number=froude.tolist(),
+        critical_depth=np.asarray(yc, dtype=float).tolist(),
+        critical_assumed=np.asarray(assumed, dtype=bool).tolist(),
+    )
+
+
+def standard_step_profile(params: StandardStepInput, sections: Optional[Sequence] = None) -> ProfileResult:
+    """
+    Standard step water surface profiles through a reach, for every discharge at once.
+
+    Subcritical profiles start at the downstream boundary and step upstream;
+    supercritical profiles start upstream and step downstream. Each step solves the
+    energy equation
+
+        WS_j + V_j^2/2g = WS_i + V_i^2/2g +/- (L * Sf + C * |V_j^2/2g - V_i^2/2g|)
+
+    with the average-conveyance friction slope Sf = (2Q / (K_i + K_j))^2 for the
+    unknown depth at section j, by bracketed Newton on the requested branch of the
+    specific energy curve ([yc, inf) subcritical, (0, yc] supercritical), vectorized
+    across discharges and seeded from a level water surface. Where the energy
+    equation has no solution on that branch, critical depth is used and flagged.
+
+    sections: optional PreparedSection/HydraulicTable per input section (None for
+    prismatic ones) so repeated runs on the same reach skip re-preparing geometry.
+    """
+    Q = _discharges(params.discharges)
+    g = _gravity([s.channel for s in params.sections])
+    prepared = [
+        _Section(s.channel, s.invert_elevation, sections[i] if sections else None)
+        for i, s in enumerate(params.sections)
+    ]
+    n_sections = len(prepared)
+    subcritical = params.regime == ProfileRegime.SUBCRITICAL
+    sign = 1.0 if subcritical else -1.0
+
+    yc = np.array([s.critical_depths(Q, g) for s in prepared])
+    invert = np.array([s.invert for s in prepared])
+    y = np.empty((n_sections, Q.size))
+    assumed = np.zeros((n_sections, Q.size), dtype=bool)
+
+    order = list(range(n_sections - 1, -1, -1) if subcritical else range(n_sections))
+    first = order[0]
+    y0 = _boundary_depths(params.boundary, prepared[first], invert[first], Q, yc[first])
+    wrong_side = (y0 < yc[first]) if subcritical else (y0 > yc[first])
+    y[first] = np.where(wrong_side, yc[first], y0)
+    assumed[first] = wrong_side
+
+    for i, j in zip(order[:-1], order[1:]):
+        known = prepared[i]
+        target = prepared[j]
+        # Reach length between the two sections (stored on the upstream one)
+        L = params.sections[min(i, j)].reach_length
+        A_i, K_i = known.conveyance(y[i])
+        hv_i = Q * Q / (2 * g * A_i * A_i)
+        H_i = invert[i] + y[i] + hv_i
+        z_j = invert[j]
+        Cc = params.contraction_coefficient
+        Ce = params.expansion_coefficient
+        kn_j = target.kn
+
+        def residual(idx, yj):
+            A, P, T, dP, _ = target.geometry(yj)
+            q = Q[idx]
+            with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+                R = A / P
+                R23 = np.power(R, 2.0 / 3.0)
+                K = kn_j * A * R23
+                dK = kn_j * R23 * ((5.0 / 3.0) * T - (2.0 / 3.0) * R * dP)
+                hv = q * q / (2 * g * A * A)
+                dhv = -q * q * T / (g * A * A * A)
+                K_sum = K_i[idx] + K
+                hf = L * (2 * q / K_sum) ** 2
+                dhf = -2 * hf / K_sum * dK
+                diff = hv - hv_i[idx]
+                # Contraction where the velocity head grows in the direction of flow
+                C = np.where(-sign * diff > 0, Cc, Ce)
+                ho = C * np.abs(diff)
+                dho = C * np.sign(diff) * dhv
+                f = sign * (z_j + yj + hv - H_i[idx]) - hf - ho
+                df = sign * (1 + dhv) - dhf - dho
+            return f, df
+
+        all_rows = np.arange(Q.size)
+        yc_j = yc[j]
+        f_c, _ = residual(all_rows, yc_j)
+        solvable = (f_c < 0) if subcritical else (f_c > 0)
+        seed = invert[i] + y[i] - z_j
+        if subcritical:
+            lo = np.where(solvable, yc_j, np.nan)
+            hi = np.where(solvable, 1.5 * np.maximum(seed, yc_j), np.nan)
+            lo, hi = expand_bracket_batch(residual, lo, hi)
+        else:
+            lo = np.where(solvable, 0.0, np.nan)
+            hi = np.where(solvable, yc_j, np.nan)
+        root = bracketed_newton_batch(residual, lo, hi, x0=seed)
+        ok = solvable & root.converged
+        y[j] = np.where(ok, root.root, yc_j)
+        assumed[j] = ~ok
+
+    reach = np.array([s.reach_length for s in params.sections])
+    station = np.append(np.cumsum(reach[:-1][::-1])[::-1], 0.0)
+    geometry = [s.geometry(y[k]) for k, s in enumerate(prepared)]
+    A = np.array([values[0] for values in geometry])
+    T = np.array([values[2] for values in geometry])
+    profiles = [
+        _profile(Q[q], station, invert, y[:, q], A[:, q], T[:, q], yc[:, q], assumed[:, q], g)
+        for q in range(Q.size)
+    ]
+    return ProfileResult(
+        method="standard_step",
+        regime=params.regime,
+        profiles=profiles,
+        timestamp=datetime.now().isoformat(),
+    )
+
+
+def _step_distances(section: _Section, Q: np.ndarray, depths: np.ndarray, S0: float, g: float, subcritical: bool):
+    """Cumulative direct step distances from the boundary along rows of depths (one row per discharge)."""
+    A, P, _, _, _ = section.geometry(depths)
+    q = Q[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        K = section.kn * A * np.power(A / P, 2.0 / 3.0)
+        E = depths + q * q / (2 * g * A * A)
+        Sf = (q / K) ** 2
+        dx = np.diff(E, axis=1) / (S0 - 0.5 * (Sf[:, :-1] + Sf[:, 1:]))
+    steps = -dx if subcritical else dx
+    return np.concatenate((np.zeros((Q.size, 1)), np.cumsum(steps, axis=1)), axis=1)
+
+
+def direct_step_profile(params: DirectStepInput, section=None) -> ProfileResult:
+    """
+    Direct step water surface profiles along a prismatic reach, for every discharge at once.
+
+    Depths are stepped from the boundary depth towards the limiting depth of the
+    profile (normal depth, or critical depth where the normal depth lies in the other
+    regime). The distance of each step is
+
+        dx = (E2 - E1) / (S0 - (Sf1 + Sf2) / 2)
+
+    A first fine pass (8 * steps equal depth increments) locates the curve; the
+    returned profile is recomputed at `steps` depths taken at evenly spaced distances
+    along it, so the points are spent on the part of the curve inside the reach.
+    Where the profile reaches normal depth (within DIRECT_STEP_APPROACH) before the
+    end of the reach it stays uniform; where it reaches critical depth it ends there.
+    Subcritical profiles run upstream from the downstream end, supercritical profiles
+    downstream from the upstream end.
+    section: optional PreparedSection/HydraulicTable for an irregular channel.
+    """
+    Q = _discharges(params.discharges)
+    channel = params.channel
+    g = _gravity([channel])
+    prepared = _Section(channel, params.invert_elevation, section)
+    S0 = channel.slope
+    length = params.length
+    subcritical = params.regime == ProfileRegime.SUBCRITICAL
+
+    yc = prepared.critical_depths(Q, g)
+    yn = prepared.normal_depths(Q, S0)
+    boundary_station = 0.0 if subcritical else length
+    y_b = _boundary_depths(params.boundary, prepared, prepared.invert + S0 * boundary_station, Q, yc)
+    wrong_side = (y_b < yc) if subcritical else (y_b > yc)
+    y_b = np.where(wrong_side, yc, y_b)
+    limit = np.maximum(yn, yc) if subcritical else np.minimum(yn, yc)
+    uniform = np.abs(y_b - limit) <= 1e-9 * np.maximum(1.0, limit)
+
+    # Fine pass, then depths at evenly spaced distances up to the end of the reach (or
+    # to where the limiting depth is reached first)
+    fraction = np.linspace(0.0, 1.0 - DIRECT_STEP_APPROACH, 8 * params.steps + 1)
+    fine = y_b[:, None] + (limit - y_b)[:, None] * fraction[None, :]
+    fine_distance = _step_distances(prepared, Q, fine, S0, g, subcritical)
+    reaches_end = fine_distance[:, -1] > length
+    depths = np.empty((Q.size, params.steps + 1))
+    for r in range(Q.size):
+        end = length if reaches_end[r] else fine_distance[r, -1]
+        targets = np.linspace(0.0, end, params.steps + 1)
+        depths[r] = fine[r, 0] if uniform[r] else np.interp(targets, fine_distance[r], fine[r])
+    distance = _step_distances(prepared, Q, depths, S0, g, subcritical)
+
+    profiles = []
+    for r in range(Q.size):
+        if uniform[r]:
+            x = np.array([0.0, length])
+            y = np.full(2, y_b[r])
+        else:
+            x, y = distance[r], depths[r]
+            keep = np.flatnonzero(x < length)
+            end = keep[-1] + 1
+            if end < x.size or reaches_end[r]:
+                # Close the profile at the end of the reach, never past the limiting depth
+                k = min(end, x.size - 1)
+                w = (length - x[k - 1]) / (x[k] - x[k - 1])
+                y_last = y[k - 1] + w * (y[k] - y[k - 1])
+                y_last = min(max(y_last, min(y[k - 1], limit[r])), max(y[k - 1], limit[r]))
+                x, y = np.append(x[:end], length), np.append(y[:end], y_last)
+            elif limit[r] == yn[r]:
+                x, y = np.append(x, length), np.append(y, yn[r])
+        A, _, T, _, _ = prepared.geometry(y)
+        station = x if subcritical else length - x
+        assumed = np.zeros(x.size, dtype=bool)
+        assumed[0] = wrong_side[r]
+        profiles.append(_profile(
+            Q[r], station, prepared.invert + S0 * station, y, A, T, np.full(x.size, yc[r]), assumed, g
+        ))
+    return ProfileResult(
+        method="direct_step",
+        regime=params.regime,
+        profiles=profiles,
+        timestamp=datetime.now().isoformat(),
+    )
@@ -0,0 +1,205 @@
+import hashlib
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .sections import PreparedSection
+
+# Maximum number of tables kept by get_hydraulic_table
+TABLE_CACHE_SIZE = 128
+
+_table_cache: "OrderedDict[str, HydraulicTable]" = OrderedDict()
+# Guards _table_cache: solves run on the API executor's worker threads
+_table_cache_lock = threading.Lock()
+
+
+def section_key(points: List[Tuple[float, float]]) -> str:
+    """Stable hash of an irregular section's station-elevation points (order-insensitive)."""
+    ordered = np.array(sorted((float(x), float(z)) for x, z in points), dtype="<f8")
+    return hashlib.sha1(ordered.tobytes()).hexdigest()
+
+
+class HydraulicTable:
+    """
+    Hydraulic property table (HTAB) for an irregular cross section.
+
+    Rows are tabulated at every breakpoint depth of the section plus a fixed number
+    of uniform depth increments. Between two breakpoints the top width and wetted
+    perimeter of a polyline section vary linearly with depth and the area is their
+    quadratic integral, so geometry() reproduces calculate_irregular_geometry exactly
+    (to floating point round-off) at any depth, not just at the tabulated rows.
+    P and T jump at the elevation of a horizontal segment, so rows hold their values
+    just above the row depth.
+    Conveyance K = A * R^(2/3) (without k/n, so it is independent of roughness) and
+    dK/dy are stored per row for rating and reporting.
+    """
+
+    def __init__(
+        self,
+        depth,
+        area,
+        wetted_perimeter,
+        top_width,
+        dP_dy,
+        dT_dy,
+        min_elevation: float,
+        max_elevation: float,
+        key: Optional[str] = None,
+    ):
+        self.depth = np.asarray(depth, dtype=float)
+        self.area = np.asarray(area, dtype=float)
+        self.wetted_perimeter = np.asarray(wetted_perimeter, dtype=float)
+        self.top_width = np.asarray(top_width, dtype=float)
+        self.dP_dy = np.asarray(dP_dy, dtype=float)
+        self.dT_dy = np.asarray(dT_dy, dtype=float)
+        self.min_elevation = float(min_elevation)
+        self.max_elevation = float(max_elevation)
+        self.key = key
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            radius = np.where(self.wetted_perimeter > 0, self.area / self.wetted_perimeter, 0.0)
+            self.conveyance = self.area * np.power(radius, 2.0 / 3.0)
+            # dK/dy = R^(2/3) * (5/3 * T - 2/3 * R * dP/dy)
+            self.dK_dy = np.where(
+                self.area > 0,
+                np.power(radius, 2.0 / 3.0) * ((5.0 / 3.0) * self.top_width - (2.0 / 3.0) * radius * self.dP_dy),
+                0.0,
+            )
+
+        # Plain lists make the scalar lookup in geometry() cheap
+        self._depth = self.depth.tolist()
+        self._rows = list(zip(
+            self.area.tolist(),
+            self.wetted_perimeter.tolist(),
+            self.top_width.tolist(),
+            self.dP_dy.tolist(),
+            self.dT_dy.tolist(),
+        ))
+
+    def geometry(self, y_depth: float) -> Tuple[float, float, float, float, float]:
+        """
+        Same contract as calculate_irregular_geometry:
+        (Area, Perimeter, TopWidth, dP_dy, dT_dy) at a depth above the thalweg.
+        """
+        if y_depth <= 0 or not self._depth:
+            return 0.0, 0.0, 0.0, 0.0, 0.0
+        i = bisect_right(self._depth, y_depth) - 1
+        A, P, T, dP, dT = self._rows[i]
+        dy = y_depth - self._depth[i]
+        return A + T * dy + 0.5 * dT * dy * dy, P + dP * dy, T + dT * dy, dP, dT
+
+    def geometry_array(self, y_depth) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized geometry() for an array of depths."""
+        y = np.asarray(y_depth, dtype=float)
+        i = np.clip(np.searchsorted(self.depth, y, side="right") - 1, 0, len(self.depth) - 1)
+        dy = y - self.depth[i]
+        T0, dT, dP = self.top_width[i], self.dT_dy[i], self.dP_dy[i]
+        A = self.area[i] + T0 * dy + 0.5 * dT * dy * dy
+        P = self.wetted_perimeter[i] + dP * dy
+        T = T0 + dT * dy
+        dry = y <= 0
+        if dry.any():
+            A, P, T, dP, dT = (np.where(dry, 0.0, a) for a in (A, P, T, dP, dT))
+        return A, P, T, dP, dT
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form, suitable for storing in a project Scenario."""
+        return {
+            "key": self.key,
+            "min_elevation": self.min_elevation,
+            "max_elevation": self.max_elevation,
+            "depth": self.depth.tolist(),
+            "area": self.area.tolist(),
+            "wetted_perimeter": self.wetted_perimeter.tolist(),
+            "top_width": self.top_width.tolist(),
+            "dP_dy": self.dP_dy.tolist(),
+            "dT_dy": self.dT_dy.tolist(),
+            "conveyance": self.conveyance.tolist(),
+            "dK_dy": self.dK_dy.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HydraulicTable":
+        return cls(
+            depth=data["depth"],
+            area=data["area"],
+            wetted_perimeter=data["wetted_perimeter"],
+            top_width=data["top_width"],
+            dP_dy=data["dP_dy"],
+            dT_dy=data["dT_dy"],
+            min_elevation=data["min_elevation"],
+            max_elevation=data["max_elevation"],
+            key=data.get("key"),
+        )
+
+
+def build_hydraulic_table(points, increments: int = 20) -> HydraulicTable:
+    """
+    Build a HydraulicTable for an irregular section from its station-elevation points
+    or a PreparedSection.
+
+    increments: number of uniform depth steps between the thalweg and the highest
+    point, added on top of the section's own breakpoint elevations.
+    """
+    if increments < 0:
+        raise ValueError("Table increments must be zero or positive.")
+
+    section = points if isinstance(points, PreparedSection) else PreparedSection(points)
+    min_elev = section.min_elevation
+    max_elev = section.max_elevation
+    span = max_elev - min_elev
+
+    depths = np.unique(np.concatenate([
+        section.breakpoints,
+        np.linspace(0.0, span, increments + 1) if increments else [0.0],
+    ]))
+
+    # Within each interval P(y) and T(y) are linear, but they jump at the elevation of
+    # a horizontal segment (flat bed or overbank). Take slopes at the interval
+    # midpoints and store right-hand limits at each row so the jump is kept.
+    # Above the top row every segment is submerged and the slopes are constant.
+    next_depth = np.append(depths[1:], depths[-1] + max(span, 1.0))
+    mid = 0.5 * (depths + next_depth)
+    _, P_mid, T_mid, dP_dy, dT_dy = section.geometry_array(mid)
+    half = mid - depths
+    area, _, _, _, _ = section.geometry_array(depths)
+    perimeter = P_mid - dP_dy * half
+    top_width = T_mid - dT_dy * half
+
+    return HydraulicTable(
+        depth=depths,
+        area=area,
+        wetted_perimeter=perimeter,
+        top_width=top_width,
+        dP_dy=dP_dy,
+        dT_dy=dT_dy,
+        min_elevation=min_elev,
+        max_elevation=max_elev,
+        key=section_key(section.points()),
+    )
+
+
+def get_hydraulic_table(points: List[Tuple[float, float]], increments: int = 20) -> HydraulicTable:
+    """Return a cached HydraulicTable for the section, building it on first use."""
+    key = f"{section_key(points)}:{increments}"
+    with _table_cache_lock:
+        table = _table_cache.get(key)
+        if table is not None:
+            _table_cache.move_to_end(key)
+            return table
+    # Built outside the lock; concurrent misses on one key build it twice, harmlessly
+    table = build_hydraulic_table(points, increments)
+    with _table_cache_lock:
+        _table_cache[key] = table
+        _table_cache.move_to_end(key)
+        if len(_table_cache) > TABLE_CACHE_SIZE:
+            _table_cache.popitem(last=False)
+    return table
+
+
+def clear_table_cache():
+    with _table_cache_lock:
+        _table_cache.clear()
@@ -0,0 +1,129 @@
+import math
+from datetime import datetime
+
+import numpy as np
+
+from .channels import channel_geometry, irregular_section
+from .schemas import ChannelType, HydrographInput, HydrographResult, Units
+from ..roots import RootBatchResult, bracketed_newton_batch, expand_bracket_batch
+from ..spread import gutter_flow_array, solve_spread_batch
+
+# Distinct discharges solved cold, evenly spaced by rank; every other discharge starts
+# from log-log interpolation between the two knots around it
+CONTINUATION_KNOTS = 64
+
+# Relative widening of the knot brackets, far above the solver tolerance, so a
+# discharge next to a knot is still bracketed when the knot depth has round-off
+KNOT_MARGIN = 1e-6
+
+
+def _continuation(residual, log_q: np.ndarray, start: float, tolerance: float = 1e-9) -> RootBatchResult:
+    """
+    Roots of residual(idx, y) for every sorted distinct ln(Q) in log_q.
+
+    Depth increases with discharge, so the depths solved cold at CONTINUATION_KNOTS
+    knots bracket every discharge between them, and interpolating ln(y) against ln(Q)
+    (a power law between knots) starts Newton within a few digits of the root.
+    """
+    m = log_q.size
+    knots = np.unique(np.linspace(0, m - 1, min(m, CONTINUATION_KNOTS)).round().astype(np.intp))
+
+    def knot_residual(idx, y):
+        return residual(knots[idx], y)
+
+    lo, hi = expand_bracket_batch(knot_residual, np.zeros(knots.size), np.full(knots.size, start))
+    cold = bracketed_newton_batch(knot_residual, lo, hi, x0=hi, tolerance=tolerance)
+    if not cold.converged.all():
+        return RootBatchResult(
+            np.full(m, np.nan), np.full(m, cold.iterations.max()), np.full(m, np.nan), np.zeros(m, dtype=bool)
+        )
+
+    above = np.minimum(np.searchsorted(knots, np.arange(m)), knots.size - 1)
+    below = np.maximum(above - 1, 0)
+    lo = cold.root[below] * (1.0 - KNOT_MARGIN)
+    hi = cold.root[above] * (1.0 + KNOT_MARGIN)
+    x0 = np.exp(np.interp(log_q, log_q[knots], np.log(cold.root)))
+    warm = bracketed_newton_batch(residual, lo, hi, x0=x0, tolerance=tolerance)
+    iterations = warm.iterations
+    iterations[knots] += cold.iterations
+    return RootBatchResult(warm.root, iterations, warm.residual, warm.converged)
+
+
+def solve_hydrograph(params: HydrographInput, section=None) -> HydrographResult:
+    """
+    Normal depth, velocity and Froude number at every timestep of a hydrograph.
+
+    Each distinct non-zero discharge is solved once, however many timesteps repeat it,
+    in vectorized passes over all of them: the sorted discharges are solved by
+    continuation (see _continuation), so most need one or two Newton iterations.
+    Gutters solve spread instead (solve_spread_batch) and report the depth at the curb.
+    section: optional PreparedSection or HydraulicTable for irregular channels.
+    """
+    channel = params.channel
+    discharge = params.discharge
+    metric = channel.units == Units.METRIC
+    g = 9.81 if metric else 32.174
+
+    wet = discharge > 0
+    q, inverse = np.unique(discharge[wet], return_inverse=True)
+    min_elev = None
+    spread = None
+
+    if channel.type == ChannelType.GUTTER:
+        W = channel.gutter_width
+        Sg = channel.gutter_cross_slope
+        Sx = channel.road_cross_slope
+        if Sg <= 0 or Sx <= 0:
+            raise ValueError("Cross slopes must be greater than zero.")
+        k = 1.0 if metric else 1.486
+        root = solve_spread_batch(q, channel.slope, channel.mannings_n, W, Sg, Sx, k)
+        spread = root.root
+        _, y, A = gutter_flow_array(spread, channel.slope, channel.mannings_n, W, Sg, Sx, k)
+        T = spread
+    else:
+        if channel.type == ChannelType.IRREGULAR and section is None:
+            section = irregular_section(channel)
+        geometry, min_elev, max_elev = channel_geometry(channel, section)
+        kn = (1.0 if metric else 1.49) / channel.mannings_n
+        log_q = np.log(q)
+        log_kn_sqrt_S = math.log(kn * math.sqrt(channel.slope))
+
+        # ln(Q(y) / Q), as in solve_normal_depth
+        def residual(idx, y):
+            A, P, T, dPdy, _ = geometry(y)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                f = log_kn_sqrt_S + (5.0 / 3.0) * np.log(A) - (2.0 / 3.0) * np.log(P) - log_q[idx]
+                df = (5.0 / 3.0) * T / A - (2.0 / 3.0) * dPdy / P
+            return f, df
+
+        start = 0.2 * (max_elev - min_elev) if min_elev is not None and max_elev > min_elev else 1.0
+        root = _continuation(residual, log_q, start) if q.size else RootBatchResult(q, q.astype(int), q, q > 0)
+        y = root.root
+        A, _, T, _, _ = geometry(y)
+
+    if not root.converged.all():
+        failed = int(np.count_nonzero(~root.converged))
+        raise ValueError(f"Solver failed to converge for {failed} of {q.size} distinct discharges.")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        V = np.where(A > 0, q / A, 0.0)
+        D = np.where(T > 0, A / T, 0.0)
+        Froude = np.where(D > 0, V / np.sqrt(g * D), 0.0)
+
+    def per_step(values):
+        out = np.zeros(discharge.shape)
+        out[wet] = values[inverse]
+        return out
+
+    depth = per_step(y)
+    return HydrographResult(
+        depth=depth,
+        water_surface_elevation=depth + min_elev if min_elev is not None else None,
+        velocity=per_step(V),
+        froude_number=per_step(Froude),
+        spread=per_step(spread) if spread is not None else None,
+        unique_discharges=q.size,
+        iterations=int(root.iterations.max(initial=0)),
+        simplification=getattr(section, "simplification", None),
+        timestamp=datetime.now().isoformat(),
+    )
@@ -0,0 +1,152 @@
+import math
+from datetime import datetime
+from typing import Dict
+
+import numpy as np
+
+from .channels import _prismatic_dimensions, channel_geometry, irregular_section
+from .critical import critical_flow_batch, section_critical_depths
+from .schemas import ChannelType, RatingCurveInput, RatingCurveResult, Units
+from ..spread import gutter_flow_array, spread_for_depth
+
+# Intervals whose Froude number crosses 1 are split down to this fraction of the range
+REGIME_RESOLUTION = 1e-3
+
+
+def rating_curve(params: RatingCurveInput, section=None) -> RatingCurveResult:
+    """
+    Stage-discharge table for any channel type, evaluated in vectorized passes.
+
+    Sampling starts from num_points uniform depths plus the section's breakpoints
+    (irregular point elevations, the gutter/roadway transition) inside the range.
+    Each pass evaluates the midpoint of every interval and splits intervals where
+    linear interpolation of Q misses the midpoint by more than the tolerance or where
+    the flow regime changes, until all intervals pass or max_points is reached.
+    """
+    channel = params.channel
+    metric = channel.units == Units.METRIC
+    g = 9.81 if metric else 32.174
+    sqrt_S = math.sqrt(channel.slope)
+    breakpoints = np.empty(0)
+    min_elev = None
+
+    if channel.type == ChannelType.GUTTER:
+        W = channel.gutter_width
+        Sg = channel.gutter_cross_slope
+        Sx = channel.road_cross_slope
+        if Sg <= 0 or Sx <= 0:
+            raise ValueError("Cross slopes must be greater than zero.")
+        k = 1.0 if metric else 1.486
+        if W > 0:
+            breakpoints = np.array([Sg * W])
+
+        def evaluate(y) -> Dict[str, np.ndarray]:
+            T = spread_for_depth(y, W, Sg, Sx)
+            Q, _, A = gutter_flow_array(T, channel.slope, channel.mannings_n, W, Sg, Sx, k)
+            props = _flow_properties(Q, A, T, g)
+            props["critical_depth"] = np.zeros_like(Q)
+            props["spread"] = T
+            return props
+
+        default_max = None
+    else:
+        if channel.type == ChannelType.IRREGULAR and section is None:
+            section = irregular_section(channel)
+        geometry, min_elev, max_elev = channel_geometry(channel, section)
+        kn = (1.0 if metric else 1.49) / channel.mannings_n
+        if section is not None:
+            breakpoints = getattr(section, "breakpoints", getattr(section, "depth", breakpoints))
+
+            def critical_depths(Q):
+                return section_critical_depths(section, Q, g).root
+        else:
+            dimensions = _prismatic_dimensions(channel)
+
+            def critical_depths(Q):
+                return critical_flow_batch(Q, *dimensions, channel.mannings_n, units=channel.units).depth
+
+        def evaluate(y) -> Dict[str, np.ndarray]:
+            A, P, T, _, _ = geometry(y)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                R = np.where(P > 0, A / P, 0.0)
+            Q = kn * A * np.power(R, 2.0 / 3.0) * sqrt_S
+            props = _flow_properties(Q, A, T, g)
+            props["critical_depth"] = critical_depths(Q)
+            return props
+
+        default_max = (max_elev - min_elev) if min_elev is not None else None
+
+    lo, hi = _depth_range(params, min_elev, default_max)
+    depths = np.unique(np.concatenate([
+        np.linspace(lo, hi, params.num_points),
+        breakpoints[(breakpoints > lo) & (breakpoints < hi)],
+    ]))
+    props = evaluate(depths)
+
+    regime_width = (hi - lo) * REGIME_RESOLUTION
+    while len(depths) < params.max_points:
+        mids = 0.5 * (depths[:-1] + depths[1:])
+        widths = np.diff(depths)
+        mid_props = evaluate(mids)
+
+        Q = props["discharge"]
+        q_mid = mid_props["discharge"]
+        scale = np.maximum(q_mid, 1e-12 * max(float(Q.max()), 1e-12))
+        error = np.abs(q_mid - 0.5 * (Q[:-1] + Q[1:])) / scale
+        froude = props["froude_number"] - 1.0
+        regime_change = (froude[:-1] * froude[1:] < 0) & (widths > regime_width)
+        error = np.where(regime_change, np.inf, error)
+
+        pick = np.flatnonzero((error > params.tolerance) & (widths > 1e-9 * (hi - lo)))
+        if pick.size == 0:
+            break
+        budget = params.max_points - len(depths)
+        if pick.size > budget:
+            pick = pick[np.argsort(-error[pick], kind="stable")[:budget]]
+
+        depths = np.concatenate([depths, mids[pick]])
+        order = np.argsort(depths, kind="stable")
+        depths = depths[order]
+        props = {name: np.concatenate([values, mid_props[name][pick]])[order] for name, values in props.items()}
+
+    return RatingCurveResult(
+        depth=depths.tolist(),
+        water_surface_elevation=(depths + min_elev).tolist() if min_elev is not None else None,
+        discharge=props["discharge"].tolist(),
+        velocity=props["velocity"].tolist(),
+        area=props["area"].tolist(),
+        top_width=props["top_width"].tolist(),
+        froude_number=props["froude_number"].tolist(),
+        critical_depth=props["critical_depth"].tolist(),
+        spread=props["spread"].tolist() if "spread" in props else None,
+        simplification=getattr(section, "simplification", None),
+        timestamp=datetime.now().isoformat(),
+    )
+
+
+def _flow_properties(Q, A, T, g) -> Dict[str, np.ndarray]:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        V = np.where(A > 0, Q / A, 0.0)
+        D = np.where(T > 0, A / T, 0.0)
+        Froude = np.where(D > 0, V / np.sqrt(g * D), 0.0)
+    return {"discharge": Q, "velocity": V, "area": A, "top_width": T, "froude_number": Froude}
+
+
+def _depth_range(params: RatingCurveInput, min_elev, default_max):
+    lo = params.min_depth
+    hi = params.max_depth
+    if params.min_wse is not None or params.max_wse is not None:
+        if min_elev is None:
+            raise ValueError("Water surface elevation ranges require an irregular channel.")
+        if params.min_wse is not None:
+            lo = params.min_wse - min_elev
+        if params.max_wse is not None:
+            hi = params.max_wse - min_elev
+    lo = max(lo or 0.0, 0.0)
+    if hi is None:
+        hi = default_max
+    if hi is None:
+        raise ValueError("max_depth is required for rating curves of prismatic and gutter channels.")
+    if hi <= lo:
+        raise ValueError("The rating curve range must have max above min.")
+    return lo, hi
@@ -1,6 +1,10 @@
+import base64
+import binascii
 from enum import Enum
-from pydantic import BaseModel, Field
-from typing import Optional, List, Tuple
+from pydantic import BaseModel, Field, PlainSerializer, PlainValidator, WithJsonSchema, model_validator
+from typing import Annotated, Any, Optional, List, Tuple, Union
+
+import numpy as np
 
 class ChannelType(str, Enum):
     RECTANGULAR = "rectangular"
@@ -18,7 +22,64 @@ class SolveFor(str, Enum):
     DISCHARGE = "discharge"
     SPREAD = "spread"
 
-class ChannelInput(BaseModel):
+def _float_array(value: Any) -> np.ndarray:
+    """A JSON number array, or a base64 string of little-endian float64 values, as a 1-D float64 array."""
+    if isinstance(value, (str, bytes)):
+        try:
+            raw = base64.b64decode(value, validate=True)
+        except (binascii.Error, ValueError):
+            raise ValueError("must be a number array or a base64 string") from None
+        if len(raw) % 8:
+            raise ValueError("base64 buffer length must be a multiple of 8 bytes (little-endian float64)")
+        array = np.frombuffer(raw, dtype="<f8").astype(float, copy=False)
+    else:
+        try:
+            array = np.asarray(value, dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError("must be a number array or a base64 string") from None
+    if array.ndim != 1:
+        raise ValueError("must be a one-dimensional array")
+    if not np.isfinite(array).all():
+        raise ValueError("must contain finite numbers only")
+    return array
+
+
+# Decoded with one NumPy call, without validating each element as a Python float
+FloatArray = Annotated[
+    np.ndarray,
+    PlainValidator(_float_array),
+    PlainSerializer(lambda array: array.tolist(), return_type=List[float]),
+    WithJsonSchema({
+        "anyOf": [
+            {"type": "array", "items": {"type": "number"}},
+            {"type": "string", "contentEncoding": "base64", "description": "Little-endian float64 values"},
+        ]
+    }),
+]
+
+class ArrayModel(BaseModel):
+    """
+    Base for models with FloatArray fields. Pydantic's equality compares field dicts,
+    which is ambiguous for NumPy arrays; arrays here compare with np.array_equal.
+    """
+
+    def __eq__(self, other):
+        if not isinstance(other, BaseModel):
+            return NotImplemented
+        if type(self) is not type(other):
+            return False
+        for name in type(self).model_fields:
+            a, b = getattr(self, name), getattr(other, name)
+            if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+                if not (isinstance(a, np.ndarray) and isinstance(b, np.ndarray) and np.array_equal(a, b)):
+                    return False
+            elif a != b:
+                return False
+        return True
+
+    __hash__ = None
+
+class ChannelInput(ArrayModel):
     """Input parameters for open channel normal depth calculation."""
     type: ChannelType
     solve_for: Optional[SolveFor] = Field(SolveFor.DEPTH, description="What to solve for (defaults to depth for standard channels)")
@@ -30,6 +91,9 @@ class ChannelInput(BaseModel):
     slope: float = Field(..., gt=0, description="Channel slope S (m/m or ft/ft)")
     mannings_n: float = Field(..., gt=0, description="Manning's n coefficient")
     station_elevation_points: List[Tuple[float, float]] = Field([], description="List of (station, elevation) points for irregular channels")
+    stations: Optional[FloatArray] = Field(None, description="Irregular section stations, with elevations: a compact alternative to station_elevation_points for large surveys")
+    elevations: Optional[FloatArray] = Field(None, description="Irregular section elevations, parallel to stations")
+    simplify_tolerance: Optional[float] = Field(None, ge=0, lt=1, description="Decimate irregular sections before solving, keeping relative area, perimeter and conveyance errors below this (e.g. 0.001); 0 disables, omitted uses the server default")
     
     # Gutter specific fields
     gutter_width: float = Field(0.0, ge=0, description="Gutter width W (m or ft)")
@@ -41,6 +105,32 @@ class ChannelInput(BaseModel):
     
     units: Units = Units.IMPERIAL
 
+    @model_validator(mode="after")
+    def _check_section_arrays(self):
+        if (self.stations is None) != (self.elevations is None):
+            raise ValueError("stations and elevations must be given together")
+        if self.stations is not None:
+            if len(self.stations) != len(self.elevations):
+                raise ValueError("stations and elevations must have the same length")
+            if self.station_elevation_points:
+                raise ValueError("Give either station_elevation_points or stations/elevations, not both")
+        return self
+
+    def point_count(self) -> int:
+        """Number of irregular section points, in whichever encoding they were given."""
+        if self.stations is not None:
+            return len(self.stations)
+        return len(self.station_elevation_points)
+
+class SectionSimplification(BaseModel):
+    """How an irregular section was decimated before solving, and the largest relative errors it introduced."""
+    tolerance: float = Field(..., description="Requested bound on the relative errors")
+    original_points: int
+    points: int = Field(..., description="Points kept")
+    max_area_error: float = Field(..., description="Largest relative flow area error over the depth range")
+    max_perimeter_error: float = Field(..., description="Largest relative wetted perimeter error over the depth range")
+    max_conveyance_error: float = Field(..., description="Largest relative conveyance error over the depth range")
+
 class ChannelResult(BaseModel):
     """Results from normal depth calculation."""
     depth: float = Field(..., description="Normal depth y_n")
@@ -63,5 +153,184 @@ class ChannelResult(BaseModel):
     gutter_depression: Optional[float] = Field(None, description="Gutter depression (m or ft)")
     spread: Optional[float] = Field(None, description="Gutter spread (m or ft)")
     discharge: Optional[float] = Field(None, description="Discharge Q (m³/s or ft³/s)")
+
+    # Solver diagnostics (depth/spread solves only)
+    iterations: Optional[int] = Field(None, description="Root-finder iterations used for the normal depth solve")
+    residual: Optional[float] = Field(None, description="Final residual |ln(Q(y)/Q)|, approximately the relative discharge error")
+    simplification: Optional[SectionSimplification] = Field(None, description="Set when the irregular section was decimated before solving")
     
     timestamp: str = Field(..., description="ISO timestamp of calculation")
+
+class RatingCurveInput(BaseModel):
+    """Stage-discharge (rating curve) request for one channel section."""
+    channel: ChannelInput
+    min_depth: Optional[float] = Field(None, ge=0, description="Lowest depth (m or ft); defaults to 0")
+    max_depth: Optional[float] = Field(None, gt=0, description="Highest depth (m or ft); defaults to the section height for irregular channels")
+    min_wse: Optional[float] = Field(None, description="Lowest water surface elevation (irregular channels, instead of min_depth)")
+    max_wse: Optional[float] = Field(None, description="Highest water surface elevation (irregular channels, instead of max_depth)")
+    num_points: int = Field(25, ge=2, le=10000, description="Initial number of uniformly spaced depths")
+    tolerance: float = Field(0.005, gt=0, description="Allowed relative discharge error of linear interpolation between points")
+    max_points: int = Field(500, ge=2, le=100000, description="Upper limit on returned points after adaptive refinement")
+
+class RatingCurveResult(BaseModel):
+    """Stage-discharge table, one entry per sampled depth (depth at curb for gutters)."""
+    depth: List[float]
+    water_surface_elevation: Optional[List[float]] = Field(None, description="Depth plus the section datum (irregular channels)")
+    discharge: List[float]
+    velocity: List[float]
+    area: List[float]
+    top_width: List[float]
+    froude_number: List[float]
+    critical_depth: List[float]
+    spread: Optional[List[float]] = Field(None, description="Gutter spread (gutter channels)")
+    simplification: Optional[SectionSimplification] = Field(None, description="Set when the irregular section was decimated before rating")
+    timestamp: str = Field(..., description="ISO timestamp of calculation")
+
+class HydrographInput(ArrayModel):
+    """Normal depth at every timestep of a discharge hydrograph for one channel section."""
+    channel: ChannelInput = Field(..., description="The section; its discharge and solve_for are ignored")
+    discharge: FloatArray = Field(..., description="Discharge Q at each timestep (m³/s or ft³/s); zero for dry steps")
+
+    @model_validator(mode="after")
+    def _check_discharge(self):
+        if (self.discharge < 0).any():
+            raise ValueError("discharge must not be negative")
+        return self
+
+class HydrographResult(ArrayModel):
+    """
+    Flow at each timestep of a hydrograph, parallel to its discharge.
+
+    Dry steps have zero depth, velocity, Froude number and spread, and a water surface
+    at the section's lowest point.
+    """
+    depth: FloatArray = Field(..., description="Normal depth y_n (depth at curb for gutters)")
+    water_surface_elevation: Optional[FloatArray] = Field(None, description="Depth plus the section datum (irregular channels); the datum at dry steps")
+    velocity: FloatArray
+    froude_number: FloatArray
+    spread: Optional[FloatArray] = Field(None, description="Gutter spread (gutter channels)")
+    unique_discharges: int = Field(..., description="Distinct non-zero discharges solved")
+    iterations: int = Field(..., description="Most Newton iterations any distinct discharge needed")
+    simplification: Optional[SectionSimplification] = Field(None, description="Set when the irregular section was decimated before solving")
+    timestamp: str = Field(..., description="ISO timestamp of calculation")
+
+class ProfileRegime(str, Enum):
+    SUBCRITICAL = "subcritical"
+    SUPERCRITICAL = "supercritical"
+
+class BoundaryType(str, Enum):
+    KNOWN_WSE = "known_wse"
+    KNOWN_DEPTH = "known_depth"
+    NORMAL_DEPTH = "normal_depth"
+    CRITICAL_DEPTH = "critical_depth"
+
+class ProfileBoundary(BaseModel):
+    """Boundary condition of a water surface profile (downstream end for subcritical, upstream for supercritical)."""
+    type: BoundaryType = BoundaryType.NORMAL_DEPTH
+    values: Optional[List[float]] = Field(None, description="Known WSE or depth, one value per discharge or a single value for all")
+    slope: Optional[float] = Field(None, gt=0, description="Energy slope for a normal depth boundary; defaults to the boundary section's slope")
+
+class ProfileSection(BaseModel):
+    """One cross section of a reach for a standard step profile."""
+    channel: ChannelInput
+    reach_length: float = Field(0.0, ge=0, description="Distance to the next section downstream (m or ft)")
+    invert_elevation: float = Field(0.0, description="Channel invert elevation (prismatic sections; irregular sections use their lowest point)")
+
+class StandardStepInput(BaseModel):
+    """Standard step water surface profile through a reach of cross sections."""
+    sections: List[ProfileSection] = Field(..., min_length=2, description="Cross sections ordered from upstream to downstream")
+    discharges: List[float] = Field(..., min_length=1, description="Flow profiles to compute (m³/s or ft³/s)")
+    regime: ProfileRegime = ProfileRegime.SUBCRITICAL
+    boundary: ProfileBoundary = ProfileBoundary()
+    contraction_coefficient: float = Field(0.1, ge=0, description="Loss coefficient applied where velocity head increases downstream")
+    expansion_coefficient: float = Field(0.3, ge=0, description="Loss coefficient applied where velocity head decreases downstream")
+
+class DirectStepInput(BaseModel):
+    """Direct step water surface profile along a prismatic reach (bed slope = channel slope)."""
+    channel: ChannelInput
+    discharges: List[float] = Field(..., min_length=1, description="Flow profiles to compute (m³/s or ft³/s)")
+    length: float = Field(..., gt=0, description="Reach length (m or ft)")
+    regime: ProfileRegime = ProfileRegime.SUBCRITICAL
+    boundary: ProfileBoundary = ProfileBoundary()
+    invert_elevation: float = Field(0.0, description="Invert elevation at the downstream end (prismatic channels)")
+    steps: int = Field(50, ge=2, le=10000, description="Depth increments between the boundary depth and the limiting depth")
+
+class WaterSurfaceProfile(BaseModel):
+    """Water surface profile for one discharge; stations are measured upstream from the downstream end."""
+    discharge: float
+    station: List[float]
+    invert_elevation: List[float]
+    depth: List[float]
+    water_surface_elevation: List[float]
+    energy_grade_elevation: List[float]
+    velocity: List[float]
+    froude_number: List[float]
+    critical_depth: List[float]
+    critical_assumed: List[bool] = Field(..., description="True where no solution existed in the requested regime and critical depth was used")
+
+class ProfileResult(BaseModel):
+    method: str = Field(..., description="standard_step or direct_step")
+    regime: ProfileRegime
+    profiles: List[WaterSurfaceProfile]
+    timestamp: str = Field(..., description="ISO timestamp of calculation")
+
+class DesignRange(BaseModel):
+    """Candidate values for one design parameter: an explicit list or count values from min to max."""
+    values: Optional[List[float]] = Field(None, min_length=1, description="Explicit candidate values")
+    min: Optional[float] = Field(None, ge=0, description="Lowest value of an evenly spaced range")
+    max: Optional[float] = Field(None, ge=0, description="Highest value of an evenly spaced range")
+    count: int = Field(1, ge=1, le=100000, description="Number of evenly spaced values from min to max")
+
+class DesignObjective(str, Enum):
+    COST = "cost"
+    DEPTH = "depth"
+    VELOCITY = "velocity"
+    TOP_WIDTH = "top_width"
+    FROUDE_NUMBER = "froude_number"
+
+class DesignConstraints(BaseModel):
+    """Limits a candidate section must meet at normal depth; unset limits are not checked."""
+    max_depth: Optional[float] = Field(None, gt=0, description="Highest allowed normal depth (m or ft)")
+    min_velocity: Optional[float] = Field(None, ge=0, description="Lowest allowed velocity, e.g. to keep sediment moving")
+    max_velocity: Optional[float] = Field(None, gt=0, description="Highest allowed velocity, e.g. for lining erosion")
+    min_froude: Optional[float] = Field(None, ge=0, description="Lowest allowed Froude number")
+    max_froude: Optional[float] = Field(None, gt=0, description="Highest allowed Froude number")
+    freeboard: float = Field(0.0, ge=0, description="Freeboard added above normal depth to get the channel depth (m or ft)")
+    max_channel_depth: Optional[float] = Field(None, gt=0, description="Highest allowed channel depth, normal depth plus freeboard")
+    max_top_width: Optional[float] = Field(None, gt=0, description="Highest allowed top width at the channel depth (right-of-way)")
+
+class ChannelDesignInput(BaseModel):
+    """Grid sweep over trapezoidal channel parameters for a design discharge."""
+    discharge: float = Field(..., gt=0, description="Design discharge Q (m³/s or ft³/s)")
+    bottom_width: Union[float, DesignRange] = Field(..., description="Bottom width b candidates (m or ft)")
+    left_side_slope: Union[float, DesignRange] = Field(..., description="Left side slope zL candidates (H:V)")
+    right_side_slope: Optional[Union[float, DesignRange]] = Field(None, description="Right side slope zR candidates; omit for symmetric sections (zR = zL)")
+    mannings_n: Union[float, DesignRange] = Field(..., description="Manning's n candidates (one per lining option)")
+    slope: Union[float, DesignRange] = Field(..., description="Channel slope S candidates (m/m or ft/ft)")
+    constraints: DesignConstraints = DesignConstraints()
+    excavation_cost: float = Field(1.0, ge=0, description="Cost per unit of section area at the channel depth (per unit length)")
+    lining_cost: float = Field(0.0, ge=0, description="Cost per unit of wetted perimeter at the channel depth (per unit length)")
+    objectives: List[DesignObjective] = Field([DesignObjective.COST, DesignObjective.VELOCITY], min_length=1, description="Quantities minimized jointly for the Pareto front")
+    units: Units = Units.IMPERIAL
+    workers: Optional[int] = Field(None, ge=1, description="Worker processes for large sweeps; defaults to the CPU count (ignored by the API, which sweeps on its solve executor)")
+
+class DesignCandidate(BaseModel):
+    """One evaluated section; the channel fields match ChannelInput."""
+    bottom_width: float
+    left_side_slope: float
+    right_side_slope: float
+    mannings_n: float
+    slope: float
+    depth: float = Field(..., description="Normal depth y_n")
+    velocity: float
+    froude_number: float
+    channel_depth: float = Field(..., description="Normal depth plus freeboard")
+    top_width: float = Field(..., description="Top width at the channel depth")
+    cost: float
+
+class ChannelDesignResult(BaseModel):
+    evaluated: int = Field(..., description="Number of candidate sections solved")
+    feasible: int = Field(..., description="Number of candidates meeting every constraint")
+    best: Optional[DesignCandidate] = Field(None, description="Feasible candidate with the lowest cost")
+    pareto_front: List[DesignCandidate] = Field(..., description="Feasible candidates not dominated on the objectives, by increasing first objective")
+    timestamp: str = Field(..., description="ISO timestamp of calculation")
@@ -0,0 +1,150 @@
+from bisect import bisect_left
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+_SCALAR_LISTS = ("_lo_list", "_hi_list", "_enter_rows", "_leave_rows", "_full_rows")
+
+
+class PreparedSection:
+    """
+    Irregular cross section prepared once for repeated exact geometry queries.
+
+    The points are sorted by station and validated when the section is built. Each
+    segment then contributes to the wetted geometry in one of two ways: fully
+    submerged (its top elevation is below the water surface) or crossing (the water
+    surface lies between its end elevations). Fully submerged contributions are
+    constants and crossing contributions are polynomials in (wse - z_low), so both are
+    kept as prefix sums over segments ordered by top and bottom elevation. A query is
+    two binary searches plus constant work, independent of the number of points, and
+    matches calculate_irregular_geometry to round-off.
+    """
+
+    # SectionSimplification report when built by simplify.simplify_section
+    simplification = None
+
+    def __init__(self, points: Sequence[Tuple[float, float]]):
+        if points is None or len(points) < 2:
+            raise ValueError("Station-Elevation points are required for irregular channels.")
+        pts = np.asarray(points, dtype=float)
+        if pts.ndim != 2 or pts.shape[1] != 2:
+            raise ValueError("Station-Elevation points must be (station, elevation) pairs.")
+        if not np.isfinite(pts).all():
+            raise ValueError("Station-Elevation points must be finite numbers.")
+        self._build(pts[:, 0], pts[:, 1])
+
+    @classmethod
+    def from_arrays(cls, stations, elevations) -> "PreparedSection":
+        """Build from parallel station and elevation arrays without per-point tuples."""
+        x = np.asarray(stations, dtype=float)
+        z = np.asarray(elevations, dtype=float)
+        if x.shape != z.shape or x.ndim != 1:
+            raise ValueError("Stations and elevations must be 1-D arrays of the same length.")
+        if len(x) < 2:
+            raise ValueError("Station-Elevation points are required for irregular channels.")
+        if not (np.isfinite(x).all() and np.isfinite(z).all()):
+            raise ValueError("Station-Elevation points must be finite numbers.")
+        section = cls.__new__(cls)
+        section._build(x, z)
+        return section
+
+    def _build(self, x: np.ndarray, z: np.ndarray):
+        order = np.argsort(x, kind="stable")
+        self.stations = x[order]
+        self.elevations = z[order]
+        self.min_elevation = float(self.elevations.min())
+        self.max_elevation = float(self.elevations.max())
+        self.point_count = len(self.stations)
+        # Depths above the thalweg at which the geometry changes slope
+        self.breakpoints = np.unique(self.elevations - self.min_elevation)
+
+        # Work in depth coordinates to keep the squared terms well conditioned
+        d1 = self.elevations[:-1] - self.min_elevation
+        d2 = self.elevations[1:] - self.min_elevation
+        dx = np.diff(self.stations)
+        dz = d2 - d1
+        length = np.hypot(dx, dz)
+        lo = np.minimum(d1, d2)
+        hi = np.maximum(d1, d2)
+
+        sloped = np.abs(dz) >= 1e-12
+        inv_dz = np.where(sloped, 1.0 / np.where(sloped, np.abs(dz), 1.0), 0.0)
+        t_rate = dx * inv_dz  # dT/dy while crossing
+        p_rate = length * inv_dz  # dP/dy while crossing
+        a_rate = 0.5 * t_rate  # area = a_rate * (y - lo)^2 while crossing
+
+        # Crossing coefficients as polynomials in y:
+        #   T = t_rate*(y - lo), P = p_rate*(y - lo), A = a_rate*(y - lo)^2
+        crossing = np.column_stack((
+            t_rate, t_rate * lo,
+            p_rate, p_rate * lo,
+            a_rate, a_rate * lo, a_rate * lo * lo,
+        ))
+        # Fully submerged: T = dx, P = length, A = dx*y - dx*(d1 + d2)/2
+        full = np.column_stack((dx, length, dx, dx * 0.5 * (d1 + d2)))
+
+        by_lo = np.argsort(lo, kind="stable")
+        by_hi = np.argsort(hi, kind="stable")
+        self._lo_sorted = lo[by_lo]
+        self._hi_sorted = hi[by_hi]
+        zeros_c = np.zeros((1, crossing.shape[1]))
+        zeros_f = np.zeros((1, full.shape[1]))
+        # Prefix sums of crossing terms for segments entering (lo < y) and leaving (hi < y)
+        self._enter = np.vstack((zeros_c, np.cumsum(crossing[by_lo], axis=0)))
+        self._leave = np.vstack((zeros_c, np.cumsum(crossing[by_hi], axis=0)))
+        self._full = np.vstack((zeros_f, np.cumsum(full[by_hi], axis=0)))
+
+    def __getattr__(self, name):
+        # Plain lists for the scalar query path, built on first use so sections only
+        # queried through geometry_array (or replaced by a simplified one) skip them
+        if name in _SCALAR_LISTS and "_full" in self.__dict__:
+            self._lo_list = self._lo_sorted.tolist()
+            self._hi_list = self._hi_sorted.tolist()
+            self._enter_rows = self._enter.tolist()
+            self._leave_rows = self._leave.tolist()
+            self._full_rows = self._full.tolist()
+            return self.__dict__[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def points(self) -> List[Tuple[float, float]]:
+        return list(zip(self.stations.tolist(), self.elevations.tolist()))
+
+    def geometry(self, y_depth: float) -> Tuple[float, float, float, float, float]:
+        """
+        Same contract as calculate_irregular_geometry:
+        (Area, Perimeter, TopWidth, dP_dy, dT_dy) at a depth above the thalweg.
+        """
+        y = float(y_depth)
+        i = bisect_left(self._lo_list, y)
+        j = bisect_left(self._hi_list, y)
+        e = self._enter_rows[i]
+        l = self._leave_rows[j]
+        f = self._full_rows[j]
+        # Crossing sums = entered - left
+        t0, t1, p0, p1, a0, a1, a2 = (e[k] - l[k] for k in range(7))
+        area = a0 * y * y - 2.0 * a1 * y + a2 + f[2] * y - f[3]
+        perimeter = p0 * y - p1 + f[1]
+        top_width = t0 * y - t1 + f[0]
+        if area < 0.0:
+            area = 0.0
+        return area, perimeter, top_width, p0, t0
+
+    def geometry_array(self, y_depth) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized geometry() for an array of depths."""
+        y = np.asarray(y_depth, dtype=float)
+        i = np.searchsorted(self._lo_sorted, y, side="left")
+        j = np.searchsorted(self._hi_sorted, y, side="left")
+        c = self._enter[i] - self._leave[j]
+        f = self._full[j]
+        t0, t1, p0, p1, a0, a1, a2 = np.moveaxis(c, -1, 0)
+        area = np.maximum(a0 * y * y - 2.0 * a1 * y + a2 + f[..., 2] * y - f[..., 3], 0.0)
+        perimeter = p0 * y - p1 + f[..., 1]
+        top_width = t0 * y - t1 + f[..., 0]
+        return area, perimeter, top_width, p0, t0
+
+
+def prepare_section(section) -> PreparedSection:
+    """Return section as a PreparedSection, preparing raw (station, elevation) points."""
+    if isinstance(section, PreparedSection):
+        return section
+    return PreparedSection(section)
@@ -0,0 +1,227 @@
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+import numpy as np
+
+from .schemas import ChannelInput, SectionSimplification
+from .sections import PreparedSection
+
+# Server-wide tolerance applied to irregular sections that do not set simplify_tolerance
+# (0 disables), only for sections with at least MIN_POINTS points
+DEFAULT_TOLERANCE = float(os.environ.get("HYDRO_AGENT_SIMPLIFY_TOLERANCE", "0"))
+MIN_POINTS = int(os.environ.get("HYDRO_AGENT_SIMPLIFY_MIN_POINTS", "1000"))
+
+# Errors are bounded at every depth from the thalweg to the top. Relative to the original
+# value at or above this fraction of the section height, and below it relative to the
+# value there (an absolute floor), since relative errors are unbounded as depth goes to
+# zero, where every thalweg detail matters
+ERROR_DEPTH_FRACTION = 0.01
+
+# A point may move by epsilon times its height above the thalweg (area added or lost
+# at that height scales with the depth there). epsilon starts at the tolerance and is
+# scaled by this factor, up while the measured errors meet the tolerance and down
+# while they do not, for at most MAX_REFINEMENTS candidate sections
+EPSILON_FACTOR = 4.0
+MAX_REFINEMENTS = 8
+
+# Maximum number of simplified sections kept by get_simplified_section
+SIMPLIFY_CACHE_SIZE = 64
+
+_simplified_cache: "OrderedDict[str, PreparedSection]" = OrderedDict()
+# Guards _simplified_cache: solves run on the API executor's worker threads
+_simplified_cache_lock = threading.Lock()
+
+
+def section_tolerance(params: ChannelInput) -> float:
+    """Relative error bound to simplify an irregular channel's section with, 0 to leave it as surveyed."""
+    if params.simplify_tolerance is not None:
+        return params.simplify_tolerance
+    if DEFAULT_TOLERANCE > 0 and params.point_count() >= MIN_POINTS:
+        return DEFAULT_TOLERANCE
+    return 0.0
+
+
+def _significance(x: np.ndarray, z: np.ndarray, scale: np.ndarray, forced: np.ndarray, floor: float) -> np.ndarray:
+    """
+    Douglas-Peucker significance of each point: Douglas-Peucker with any epsilon >= floor
+    keeps exactly the points whose significance exceeds epsilon.
+
+    A point's significance is its scaled distance from the chord of the segment it
+    splits, capped by the significance of that segment's ends (its ancestors). Each
+    pass splits every open segment at its farthest point at once and drops the points
+    of segments already within floor, so the work shrinks as the polyline converges.
+    """
+    significance = np.where(forced, np.inf, 0.0)
+    significance[0] = significance[-1] = np.inf
+    keep = significance > 0
+    active = np.flatnonzero(~keep)
+    while active.size:
+        anchors = np.flatnonzero(keep)
+        segment = np.searchsorted(anchors, active, side="right") - 1
+        start = anchors[segment]
+        end = anchors[segment + 1]
+        dx = x[end] - x[start]
+        dz = z[end] - z[start]
+        px = x[active] - x[start]
+        pz = z[active] - z[start]
+        length = np.hypot(dx, dz)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            distance = np.where(length > 0, np.abs(dx * pz - dz * px) / length, np.hypot(px, pz)) / scale[active]
+
+        runs = np.flatnonzero(np.concatenate(([True], segment[1:] != segment[:-1])))
+        worst = np.maximum.reduceat(distance, runs)
+        run_of = np.repeat(np.arange(runs.size), np.diff(np.append(runs, active.size)))
+        open_run = worst > floor
+        if not open_run.any():
+            break
+        # First point at the largest distance of each open run
+        farthest = np.flatnonzero(open_run[run_of] & (distance == worst[run_of]))
+        first = np.concatenate(([True], run_of[farthest[1:]] != run_of[farthest[:-1]]))
+        farthest = farthest[first]
+        split = active[farthest]
+        significance[split] = np.minimum(
+            distance[farthest], np.minimum(significance[start[farthest]], significance[end[farthest]])
+        )
+        keep[split] = True
+        active = active[open_run[run_of] & ~keep[active]]
+    return significance
+
+
+def _error_depths(section: PreparedSection) -> np.ndarray:
+    height = section.max_elevation - section.min_elevation
+    depths = section.breakpoints
+    depths = np.union1d(depths[(depths > 0) & (depths < height)], [0.0, height])
+    return np.concatenate((depths, 0.5 * (depths[:-1] + depths[1:])))
+
+
+def _properties(section: PreparedSection, depths: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    A, P, _, _, _ = section.geometry_array(depths)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        K = np.where(P > 0, A ** (5.0 / 3.0) / P ** (2.0 / 3.0), 0.0)
+    return A, P, K
+
+
+def _floors(section: PreparedSection) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """The original (area, perimeter, conveyance) at ERROR_DEPTH_FRACTION of the section height."""
+    height = section.max_elevation - section.min_elevation
+    return _properties(section, np.array([ERROR_DEPTH_FRACTION * height]))
+
+
+def _max_relative(value: np.ndarray, reference: np.ndarray, floor: np.ndarray) -> float:
+    error = np.abs(value - reference)
+    scale = np.maximum(reference, floor)
+    wet = scale > 0
+    if (error[~wet] > 0).any():
+        return float("inf")
+    return float(np.max(error[wet] / scale[wet], initial=0.0))
+
+
+def section_errors(original: PreparedSection, simplified: PreparedSection) -> Tuple[float, float, float]:
+    """
+    Largest relative (area, wetted perimeter, conveyance) errors of simplified against
+    original, from the thalweg to the top. Below ERROR_DEPTH_FRACTION of the section
+    height the errors are taken relative to the original's value at that depth.
+
+    Both sections have the same thalweg, and between the breakpoints of either one the
+    top width and perimeter are linear in depth, so the errors are checked at every
+    breakpoint and midway between them. The simplified section's breakpoints are a
+    subset of the original's when its points are.
+    """
+    depths = _error_depths(original)
+    extra = np.setdiff1d(simplified.breakpoints, original.breakpoints)
+    if extra.size:
+        merged = np.union1d(depths, extra)
+        depths = np.concatenate((merged, 0.5 * (merged[:-1] + merged[1:])))
+    reference = _properties(original, depths)
+    values = _properties(simplified, depths)
+    return tuple(_max_relative(v, r, f) for v, r, f in zip(values, reference, _floors(original)))
+
+
+def simplify_section(section: PreparedSection, tolerance: float) -> PreparedSection:
+    """
+    Decimate a dense irregular section so its area, wetted perimeter and conveyance
+    stay within a relative tolerance of the original over the full depth range (an
+    absolute one below ERROR_DEPTH_FRACTION of its height, see section_errors).
+
+    Douglas-Peucker picks the points, always keeping both ends, the thalweg and the
+    highest point (so the datum and section height are unchanged), with each point's
+    allowed offset proportional to its height above the thalweg. Point significances
+    are computed once, then the offset is searched geometrically for the coarsest
+    section whose measured errors (as in section_errors) meet the tolerance. Returns
+    a new PreparedSection with a simplification report, or a shallow copy of section
+    with a report of no change when no point can be dropped; section is not modified.
+    """
+    x, z = section.stations, section.elevations
+    height = section.max_elevation - section.min_elevation
+    n = section.point_count
+    forced = np.zeros(n, dtype=bool)
+    forced[[int(np.argmin(z)), int(np.argmax(z))]] = True
+    scale = np.maximum(z - section.min_elevation, ERROR_DEPTH_FRACTION * height)
+
+    best = None
+    if n > 2 and height > 0:
+        floor = tolerance / EPSILON_FACTOR ** MAX_REFINEMENTS
+        significance = _significance(x, z, scale, forced, floor)
+        depths = _error_depths(section)
+        reference = _properties(section, depths)
+        floors = _floors(section)
+        epsilon = tolerance
+        grow = None
+        for _ in range(MAX_REFINEMENTS):
+            keep = significance > epsilon
+            passed = False
+            if not keep.all():
+                candidate = PreparedSection.from_arrays(x[keep], z[keep])
+                values = _properties(candidate, depths)
+                errors = tuple(_max_relative(v, r, f) for v, r, f in zip(values, reference, floors))
+                passed = max(errors) <= tolerance
+                if passed:
+                    best = candidate, errors
+            if grow is None:
+                grow = passed
+            # Stop at the first failure after growing, or the first pass after shrinking
+            if passed != grow or keep.all() and not grow:
+                break
+            epsilon = epsilon * EPSILON_FACTOR if grow else epsilon / EPSILON_FACTOR
+
+    if best is None:
+        unchanged = copy.copy(section)
+        unchanged.simplification = SectionSimplification(
+            tolerance=tolerance, original_points=n, points=n,
+            max_area_error=0.0, max_perimeter_error=0.0, max_conveyance_error=0.0,
+        )
+        return unchanged
+    simplified, (area_error, perimeter_error, conveyance_error) = best
+    simplified.simplification = SectionSimplification(
+        tolerance=tolerance, original_points=n, points=simplified.point_count,
+        max_area_error=area_error, max_perimeter_error=perimeter_error, max_conveyance_error=conveyance_error,
+    )
+    return simplified
+
+
+def get_simplified_section(section: PreparedSection, tolerance: float) -> PreparedSection:
+    """Return a cached simplify_section result for the section's points and tolerance."""
+    digest = hashlib.sha256(section.stations.tobytes() + section.elevations.tobytes()).hexdigest()
+    key = f"{digest}:{tolerance!r}"
+    with _simplified_cache_lock:
+        simplified = _simplified_cache.get(key)
+        if simplified is not None:
+            _simplified_cache.move_to_end(key)
+            return simplified
+    # Built outside the lock; concurrent misses on one key build it twice, harmlessly
+    simplified = simplify_section(section, tolerance)
+    with _simplified_cache_lock:
+        _simplified_cache[key] = simplified
+        _simplified_cache.move_to_end(key)
+        if len(_simplified_cache) > SIMPLIFY_CACHE_SIZE:
+            _simplified_cache.popitem(last=False)
+    return simplified
+
+
+def clear_simplified_cache():
+    with _simplified_cache_lock:
+        _simplified_cache.clear()
@@ -0,0 +1,261 @@
+import bisect
+import math
+import os
+import threading
+import time
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Seconds; spans a closed-form prismatic solve (~10 µs) to a large irregular section or batch
+DEFAULT_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+ITERATION_BUCKETS = (0, 1, 2, 3, 4, 5, 6, 8, 10, 15, 20, 30, 50, 100)
+POINT_BUCKETS = (2, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000)
+
+# A collector returns (name, type, help, [(labels, value), ...]) families at render time
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter with optional labels: counter.inc("trapezoidal")."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labels, key)} {_number(value)}" for key, value in values]
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """
+    Prometheus histogram with fixed bucket upper bounds. Each labelled series keeps
+    per-bucket counts, made cumulative only when rendered, plus the sum and count.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(float(b) for b in buckets)
+        self._bounds = np.array(self.buckets)
+        # label values -> [bucket counts..., +Inf count, sum]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, label_values: Tuple[str, ...]) -> List[float]:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+        return series
+
+    def observe(self, value: float, *label_values: str):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._get(label_values)
+            series[i] += 1
+            series[-1] += value
+
+    def observe_many(self, values, *label_values: str):
+        """Observe an array of values at once (e.g. per-row iterations of a batch solve); NaNs are skipped."""
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return
+        counts = np.bincount(np.searchsorted(self._bounds, values, side="left"), minlength=len(self.buckets) + 1)
+        total = float(values.sum())
+        with self._lock:
+            series = self._get(label_values)
+            for i, count in enumerate(counts.tolist()):
+                series[i] += count
+            series[-1] += total
+
+    def count(self, *label_values: str) -> int:
+        series = self._series.get(label_values)
+        return int(sum(series[:-1])) if series else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        lines = []
+        names = self.labels + ("le",)
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), series[:-1]):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(names, key + (_number(bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(series[-1])}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {cumulative}")
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+class MetricsRegistry:
+    """
+    Named counters and histograms plus collectors called at scrape time, rendered
+    together in the Prometheus text exposition format.
+
+    When enabled is False, instrumented code skips recording entirely (see
+    instrument_solver) and the API does not serve /api/metrics.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: Dict[str, object] = {}
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+
+    def _register(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def add_collector(self, collector: Callable[[], Iterable[Family]]):
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            samples = metric.render()
+            if samples:
+                lines += [f"# HELP {metric.name} {metric.help}", f"# TYPE {metric.name} {metric.kind}"] + samples
+        for collector in self._collectors:
+            for name, kind, help, samples in collector():
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+                lines += [f"{name}{_labels(tuple(labels), tuple(labels.values()))} {_number(value)}" for labels, value in samples]
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        """Reset every counter and histogram (collectors report their own state)."""
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+registry = MetricsRegistry(
+    enabled=os.environ.get("HYDRO_AGENT_METRICS", "1").strip().lower() not in ("0", "false", "no", "off"),
+)
+
+SOLVER_DURATION = registry.histogram(
+    "hydro_agent_solver_duration_seconds", "Wall time of solver calls.", ("solver", "type"),
+)
+BATCH_ROWS = registry.counter(
+    "hydro_agent_batch_rows_total",
+    "Rows passed to batch solvers (scalar calls are counted by hydro_agent_solver_duration_seconds_count).",
+    ("solver", "type"),
+)
+SOLVER_ITERATIONS = registry.histogram(
+    "hydro_agent_solver_iterations", "Root-finder iterations per solved row.", ("solver", "type"), ITERATION_BUCKETS,
+)
+SOLVER_FAILURES = registry.counter(
+    "hydro_agent_solver_failures_total",
+    "Rows that failed: reason is convergence (no root within the iteration limit) or invalid (rejected input).",
+    ("solver", "type", "reason"),
+)
+IRREGULAR_POINTS = registry.histogram(
+    "hydro_agent_irregular_points", "Station-elevation point count of irregular sections solved.", (), POINT_BUCKETS,
+)
+
+
+def _channel_type(params) -> str:
+    kind = getattr(params, "type", None)
+    return getattr(kind, "value", kind) or ""
+
+
+def instrument_solver(solver: str, batch: bool = False, type: Optional[str] = None):
+    """
+    Decorator recording duration, iterations and failures (and rows, for batches) of a solver whose
+    first argument is its input model (scalar) or first input array (batch=True).
+    The type label is the given type, else the channel type of the input model.
+
+    Scalar failures are ValueErrors, counted as "convergence" when the message says
+    the solver did not converge and "invalid" otherwise; batch failures are the rows
+    with converged = False in the result. With the registry disabled the wrapper
+    calls straight through.
+    """
+    def decorate(func):
+        @wraps(func)
+        def wrapper(params, *args, **kwargs):
+            if not registry.enabled:
+                return func(params, *args, **kwargs)
+            kind = type if type is not None else _channel_type(params)
+            start = time.perf_counter()
+            try:
+                result = func(params, *args, **kwargs)
+            except ValueError as e:
+                SOLVER_DURATION.observe(time.perf_counter() - start, solver, kind)
+                SOLVER_FAILURES.inc(solver, kind, "convergence" if "converge" in str(e) else "invalid")
+                raise
+            SOLVER_DURATION.observe(time.perf_counter() - start, solver, kind)
+
+            iterations = getattr(result, "iterations", None)
+            if batch:
+                converged = getattr(result, "converged", None)
+                rows = int(np.size(converged)) if converged is not None else 1
+                if iterations is not None:
+                    solved = iterations if converged is None else np.asarray(iterations)[np.asarray(converged, dtype=bool)]
+                    SOLVER_ITERATIONS.observe_many(solved, solver, kind)
+                if converged is not None:
+                    failed = rows - int(np.count_nonzero(converged))
+                    if failed:
+                        SOLVER_FAILURES.inc(solver, kind, "convergence", amount=failed)
+                BATCH_ROWS.inc(solver, kind, amount=rows)
+                return result
+
+            if iterations is not None:
+                SOLVER_ITERATIONS.observe(iterations, solver, kind)
+            if kind == "irregular":
+                IRREGULAR_POINTS.observe(params.point_count())
+            return result
+        return wrapper
+    return decorate
@@ -0,0 +1,185 @@
+import math
+from typing import Callable, NamedTuple, Tuple
+
+import numpy as np
+
+
+class RootResult(NamedTuple):
+    root: float
+    iterations: int
+    residual: float
+    converged: bool
+
+
+class RootBatchResult(NamedTuple):
+    root: np.ndarray
+    iterations: np.ndarray
+    residual: np.ndarray
+    converged: np.ndarray
+
+
+def expand_bracket(
+    func: Callable[[float], Tuple[float, float]],
+    lo: float,
+    hi: float,
+    factor: float = 2.0,
+    max_expansions: int = 80,
+) -> Tuple[float, float]:
+    """
+    Grow [lo, hi] upwards until func(hi) >= 0 for a function that increases through
+    its root. Returns the bracket; raises ValueError if no sign change is found.
+    """
+    for _ in range(max_expansions):
+        f_hi, _ = func(hi)
+        if f_hi >= 0:
+            return lo, hi
+        lo, hi = hi, hi * factor
+    raise ValueError("Solver failed to bracket a solution.")
+
+
+def warm_bracket(func: Callable[[float], Tuple[float, float]], x0: float) -> Tuple[float, float, float]:
+    """
+    Bracket for an increasing func from a nearby earlier root x0 (e.g. the last solve
+    of an input being edited). Returns (lo, hi, start): [0, x0] with start x0 when
+    func(x0) >= 0, otherwise a bracket grown upwards from x0 past twice its Newton
+    step, starting from that step.
+    """
+    f, df = func(x0)
+    if f >= 0:
+        return 0.0, x0, x0
+    step = -f / df if df > 0 and math.isfinite(f) else x0
+    lo, hi = expand_bracket(func, x0, x0 + 2.0 * step)
+    start = x0 + step
+    return lo, hi, start if lo < start <= hi else hi
+
+
+def bracketed_newton(
+    func: Callable[[float], Tuple[float, float]],
+    lo: float,
+    hi: float,
+    x0: float = None,
+    tolerance: float = 1e-9,
+    max_iterations: int = 100,
+) -> RootResult:
+    """
+    Newton's method safeguarded by a bracket [lo, hi] with func(lo) <= 0 <= func(hi).
+
+    func(x) returns (f, df/dx). Each iteration takes the Newton step when it stays
+    inside the bracket and at least halves the previous step; otherwise it bisects.
+    The bracket shrinks every iteration, so the worst case is plain bisection.
+    Convergence is a step (or bracket width) below tolerance * max(1, |x|).
+    """
+    x = x0 if x0 is not None and lo < x0 <= hi else 0.5 * (lo + hi)
+    f, df = func(x)
+    step_old = hi - lo
+    for i in range(1, max_iterations + 1):
+        if f == 0:
+            return RootResult(x, i - 1, 0.0, True)
+        if f < 0:
+            lo = x
+        else:
+            hi = x
+
+        x_new = None
+        if df > 0 and math.isfinite(f):
+            candidate = x - f / df
+            if lo <= candidate <= hi and abs(candidate - x) <= 0.5 * step_old:
+                x_new = candidate
+        if x_new is None:
+            x_new = 0.5 * (lo + hi)
+
+        step_old = abs(x_new - x)
+        x = x_new
+        f, df = func(x)
+        scale = tolerance * max(1.0, abs(x))
+        if step_old <= scale or hi - lo <= scale:
+            return RootResult(x, i, abs(f), True)
+    return RootResult(x, max_iterations, abs(f), False)
+
+
+def expand_bracket_batch(func, lo: np.ndarray, hi: np.ndarray, factor: float = 2.0, max_expansions: int = 80):
+    """
+    Vectorized expand_bracket. func(idx, x) returns (f, df) for rows idx.
+    Rows that never change sign come back with hi = NaN.
+    """
+    lo = lo.copy()
+    hi = hi.copy()
+    pending = np.flatnonzero(np.isfinite(hi))
+    for _ in range(max_expansions):
+        if pending.size == 0:
+            return lo, hi
+        f, _ = func(pending, hi[pending])
+        short = f < 0
+        grow = pending[short]
+        lo[grow] = hi[grow]
+        hi[grow] *= factor
+        pending = grow
+    hi[pending] = np.nan
+    return lo, hi
+
+
+def bracketed_newton_batch(
+    func,
+    lo: np.ndarray,
+    hi: np.ndarray,
+    x0: np.ndarray = None,
+    tolerance: float = 1e-9,
+    max_iterations: int = 100,
+) -> RootBatchResult:
+    """
+    Vectorized bracketed_newton over many independent rows.
+
+    func(idx, x) returns (f, df/dx) for the rows in idx. Rows whose bracket is not
+    finite are skipped (NaN root, converged = False). Converged rows stop being
+    evaluated, so the cost is proportional to the rows still iterating.
+    """
+    lo = np.array(lo, dtype=float)
+    hi = np.array(hi, dtype=float)
+    ok = np.isfinite(lo) & np.isfinite(hi)
+    if x0 is None:
+        x = 0.5 * (lo + hi)
+    else:
+        x0 = np.broadcast_to(np.asarray(x0, dtype=float), lo.shape)
+        x = np.where((lo < x0) & (x0 <= hi), x0, 0.5 * (lo + hi))
+    x = np.where(ok, x, np.nan)
+    iterations = np.zeros(lo.shape, dtype=int)
+    residual = np.full(lo.shape, np.nan)
+    converged = np.zeros(lo.shape, dtype=bool)
+    step_old = hi - lo
+
+    active = np.flatnonzero(ok)
+    if active.size:
+        f, df = func(active, x[active])
+    for i in range(1, max_iterations + 1):
+        if active.size == 0:
+            break
+        xa = x[active]
+        exact = f == 0
+        lo[active] = np.where(f < 0, xa, lo[active])
+        hi[active] = np.where(f > 0, xa, hi[active])
+        lo_a, hi_a = lo[active], hi[active]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            candidate = xa - f / df
+        newton = (
+            (df > 0) & np.isfinite(candidate)
+            & (lo_a <= candidate) & (candidate <= hi_a)
+            & (np.abs(candidate - xa) <= 0.5 * step_old[active])
+        )
+        x_new = np.where(exact, xa, np.where(newton, candidate, 0.5 * (lo_a + hi_a)))
+
+        step = np.abs(x_new - xa)
+        step_old[active] = step
+        x[active] = x_new
+        f, df = func(active, x_new)
+        iterations[active] = i
+        residual[active] = np.abs(f)
+
+        scale = tolerance * np.maximum(1.0, np.abs(x_new))
+        done = exact | (step <= scale) | (hi[active] - lo[active] <= scale)
+        converged[active[done]] = True
+        keep = ~done
+        active = active[keep]
+        f = f[keep]
+        df = df[keep]
+    return RootBatchResult(x, iterations, residual, converged)
@@ -0,0 +1,238 @@
+import math
+from typing import NamedTuple, Tuple
+
+import numpy as np
+
+from .roots import (
+    RootBatchResult,
+    RootResult,
+    bracketed_newton,
+    bracketed_newton_batch,
+    expand_bracket,
+    expand_bracket_batch,
+)
+
+
+def _composite_discharge(T, c, W, Sg, Sx, depression):
+    """
+    Q(T) and dQ/dT of the composite section (T > W) for a flow coefficient c. Plain
+    arithmetic, so it serves the scalar and vectorized solvers alike.
+    """
+    y_curb = Sx * T + depression
+    y_w = Sx * (T - W)
+    q = (c / Sg) * (y_curb ** (8.0 / 3.0) - y_w ** (8.0 / 3.0)) + (c / Sx) * y_w ** (8.0 / 3.0)
+    dq = (8.0 / 3.0) * c * ((Sx / Sg) * (y_curb ** (5.0 / 3.0) - y_w ** (5.0 / 3.0)) + y_w ** (5.0 / 3.0))
+    return q, dq
+
+
+def gutter_discharge(
+    spread: float,
+    longitudinal_slope: float,
+    mannings_n: float,
+    gutter_width: float,
+    gutter_cross_slope: float,
+    road_cross_slope: float,
+    k_manning: float = 1.486,
+) -> Tuple[float, float]:
+    """
+    HEC-22 gutter discharge Q(T) and its derivative dQ/dT for a spread T.
+    Same composite (gutter + roadway cross slope) section as the gutter and curb
+    inlet geometry functions: uniform gutter slope while T <= W, composite beyond.
+    """
+    T = spread
+    W = gutter_width
+    Sg = gutter_cross_slope
+    Sx = road_cross_slope
+    if T <= 0:
+        return 0.0, 0.0
+    c = k_manning * (3.0 / 8.0) / mannings_n * math.sqrt(longitudinal_slope)
+
+    if W <= 0 or T <= W:
+        y = Sg * T
+        return (c / Sg) * y ** (8.0 / 3.0), (8.0 / 3.0) * c * y ** (5.0 / 3.0)
+
+    return _composite_discharge(T, c, W, Sg, Sx, max(0.0, (Sg - Sx) * W))
+
+
+def solve_spread(
+    discharge: float,
+    longitudinal_slope: float,
+    mannings_n: float,
+    gutter_width: float,
+    gutter_cross_slope: float,
+    road_cross_slope: float,
+    k_manning: float = 1.486,
+    tolerance: float = 1e-12,
+) -> RootResult:
+    """
+    Invert the HEC-22 gutter flow equation for spread T given discharge Q.
+
+    The uniform-slope case (T <= W) has the closed form T = (Q Sg / c)^(3/8) / Sg.
+    Otherwise the composite section is solved with bracketed Newton on ln(Q(T)/Q),
+    seeded from the closed-form spread of a plain road cross-slope triangle, which
+    already lies close to the root. The residual reported is |ln(Q(T)/Q)|.
+    """
+    if discharge is None or discharge <= 0:
+        raise ValueError("Discharge Q is required to solve for spread.")
+    if gutter_cross_slope <= 0 or road_cross_slope <= 0:
+        raise ValueError("Cross slopes must be greater than zero.")
+    if longitudinal_slope <= 0 or mannings_n <= 0:
+        raise ValueError("Slope and Manning's n must be greater than zero.")
+
+    W = gutter_width
+    Sg = gutter_cross_slope
+    Sx = road_cross_slope
+    c = k_manning * (3.0 / 8.0) / mannings_n * math.sqrt(longitudinal_slope)
+
+    T_uniform = (discharge * Sg / c) ** (3.0 / 8.0) / Sg
+    if W <= 0 or T_uniform <= W:
+        return RootResult(T_uniform, 0, 0.0, True)
+
+    log_Q = math.log(discharge)
+
+    def residual(T):
+        q, dq = gutter_discharge(T, longitudinal_slope, mannings_n, W, Sg, Sx, k_manning)
+        return math.log(q) - log_Q, dq / q
+
+    f_w, _ = residual(W)
+    if f_w >= 0:
+        # Only when Sg < Sx: the composite section already carries Q at T = W
+        return RootResult(W, 0, abs(f_w), True)
+
+    T_road = (discharge * Sx / c) ** (3.0 / 8.0) / Sx
+    lo, hi = expand_bracket(residual, W, max(T_road, 1.01 * W))
+    return bracketed_newton(residual, lo, hi, x0=hi, tolerance=tolerance)
+
+
+class GutterFlow(NamedTuple):
+    """Per-spread arrays from gutter_flow_parts."""
+    discharge: np.ndarray
+    discharge_in_gutter: np.ndarray  # Flow within the gutter width W
+    depth_at_curb: np.ndarray
+    depth_at_gutter_edge: np.ndarray  # Depth at T = W, zero while the spread is within W
+    gutter_depression: np.ndarray  # (Sg - Sx) W, zero while the spread is within W
+    area: np.ndarray
+
+
+def gutter_flow_parts(
+    spread,
+    longitudinal_slope,
+    mannings_n,
+    gutter_width,
+    gutter_cross_slope,
+    road_cross_slope,
+    k_manning: float = 1.486,
+) -> GutterFlow:
+    """
+    Vectorized HEC-22 gutter flow for an array of spreads, split between the gutter
+    and the roadway. Every input broadcasts, so each row may have its own section.
+    """
+    T = np.maximum(np.asarray(spread, dtype=float), 0.0)
+    W = np.maximum(np.asarray(gutter_width, dtype=float), 0.0)
+    Sg = np.asarray(gutter_cross_slope, dtype=float)
+    Sx = np.asarray(road_cross_slope, dtype=float)
+    c = k_manning * (3.0 / 8.0) / np.asarray(mannings_n, dtype=float) * np.sqrt(longitudinal_slope)
+
+    uniform = (W <= 0) | (T <= W)
+    depression = np.where(uniform, 0.0, np.maximum(0.0, (Sg - Sx) * W))
+    y_w = np.where(uniform, 0.0, Sx * (T - W))
+    y_curb = np.where(uniform, Sg * T, Sx * T + depression)
+    q_gutter = (c / Sg) * (y_curb ** (8.0 / 3.0) - y_w ** (8.0 / 3.0))
+    area = np.where(
+        uniform,
+        0.5 * Sg * T * T,
+        0.5 * (y_curb + y_w) * W + 0.5 * (T - W) * y_w,
+    )
+    return GutterFlow(q_gutter + (c / Sx) * y_w ** (8.0 / 3.0), q_gutter, y_curb, y_w, depression, area)
+
+
+def gutter_flow_array(
+    spread,
+    longitudinal_slope: float,
+    mannings_n: float,
+    gutter_width: float,
+    gutter_cross_slope: float,
+    road_cross_slope: float,
+    k_manning: float = 1.486,
+):
+    """
+    Vectorized HEC-22 gutter flow for an array of spreads.
+    Returns (discharge, depth_at_curb, flow_area) arrays.
+    """
+    flow = gutter_flow_parts(
+        spread, longitudinal_slope, mannings_n, gutter_width, gutter_cross_slope, road_cross_slope, k_manning
+    )
+    return flow.discharge, flow.depth_at_curb, flow.area
+
+
+def spread_for_depth(depth_at_curb, gutter_width: float, gutter_cross_slope: float, road_cross_slope: float):
+    """Vectorized inverse of the gutter section: spread T for a depth at the curb."""
+    y = np.maximum(np.asarray(depth_at_curb, dtype=float), 0.0)
+    W = max(gutter_width, 0.0)
+    Sg = gutter_cross_slope
+    Sx = road_cross_slope
+    if W <= 0:
+        return y / Sg
+    depression = max(0.0, (Sg - Sx) * W)
+    return np.where(y <= Sg * W, y / Sg, np.maximum((y - depression) / Sx, W))
+
+
+def solve_spread_batch(
+    discharge,
+    longitudinal_slope,
+    mannings_n,
+    gutter_width,
+    gutter_cross_slope,
+    road_cross_slope,
+    k_manning: float = 1.486,
+    tolerance: float = 1e-12,
+) -> RootBatchResult:
+    """
+    Vectorized solve_spread over broadcast arrays of gutter inputs.
+
+    Uniform-slope rows use the closed form; composite rows run bracketed Newton on
+    ln(Q(T)/Q) together. Rows with zero discharge have zero spread; rows with invalid
+    input come back as NaN with converged = False instead of raising.
+    """
+    Q, S, n, W, Sg, Sx = (
+        np.array(a, dtype=float)
+        for a in np.broadcast_arrays(
+            discharge, longitudinal_slope, mannings_n, gutter_width, gutter_cross_slope, road_cross_slope
+        )
+    )
+    valid = (Q >= 0) & (S > 0) & (n > 0) & (Sg > 0) & (Sx > 0)
+    flowing = valid & (Q > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        c = k_manning * (3.0 / 8.0) / n * np.sqrt(S)
+        T_uniform = np.power(Q * Sg / c, 3.0 / 8.0) / Sg
+        T_road = np.power(Q * Sx / c, 3.0 / 8.0) / Sx
+    composite = flowing & (W > 0) & (T_uniform > W)
+
+    spread = np.where(flowing, T_uniform, np.where(valid, 0.0, np.nan))
+    iterations = np.zeros(Q.shape, dtype=int)
+    residual = np.where(valid, 0.0, np.nan)
+    converged = valid.copy()
+
+    rows = np.flatnonzero(composite)
+    if rows.size:
+        Wr, Sgr, Sxr, cr = W[rows], Sg[rows], Sx[rows], c[rows]
+        depression = np.maximum(0.0, (Sgr - Sxr) * Wr)
+        log_Q = np.log(Q[rows])
+
+        def gutter_residual(idx, T):
+            q, dq = _composite_discharge(T, cr[idx], Wr[idx], Sgr[idx], Sxr[idx], depression[idx])
+            return np.log(q) - log_Q[idx], dq / q
+
+        everything = np.arange(rows.size)
+        f_w, _ = gutter_residual(everything, Wr)
+        # Only when Sg < Sx: the composite section already carries Q at T = W
+        at_w = f_w >= 0
+        lo = np.where(at_w, np.nan, Wr)
+        hi = np.where(at_w, np.nan, np.maximum(T_road[rows], 1.01 * Wr))
+        lo, hi = expand_bracket_batch(gutter_residual, lo, hi)
+        root = bracketed_newton_batch(gutter_residual, lo, hi, x0=hi, tolerance=tolerance)
+        spread[rows] = np.where(at_w, Wr, root.root)
+        iterations[rows] = np.where(at_w, 0, root.iterations)
+        residual[rows] = np.where(at_w, np.abs(f_w), root.residual)
+        converged[rows] = at_w | root.converged
+    return RootBatchResult(spread, iterations, residual, converged)
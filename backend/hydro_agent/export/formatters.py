@@ -1,3 +1,12 @@
+import csv
+import io
+import os
+from itertools import islice
+from operator import attrgetter
+from typing import Iterable, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
 from ..core.manning.schemas import ChannelInput, ChannelResult, Units
 
 def to_markdown(params: ChannelInput, result: ChannelResult) -> str:
@@ -44,9 +53,6 @@ def to_markdown(params: ChannelInput, result: ChannelResult) -> str:
 
 def to_csv(params: ChannelInput, result: ChannelResult) -> str:
     """Export calculation to CSV format."""
-    import csv
-    import io
-
     output = io.StringIO()
     writer = csv.writer(output)
     writer.writerow(["Category", "Parameter", "Value", "Units"])
@@ -82,3 +88,136 @@ def to_plain_text(params: ChannelInput, result: ChannelResult) -> str:
     text += f"Velocity: {result.velocity:.3f}\n"
     text += f"Regime: {result.flow_regime}\n"
     return text
+
+
+# Rows formatted per chunk of a bulk export
+EXPORT_CHUNK_SIZE = 10000
+BULK_FORMATS = ("csv", "markdown", "text")
+
+BULK_INPUT_COLUMNS = ("type", "units", "bottom_width", "left_side_slope", "right_side_slope", "slope", "mannings_n")
+BULK_RESULT_COLUMNS = (
+    "discharge", "depth", "area", "wetted_perimeter", "hydraulic_radius", "velocity", "froude_number",
+    "top_width", "flow_regime", "critical_depth", "critical_slope", "velocity_head", "specific_energy",
+)
+BULK_COLUMNS = BULK_INPUT_COLUMNS + BULK_RESULT_COLUMNS + ("error",)
+
+_result_row = attrgetter(*BULK_RESULT_COLUMNS)
+_NO_INPUT = ("",) * len(BULK_INPUT_COLUMNS)
+_NO_RESULT = ("",) * len(BULK_RESULT_COLUMNS)
+
+
+class TableFormatter:
+    """
+    Formats rows of a fixed set of columns as CSV, a Markdown table or tab-separated
+    plain text. Rows go through csv.writer in batches (with '|' as the delimiter and
+    backslash escapes for Markdown), so there is no per-row string templating.
+    """
+
+    def __init__(self, columns: Sequence[str], format: str = "csv"):
+        if format not in BULK_FORMATS:
+            raise ValueError(f"Invalid format: {format}. Use one of {', '.join(BULK_FORMATS)}.")
+        self.columns = tuple(columns)
+        self.format = format
+        self._buffer = io.StringIO()
+        if format == "csv":
+            self._writer = csv.writer(self._buffer, lineterminator="\n")
+            self._lead = ()
+        elif format == "markdown":
+            self._writer = csv.writer(self._buffer, delimiter="|", quoting=csv.QUOTE_NONE, escapechar="\\", lineterminator="|\n")
+            self._lead = ("",)
+        else:
+            self._writer = csv.writer(self._buffer, delimiter="\t", quoting=csv.QUOTE_NONE, escapechar="\\", lineterminator="\n")
+            self._lead = ()
+
+    def _flush(self) -> str:
+        text = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return text
+
+    def header(self) -> str:
+        self._writer.writerow(self._lead + self.columns)
+        if self.format == "markdown":
+            self._writer.writerow(self._lead + ("---",) * len(self.columns))
+        return self._flush()
+
+    def format_rows(self, rows: Iterable[tuple]) -> str:
+        self._writer.writerows(map(self._lead.__add__, rows) if self._lead else rows)
+        return self._flush()
+
+
+def channel_rows(pairs: Iterable[Tuple[Optional[ChannelInput], Union[ChannelResult, Exception]]]) -> Iterator[tuple]:
+    """
+    BULK_COLUMNS rows for (input, result) pairs. A pair whose result is an exception
+    (as returned by solve_normal_depth_many) gets empty result columns and the error;
+    an input of None (e.g. a row that failed validation) leaves the input columns empty.
+    """
+    for params, result in pairs:
+        if params is None:
+            inputs = _NO_INPUT
+        else:
+            inputs = (
+                params.type.value,
+                params.units.value,
+                params.bottom_width,
+                params.left_side_slope or params.side_slope,
+                params.right_side_slope or params.side_slope,
+                params.slope,
+                params.mannings_n,
+            )
+        if isinstance(result, ChannelResult):
+            yield inputs + _result_row(result) + ("",)
+        else:
+            # Keep each record on one line in every format
+            yield inputs + _NO_RESULT + (" ".join(str(result).split()),)
+
+
+def iter_export(pairs: Iterable[Tuple[Optional[ChannelInput], Union[ChannelResult, Exception]]], format: str = "csv") -> Iterator[str]:
+    """
+    Stream (ChannelInput, ChannelResult) pairs as one table: the header, then one text
+    chunk per EXPORT_CHUNK_SIZE rows. Pairs are consumed lazily, so memory does not
+    grow with the number of rows. Suitable for a StreamingResponse or write_export.
+    """
+    formatter = TableFormatter(BULK_COLUMNS, format)
+    yield formatter.header()
+    rows = channel_rows(pairs)
+    while True:
+        chunk = list(islice(rows, EXPORT_CHUNK_SIZE))
+        if not chunk:
+            return
+        yield formatter.format_rows(chunk)
+
+
+def iter_export_columns(columns, format: str = "csv", fields: Optional[Sequence[str]] = None) -> Iterator[str]:
+    """
+    Stream equal-length columns as one table, EXPORT_CHUNK_SIZE rows per chunk.
+
+    columns is a mapping of name to array (e.g. ResultsStore.frame(), or batch arrays
+    merged with their inputs) or a NamedTuple of arrays such as ChannelBatchResult.
+    Only one chunk of each column is converted to Python values at a time, so
+    memory-mapped columns are never loaded whole.
+    """
+    if hasattr(columns, "_asdict"):
+        columns = columns._asdict()
+    names = list(fields or columns)
+    arrays = [np.asarray(columns[name]) for name in names]
+    count = len(arrays[0]) if arrays else 0
+    if any(array.ndim != 1 or len(array) != count for array in arrays):
+        raise ValueError("Export columns must be one-dimensional and of equal length.")
+
+    formatter = TableFormatter(names, format)
+    yield formatter.header()
+    for start in range(0, count, EXPORT_CHUNK_SIZE):
+        stop = start + EXPORT_CHUNK_SIZE
+        yield formatter.format_rows(zip(*(array[start:stop].tolist() for array in arrays)))
+
+
+def write_export(chunks: Iterable[str], destination) -> int:
+    """Write exported chunks to a path or text file object; returns the number of characters written."""
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, "w", encoding="utf-8", newline="") as f:
+            return write_export(chunks, f)
+    written = 0
+    for chunk in chunks:
+        written += destination.write(chunk)
+    return written
@@ -0,0 +1,229 @@
+"""
+Irregular cross sections cut from DEM rasters.
+
+Rasters are opened as read-only memory maps (NumPy .npy, headerless raw grids, or
+ESRI GridFloat .hdr/.flt pairs), so sampling thousands of cut lines reads only the
+pages under the lines rather than the whole grid.
+"""
+import os
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..core.manning.schemas import ChannelInput, ChannelType
+from .schemas import CutLine
+
+# Data files looked for next to a GridFloat header, in order
+GRIDFLOAT_EXTENSIONS = (".flt", ".bil", ".bin")
+
+
+class DemRaster:
+    """
+    A north-up elevation grid with square cells.
+
+    Row 0 is the northern edge and cell (row, col) is centered at
+    x = x_min + (col + 0.5) * cell_size, y = y_max - (row + 0.5) * cell_size.
+    data is usually a read-only memory map; sample() indexes only the cells around
+    the requested points. Elevations and coordinates must be in the length unit the
+    sections will be solved in.
+    """
+
+    def __init__(self, data, x_min: float = 0.0, y_max: Optional[float] = None, cell_size: float = 1.0, nodata: Optional[float] = None):
+        if data.ndim != 2 or min(data.shape) < 2:
+            raise ValueError("A DEM must be a 2-D grid of at least 2 x 2 cells.")
+        if not cell_size > 0:
+            raise ValueError("DEM cell size must be greater than zero.")
+        self.data = data
+        self.rows, self.cols = data.shape
+        self.cell_size = float(cell_size)
+        self.x_min = float(x_min)
+        self.y_max = float(y_max) if y_max is not None else self.rows * self.cell_size
+        self.nodata = nodata
+
+    @property
+    def extent(self) -> Tuple[float, float, float, float]:
+        """(x_min, y_min, x_max, y_max) of the grid's outer cell edges."""
+        return (
+            self.x_min,
+            self.y_max - self.rows * self.cell_size,
+            self.x_min + self.cols * self.cell_size,
+            self.y_max,
+        )
+
+    @classmethod
+    def from_npy(cls, path: str, **georeference) -> "DemRaster":
+        """Memory-map a 2-D .npy array; georeference holds x_min, y_max, cell_size and nodata."""
+        return cls(np.load(path, mmap_mode="r"), **georeference)
+
+    @classmethod
+    def from_raw(cls, path: str, rows: int, cols: int, dtype: str = "<f4", offset: int = 0, **georeference) -> "DemRaster":
+        """Memory-map a headerless row-major grid of rows x cols values starting at byte offset."""
+        return cls(np.memmap(path, dtype=np.dtype(dtype), mode="r", offset=offset, shape=(rows, cols)), **georeference)
+
+    @classmethod
+    def from_gridfloat(cls, path: str) -> "DemRaster":
+        """
+        Memory-map an ESRI GridFloat raster: a text .hdr (ncols, nrows, xllcorner or
+        xllcenter, yllcorner or yllcenter, cellsize, nodata_value, byteorder) and a
+        float32 data file with the same name. path may name either file.
+        """
+        stem, ext = os.path.splitext(path)
+        header = _read_header(stem + ".hdr")
+        data_path = path if ext.lower() != ".hdr" else next(
+            (stem + e for e in GRIDFLOAT_EXTENSIONS if os.path.exists(stem + e)), None
+        )
+        if data_path is None:
+            raise ValueError(f"No GridFloat data file ({', '.join(GRIDFLOAT_EXTENSIONS)}) found for {path}.")
+        try:
+            rows, cols, cell_size = int(header["nrows"]), int(header["ncols"]), float(header["cellsize"])
+        except KeyError as e:
+            raise ValueError(f"GridFloat header is missing {e.args[0]}.") from None
+        x_min = float(header["xllcorner"]) if "xllcorner" in header else float(header.get("xllcenter", 0.5 * cell_size)) - 0.5 * cell_size
+        y_min = float(header["yllcorner"]) if "yllcorner" in header else float(header.get("yllcenter", 0.5 * cell_size)) - 0.5 * cell_size
+        order = ">" if header.get("byteorder", "lsbfirst").lower() in ("msbfirst", "m") else "<"
+        nodata = float(header["nodata_value"]) if "nodata_value" in header else None
+        return cls.from_raw(
+            data_path, rows, cols, dtype=order + "f4",
+            x_min=x_min, y_max=y_min + rows * cell_size, cell_size=cell_size, nodata=nodata,
+        )
+
+    def sample(self, x, y) -> np.ndarray:
+        """
+        Bilinear elevations at points (x, y) from the four surrounding cell centers.
+        Points in the outer half cell use the edge values; points outside the grid, or
+        next to a nodata cell, are NaN.
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        col = (x - self.x_min) / self.cell_size - 0.5
+        row = (self.y_max - y) / self.cell_size - 0.5
+        inside = (col >= -0.5) & (col <= self.cols - 0.5) & (row >= -0.5) & (row <= self.rows - 0.5)
+        col = np.clip(np.where(inside, col, 0.0), 0.0, self.cols - 1)
+        row = np.clip(np.where(inside, row, 0.0), 0.0, self.rows - 1)
+        j = np.minimum(col.astype(np.intp), self.cols - 2)
+        i = np.minimum(row.astype(np.intp), self.rows - 2)
+        fc = col - j
+        fr = row - i
+
+        corners = [np.asarray(self.data[i + di, j + dj], dtype=float) for di in (0, 1) for dj in (0, 1)]
+        z00, z01, z10, z11 = corners
+        z = (z00 * (1.0 - fc) + z01 * fc) * (1.0 - fr) + (z10 * (1.0 - fc) + z11 * fc) * fr
+        missing = ~inside | np.isnan(z)
+        if self.nodata is not None:
+            for corner in corners:
+                missing |= corner == self.nodata
+        return np.where(missing, np.nan, z)
+
+
+def _read_header(path: str) -> Dict[str, str]:
+    header = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2:
+                header[parts[0].lower()] = parts[1]
+    return header
+
+
+def open_dem(path: str, **georeference) -> DemRaster:
+    """Open a DEM by extension: .npy (with georeference keywords) or a GridFloat .hdr/.flt/.bil."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy":
+        return DemRaster.from_npy(path, **georeference)
+    if ext == ".hdr" or ext in GRIDFLOAT_EXTENSIONS:
+        return DemRaster.from_gridfloat(path)
+    raise ValueError(f"Unsupported DEM format: {ext or path}. Use .npy, GridFloat (.hdr/.flt) or DemRaster.from_raw.")
+
+
+class CutLineSamples(NamedTuple):
+    """Samples of many cut lines, concatenated; line k owns rows offsets[k]:offsets[k + 1]."""
+    station: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    elevation: np.ndarray
+    offsets: np.ndarray
+
+
+def sample_cut_lines(
+    dem: DemRaster,
+    lines: Sequence[Sequence[Tuple[float, float]]],
+    spacing: Union[float, Sequence[Optional[float]], None] = None,
+) -> CutLineSamples:
+    """
+    Sample every cut line at evenly spaced stations in one vectorized pass.
+
+    Each line is a polyline of at least two (x, y) vertices. It is divided into the
+    fewest equal steps no longer than its spacing (default: the DEM cell size), with
+    stations measured along the polyline from its first vertex. Elevations are NaN
+    where a sample falls outside the DEM or next to nodata.
+    """
+    vertices = [np.asarray(line, dtype=float).reshape(-1, 2) for line in lines]
+    if not vertices:
+        empty = np.empty(0)
+        return CutLineSamples(empty, empty, empty, empty, np.zeros(1, dtype=np.intp))
+    counts = np.array([len(v) for v in vertices])
+    if (counts < 2).any():
+        raise ValueError(f"Cut line {int(np.argmax(counts < 2))} needs at least two vertices.")
+    xy = np.concatenate(vertices)
+    first = np.cumsum(counts) - counts
+    last = first + counts - 1
+
+    # Chainage along all lines end to end; the joins between lines have zero length
+    step = np.hypot(*np.diff(xy, axis=0).T)
+    step[last[:-1]] = 0.0
+    chain = np.concatenate(([0.0], np.cumsum(step)))
+    length = chain[last] - chain[first]
+
+    if spacing is None or np.isscalar(spacing):
+        spacing = np.full(len(vertices), spacing or dem.cell_size)
+    else:
+        spacing = np.array([s or dem.cell_size for s in spacing], dtype=float)
+    n = np.ceil(length / spacing).astype(np.intp) + 1
+    n = np.maximum(n, 2)
+    offsets = np.concatenate(([0], np.cumsum(n)))
+    line = np.repeat(np.arange(len(vertices)), n)
+    k = np.arange(offsets[-1]) - offsets[line]
+    station = k * (length / (n - 1))[line]
+
+    position = chain[first][line] + station
+    segment = np.clip(np.searchsorted(chain, position, side="right") - 1, first[line], last[line] - 1)
+    seg_length = chain[segment + 1] - chain[segment]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.clip(np.where(seg_length > 0, (position - chain[segment]) / seg_length, 0.0), 0.0, 1.0)
+    x = xy[segment, 0] + t * (xy[segment + 1, 0] - xy[segment, 0])
+    y = xy[segment, 1] + t * (xy[segment + 1, 1] - xy[segment, 1])
+    return CutLineSamples(station, x, y, dem.sample(x, y), offsets)
+
+
+def cut_sections(dem: DemRaster, lines: Sequence[CutLine], **defaults) -> List[Union[ChannelInput, ValueError]]:
+    """
+    Irregular ChannelInputs (stations/elevations arrays) cut from a DEM, one per line
+    in order, or the ValueError for lines that leave the DEM, cross nodata, have zero
+    length or give an invalid ChannelInput.
+
+    defaults are ChannelInput fields shared by every section (discharge, slope,
+    mannings_n, units, simplify_tolerance, ...); each line's channel fields override
+    them.
+    """
+    samples = sample_cut_lines(dem, [line.points for line in lines], [line.spacing for line in lines])
+    sections: List[Union[ChannelInput, ValueError]] = []
+    for k, line in enumerate(lines):
+        rows = slice(samples.offsets[k], samples.offsets[k + 1])
+        label = line.name or f"#{k}"
+        station = samples.station[rows]
+        elevation = samples.elevation[rows]
+        missing = int(np.isnan(elevation).sum())
+        if missing:
+            sections.append(ValueError(f"Cut line {label}: {missing} of {len(elevation)} samples fall outside the DEM or on nodata cells."))
+            continue
+        if station[-1] <= 0:
+            sections.append(ValueError(f"Cut line {label} has zero length."))
+            continue
+        try:
+            sections.append(ChannelInput.model_validate({
+                **defaults, **line.channel,
+                "type": ChannelType.IRREGULAR, "stations": station, "elevations": elevation,
+            }))
+        except ValueError as e:
+            sections.append(e)
+    return sections
@@ -0,0 +1,11 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+
+class CutLine(BaseModel):
+    """A cross-section cut line drawn on a DEM, from left to right bank looking downstream."""
+    name: Optional[str] = Field(None, description="Label for reports, e.g. a river station")
+    points: List[Tuple[float, float]] = Field(..., min_length=2, description="Polyline vertices (x, y) in the DEM's coordinate system")
+    spacing: Optional[float] = Field(None, gt=0, description="Distance between samples along the line; defaults to the DEM cell size")
+    channel: Dict[str, Any] = Field({}, description="ChannelInput fields for the section (discharge, slope, mannings_n, units, ...); override the defaults given to cut_sections")
@@ -9,6 +9,9 @@ class Scenario(BaseModel):
     module: str = "manning.channels"
     inputs: Dict[str, Any]
     results: Optional[Dict[str, Any]] = None
+    hydraulic_table: Optional[Dict[str, Any]] = Field(None, description="Saved HydraulicTable.to_dict() for irregular sections")
+    input_hash: Optional[str] = Field(None, description="Hash of module and inputs the stored results were solved from")
+    error: Optional[str] = Field(None, description="Error from the last solve, if it failed")
     notes: str = ""
 
 class Project(BaseModel):
@@ -18,11 +21,35 @@ class Project(BaseModel):
     modified: datetime = Field(default_factory=datetime.now)
     scenarios: List[Scenario] = []
 
-    def save_to_file(self, filepath: str):
+    def save_to_file(self, filepath: str, stream: bool = False, save_index: Optional[bool] = None):
+        """
+        Write the project as indented JSON. stream=True writes compact JSON one scenario
+        at a time instead (see projects.streaming.ProjectWriter), with save_index as there.
+        """
+        if stream:
+            from .streaming import ProjectWriter
+            with ProjectWriter(
+                filepath, name=self.name, version=self.version, created=self.created, modified=self.modified,
+                save_index=save_index,
+            ) as writer:
+                for scenario in self.scenarios:
+                    writer.write(scenario)
+            return
         with open(filepath, 'w') as f:
             f.write(self.model_dump_json(indent=2))
 
+    def save_results_store(self, filepath: str) -> int:
+        """Write the columnar results sidecar (<filepath>.results/) for this project; see projects.results_store."""
+        from .results_store import results_store_path, write_results_store
+        return write_results_store(results_store_path(filepath), self.scenarios)
+
+    def solve_all(self, workers: Optional[int] = None, pool: str = "process", force: bool = False):
+        """Re-solve scenarios whose inputs changed since the last solve; see projects.solver.solve_project."""
+        from .solver import solve_project
+        return solve_project(self, workers=workers, pool=pool, force=force)
+
     @classmethod
     def load_from_file(cls, filepath: str):
+        """Load and validate the whole project; projects.streaming.ProjectReader opens single scenarios."""
         with open(filepath, 'r') as f:
             return cls.model_validate_json(f.read())
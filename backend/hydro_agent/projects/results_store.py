@@ -0,0 +1,152 @@
+import json
+import os
+import shutil
+import typing
+from array import array
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from ..core.curb_inlets.schemas import CurbInletOnGradeResult
+from ..core.manning.schemas import ChannelResult
+from .models import Scenario
+from .solver import CHANNELS_MODULE, CURB_ON_GRADE_MODULE
+
+# Results sidecar directory next to a project file (<file>.results/)
+RESULTS_SUFFIX = ".results"
+_META_FILE = "scenarios.json"
+_MODULE_COLUMN = "module"
+_FORMAT_VERSION = 1
+
+RESULT_MODELS: Dict[str, type] = {
+    CHANNELS_MODULE: ChannelResult,
+    CURB_ON_GRADE_MODULE: CurbInletOnGradeResult,
+}
+
+
+def _numeric_fields(model: type) -> List[str]:
+    """Fields of a result model that are (optional) ints or floats."""
+    names = []
+    for name, field in model.model_fields.items():
+        types = typing.get_args(field.annotation) or (field.annotation,)
+        if all(t in (int, float, type(None)) for t in types):
+            names.append(name)
+    return names
+
+
+def result_fields() -> List[str]:
+    """Column names of a results store: the numeric fields of every result model, in model order."""
+    fields: List[str] = []
+    for model in RESULT_MODELS.values():
+        fields.extend(name for name in _numeric_fields(model) if name not in fields)
+    return fields
+
+
+def results_store_path(project_path) -> str:
+    return os.fspath(project_path) + RESULTS_SUFFIX
+
+
+def write_results_store(path, scenarios: Iterable[Scenario]) -> int:
+    """
+    Write the numeric results of scenarios as one float64 .npy column per result field,
+    plus an int8 module column and the scenario ids; returns the number of rows.
+
+    Scenarios are consumed one at a time (a ProjectReader works), so the project never
+    has to be loaded. Fields a scenario's module does not produce, and scenarios
+    without results, are NaN. The directory is replaced only once complete.
+    """
+    path = os.fspath(path)
+    fields = result_fields()
+    columns = {name: array("d") for name in fields}
+    module_codes = array("b")
+    modules: List[str] = []
+    ids: List[str] = []
+    for scenario in scenarios:
+        if scenario.module not in modules:
+            modules.append(scenario.module)
+        module_codes.append(modules.index(scenario.module))
+        ids.append(scenario.id)
+        results = scenario.results or {}
+        for name, column in columns.items():
+            value = results.get(name)
+            column.append(float(value) if isinstance(value, (int, float)) else np.nan)
+
+    staging = path + ".tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    for name, column in columns.items():
+        np.save(os.path.join(staging, f"{name}.npy"), np.frombuffer(column, dtype=np.float64))
+    np.save(os.path.join(staging, f"{_MODULE_COLUMN}.npy"), np.frombuffer(module_codes, dtype=np.int8))
+    with open(os.path.join(staging, _META_FILE), "w", encoding="utf-8") as f:
+        json.dump({"format": _FORMAT_VERSION, "count": len(ids), "fields": fields, "modules": modules, "ids": ids}, f)
+
+    if os.path.isdir(path):
+        retired = path + ".old"
+        shutil.rmtree(retired, ignore_errors=True)
+        os.replace(path, retired)
+        os.replace(staging, path)
+        shutil.rmtree(retired, ignore_errors=True)
+    else:
+        os.replace(staging, path)
+    return len(ids)
+
+
+class ResultsStore:
+    """
+    Memory-mapped, read-only view of a results store written by write_results_store.
+
+    store["velocity"] is a float64 array over all scenarios (NaN where a scenario has no
+    such result), mapped from disk on first access, so project-wide queries such as
+    np.nanmax(store["velocity"]) read only that column.
+    """
+
+    def __init__(self, path):
+        self.path = os.fspath(path)
+        try:
+            with open(os.path.join(self.path, _META_FILE), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except OSError:
+            raise ValueError(f"No results store at {self.path}") from None
+        if meta.get("format") != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported results store format: {meta.get('format')}")
+        self.fields: List[str] = meta["fields"]
+        self.modules: List[str] = meta["modules"]
+        self.ids: List[str] = meta["ids"]
+        self._rows: Dict[str, int] = {}
+        for i, scenario_id in enumerate(self.ids):
+            self._rows.setdefault(scenario_id, i)
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, scenario_id) -> bool:
+        return scenario_id in self._rows
+
+    def _column(self, name: str) -> np.ndarray:
+        column = self._columns.get(name)
+        if column is None:
+            column = np.load(os.path.join(self.path, f"{name}.npy"), mmap_mode="r")
+            self._columns[name] = column
+        return column
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        if field not in self.fields:
+            raise KeyError(field)
+        return self._column(field)
+
+    def module_mask(self, module: str) -> np.ndarray:
+        """Boolean mask of the rows solved by a module (e.g. "manning.channels")."""
+        if module not in self.modules:
+            return np.zeros(len(self), dtype=bool)
+        return self._column(_MODULE_COLUMN) == self.modules.index(module)
+
+    def row(self, scenario_id: str) -> Dict[str, Optional[float]]:
+        """The stored results of one scenario, with None for missing values. Raises KeyError for unknown ids."""
+        i = self._rows[scenario_id]
+        values = {name: float(self._column(name)[i]) for name in self.fields}
+        return {name: None if np.isnan(value) else value for name, value in values.items()}
+
+    def frame(self, fields: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """Columns by name (all fields by default), e.g. to tabulate or plot several fields together."""
+        return {name: self[name] for name in (fields or self.fields)}
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from pydantic import BaseModel
+
+from ..core.curb_inlets.on_grade import solve_curb_inlet_on_grade
+from ..core.curb_inlets.schemas import CurbInletOnGradeInput
+from ..core.manning.channels import solve_normal_depth, solve_normal_depth_many
+from ..core.manning.htab import HydraulicTable, section_key
+from ..core.manning.schemas import ChannelInput, ChannelType, SolveFor
+from .models import Project, Scenario
+
+CHANNELS_MODULE = "manning.channels"
+CURB_ON_GRADE_MODULE = "curb_inlets.on_grade"
+
+# Scenarios handed to a worker at a time
+PROJECT_CHUNK_SIZE = 500
+# Fewer changed scenarios than this are solved in-process
+PARALLEL_THRESHOLD = 2000
+
+# Frontend (camelCase) scenario input names -> solver input fields
+_CHANNEL_ALIASES = {
+    "solveFor": "solve_for",
+    "width": "bottom_width",
+    "sideSlope": "side_slope",
+    "leftSideSlope": "left_side_slope",
+    "rightSideSlope": "right_side_slope",
+    "manningsN": "mannings_n",
+    "irregularPoints": "station_elevation_points",
+    "gutterWidth": "gutter_width",
+    "gutterCrossSlope": "gutter_cross_slope",
+    "roadCrossSlope": "road_cross_slope",
+    "normalDepth": "known_depth",
+    "waterSurfaceElevation": "known_wse",
+}
+_CURB_ALIASES = {
+    "discharge": "discharge_cfs",
+    "slope": "longitudinal_slope",
+    "gutterWidth": "gutter_width_ft",
+    "gutterCrossSlope": "gutter_cross_slope",
+    "roadCrossSlope": "road_cross_slope",
+    "manningsN": "mannings_n",
+    "curbOpeningLength": "curb_opening_length_ft",
+    "localDepressionDepth": "local_depression_depth_in",
+    "localDepressionWidth": "local_depression_width_in",
+}
+
+
+class ProjectSolveSummary(NamedTuple):
+    solved: List[str]
+    unchanged: int
+    failed: List[str]
+
+
+def input_hash(scenario: Scenario) -> str:
+    """Hash of a scenario's module and raw inputs; results are reused while it is unchanged."""
+    payload = json.dumps(
+        {"module": scenario.module, "inputs": scenario.inputs},
+        sort_keys=True, separators=(",", ":"), default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _adapt(inputs: Dict[str, Any], aliases: Dict[str, str], model) -> Dict[str, Any]:
+    """Map camelCase or snake_case scenario inputs onto the model's fields, dropping UI-only keys and blanks."""
+    data = {}
+    for key, value in inputs.items():
+        name = aliases.get(key, key)
+        if name in model.model_fields and value is not None and value != "":
+            data[name] = value
+    return data
+
+
+def scenario_input(module: str, inputs: Dict[str, Any]) -> BaseModel:
+    """Validated solver input for a scenario. Raises ValueError for unknown modules or invalid inputs."""
+    if module == CHANNELS_MODULE:
+        data = _adapt(inputs, _CHANNEL_ALIASES, ChannelInput)
+        # The calculator keeps every field of the form; send what it would send to the API
+        if data.get("solve_for") == SolveFor.DISCHARGE.value:
+            data.pop("discharge", None)
+        if data.get("type") != ChannelType.IRREGULAR.value:
+            data.pop("station_elevation_points", None)
+        return ChannelInput.model_validate(data)
+    if module == CURB_ON_GRADE_MODULE:
+        return CurbInletOnGradeInput.model_validate(_adapt(inputs, _CURB_ALIASES, CurbInletOnGradeInput))
+    raise ValueError(f"Unknown scenario module: {module}")
+
+
+def _saved_table(params: ChannelInput, table: Optional[Dict[str, Any]]) -> Optional[HydraulicTable]:
+    """The scenario's saved HydraulicTable, if it was built from the current section points (in either encoding)."""
+    if not table or params.type != ChannelType.IRREGULAR or params.point_count() < 2:
+        return None
+    if params.stations is not None:
+        points = list(zip(params.stations.tolist(), params.elevations.tolist()))
+    else:
+        points = params.station_elevation_points
+    if table.get("key") != section_key(points):
+        return None
+    return HydraulicTable.from_dict(table)
+
+
+def _solve_chunk(items: List[Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]]) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Solve (module, inputs, hydraulic_table) items, returning (results, error) pairs in
+    order. Channel scenarios without a saved table go through solve_normal_depth_many
+    together. Module level so worker processes can run it.
+    """
+    outcomes: List[Tuple[Optional[Dict[str, Any]], Optional[str]]] = [(None, None)] * len(items)
+    channels = []
+    for i, (module, inputs, table) in enumerate(items):
+        try:
+            params = scenario_input(module, inputs)
+            if isinstance(params, CurbInletOnGradeInput):
+                result = solve_curb_inlet_on_grade(params)
+            else:
+                section = _saved_table(params, table)
+                if section is None:
+                    channels.append((i, params))
+                    continue
+                result = solve_normal_depth(params, section=section)
+            outcomes[i] = (result.model_dump(mode="json"), None)
+        except ValueError as e:
+            outcomes[i] = (None, str(e))
+
+    solved = solve_normal_depth_many([params for _, params in channels])
+    for (i, _), outcome in zip(channels, solved):
+        if isinstance(outcome, ValueError):
+            outcomes[i] = (None, str(outcome))
+        else:
+            outcomes[i] = (outcome.model_dump(mode="json"), None)
+    return outcomes
+
+
+def solve_project(
+    project: Project,
+    workers: Optional[int] = None,
+    pool: str = "process",
+    force: bool = False,
+) -> ProjectSolveSummary:
+    """
+    Recompute the results of every scenario whose inputs changed since the last solve.
+
+    Each solved scenario stores the input_hash of what it was solved from, together
+    with its results or error; scenarios whose hash still matches are skipped unless
+    force is set. Changed scenarios are solved in chunks of PROJECT_CHUNK_SIZE, on a
+    process (or thread) pool of `workers` when there are PARALLEL_THRESHOLD or more.
+    """
+    if pool not in ("process", "thread"):
+        raise ValueError("pool must be 'process' or 'thread'.")
+    dirty = []
+    hashes = []
+    for scenario in project.scenarios:
+        digest = input_hash(scenario)
+        if force or scenario.input_hash != digest:
+            dirty.append(scenario)
+            hashes.append(digest)
+
+    items = [(s.module, s.inputs, s.hydraulic_table) for s in dirty]
+    chunks = [items[start:start + PROJECT_CHUNK_SIZE] for start in range(0, len(items), PROJECT_CHUNK_SIZE)]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(items) >= PARALLEL_THRESHOLD:
+        executor = ProcessPoolExecutor if pool == "process" else ThreadPoolExecutor
+        with executor(max_workers=min(workers, len(chunks))) as runner:
+            outcomes = [outcome for chunk in runner.map(_solve_chunk, chunks) for outcome in chunk]
+    else:
+        outcomes = [outcome for chunk in chunks for outcome in _solve_chunk(chunk)]
+
+    failed = []
+    for scenario, digest, (results, error) in zip(dirty, hashes, outcomes):
+        scenario.results = results
+        scenario.error = error
+        scenario.input_hash = digest
+        if error is not None:
+            failed.append(scenario.id)
+    if dirty:
+        project.modified = datetime.now()
+    return ProjectSolveSummary(
+        solved=[scenario.id for scenario in dirty],
+        unchanged=len(project.scenarios) - len(dirty),
+        failed=failed,
+    )
@@ -0,0 +1,328 @@
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .models import Project, Scenario
+
+# Bytes read at a time while scanning a project file
+READ_CHUNK_SIZE = 1 << 22
+# Offset index saved next to a project file (<file>.index.json) on request
+INDEX_SUFFIX = ".index.json"
+
+IndexEntry = Tuple[Optional[str], int, int]
+
+
+_SCENARIOS_KEY = re.compile(rb'"scenarios"\s*:\s*\Z')
+_ID_FIELD = re.compile(rb'\s*"id"\s*:\s*("(?:[^"\\]|\\.)*")')
+_QUOTE = ord('"')
+_BACKSLASH = ord("\\")
+# Byte classes for the structural scan: 1 quote, 2 opening bracket, 3 closing bracket
+_BYTE_CLASS = np.zeros(256, dtype=np.uint8)
+_BYTE_CLASS[_QUOTE] = 1
+_BYTE_CLASS[[ord("{"), ord("[")]] = 2
+_BYTE_CLASS[[ord("}"), ord("]")]] = 3
+
+
+def _backslash_run(data: bytes, end: int, carry: int) -> int:
+    """Number of consecutive backslashes before data[end], continuing into the previous chunk's carry."""
+    run = 0
+    while end - run > 0 and data[end - run - 1] == _BACKSLASH:
+        run += 1
+    return run + carry if run == end else run
+
+
+def _structure_events(file) -> Iterator[Tuple[int, bool, int, bytes]]:
+    """
+    Yield (byte offset, is_open, depth after, up to 64 preceding bytes) for every
+    bracket outside strings that opens to depth <= 3 or closes to depth <= 2.
+
+    Works on READ_CHUNK_SIZE blocks with numpy and never decodes a value: a bracket is
+    inside a string when an odd number of unescaped quotes precede it, and a running
+    sum over the remaining brackets gives the depth.
+    """
+    offset = 0
+    depth = 0
+    in_string = 0
+    carry = 0
+    tail = b""
+    while True:
+        chunk = file.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        data = np.frombuffer(chunk, dtype=np.uint8)
+        positions = np.flatnonzero(_BYTE_CLASS[data])
+        classes = _BYTE_CLASS[data[positions]]
+
+        quotes = positions[classes == 1]
+        candidates = quotes[data[quotes - 1] == _BACKSLASH] if carry == 0 else quotes[
+            (quotes == 0) | (data[quotes - 1] == _BACKSLASH)
+        ]
+        escaped = [i for i in candidates.tolist() if _backslash_run(chunk, i, carry) % 2]
+        if escaped:
+            quotes = np.setdiff1d(quotes, escaped, assume_unique=True)
+
+        brackets = classes >= 2
+        bracket_positions = positions[brackets]
+        outside = (np.searchsorted(quotes, bracket_positions) + in_string) % 2 == 0
+        bracket_positions = bracket_positions[outside]
+        is_open = classes[brackets][outside] == 2
+        levels = depth + np.cumsum(np.where(is_open, 1, -1), dtype=np.int64)
+        context = tail + chunk
+        for j in np.flatnonzero(np.where(is_open, levels <= 3, levels <= 2)).tolist():
+            i = int(bracket_positions[j])
+            yield offset + i, bool(is_open[j]), int(levels[j]), context[max(0, len(tail) + i - 64):len(tail) + i]
+
+        if levels.size:
+            depth = int(levels[-1])
+        in_string = (in_string + quotes.size) % 2
+        carry = _backslash_run(chunk, len(chunk), carry)
+        tail = context[-64:]
+        offset += len(chunk)
+    if depth != 0 or in_string:
+        raise ValueError("Invalid project file: unbalanced brackets or unterminated string.")
+
+
+def _read_span(file, start: int, end: int) -> bytes:
+    file.seek(start)
+    return file.read(end - start)
+
+
+def _scenario_id(file, start: int, end: int) -> Optional[str]:
+    """The scenario's id, read from its first field (the order models and the calculator write), else by decoding it."""
+    head = _read_span(file, start + 1, min(end, start + 513))
+    match = _ID_FIELD.match(head)
+    if match:
+        return json.loads(match.group(1))
+    scenario = json.loads(_read_span(file, start, end))
+    scenario_id = scenario.get("id") if isinstance(scenario, dict) else None
+    return None if scenario_id is None else str(scenario_id)
+
+
+def _scan(file) -> Tuple[Dict[str, Any], List[IndexEntry]]:
+    """
+    Read the top-level fields of a project file and the (id, start, end) byte span of
+    each scenario from a structural scan of the file (see _structure_events).
+    """
+    spans: List[Tuple[int, int]] = []
+    array_start = array_end = None
+    element_start = None
+    for position, is_open, level, before in _structure_events(file):
+        if array_start is None:
+            if is_open and level == 2 and _SCENARIOS_KEY.search(before):
+                array_start = position
+        elif array_end is None:
+            if is_open and level == 3:
+                element_start = position
+            elif not is_open and level == 2 and element_start is not None:
+                spans.append((element_start, position + 1))
+                element_start = None
+            elif not is_open and level == 1:
+                array_end = position + 1
+
+    if array_start is None:
+        file.seek(0)
+        header = json.loads(file.read())
+    else:
+        head = _read_span(file, 0, array_start)
+        file.seek(array_end)
+        header = json.loads(head + b"null" + file.read())
+    if not isinstance(header, dict):
+        raise ValueError("Invalid project file: expected a JSON object.")
+    header.pop("scenarios", None)
+    return header, [(_scenario_id(file, start, end), start, end) for start, end in spans]
+
+
+def _index_path(path: str) -> str:
+    return path + INDEX_SUFFIX
+
+
+def _load_index(path: str, stat: os.stat_result) -> Optional[Tuple[Dict[str, Any], List[IndexEntry]]]:
+    """Saved index for the file, or None if missing, unreadable or written for another version of the file."""
+    try:
+        with open(_index_path(path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data["size"] != stat.st_size or data["mtime_ns"] != stat.st_mtime_ns:
+            return None
+        return data["header"], [tuple(entry) for entry in data["scenarios"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _wants_index(path: str, save_index: Optional[bool]) -> bool:
+    """save_index, or for None whether the file already has an index to keep current."""
+    return os.path.exists(_index_path(path)) if save_index is None else save_index
+
+
+def _save_index(path: str, stat: os.stat_result, header: Dict[str, Any], entries: List[IndexEntry]):
+    data = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "header": header, "scenarios": entries}
+    try:
+        with open(_index_path(path), "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+    except OSError:
+        pass  # The index only saves a rescan; a read-only directory is fine
+
+
+class ProjectReader:
+    """
+    Random access to the scenarios of a project file without loading it.
+
+    Opening finds the byte span of every scenario with a structural scan of the raw
+    bytes (brackets and quotes, see _structure_events); only the top-level fields are
+    decoded, and a scenario is decoded and validated when it is accessed, by id or by
+    iteration. With save_index the spans are saved to <file>.index.json and reused
+    while the file's size and modification time are unchanged, so later opens read
+    only the index; save_index=None refreshes an index the file already has.
+    """
+
+    def __init__(self, path, use_index: bool = True, save_index: Optional[bool] = None):
+        self.path = os.fspath(path)
+        self._file = open(self.path, "rb")
+        self._lock = threading.Lock()
+        try:
+            stat = os.fstat(self._file.fileno())
+            loaded = _load_index(self.path, stat) if use_index else None
+            if loaded is None:
+                loaded = _scan(self._file)
+                if _wants_index(self.path, save_index):
+                    _save_index(self.path, stat, *loaded)
+        except BaseException:
+            self._file.close()
+            raise
+        self.header, self._entries = loaded
+        self._positions: Dict[Optional[str], int] = {}
+        for i, (scenario_id, _, _) in enumerate(self._entries):
+            self._positions.setdefault(scenario_id, i)
+
+    def __enter__(self) -> "ProjectReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, scenario_id) -> bool:
+        return scenario_id in self._positions
+
+    def ids(self) -> List[Optional[str]]:
+        return [scenario_id for scenario_id, _, _ in self._entries]
+
+    def _read(self, start: int, end: int) -> bytes:
+        with self._lock:
+            self._file.seek(start)
+            return self._file.read(end - start)
+
+    def raw(self, scenario_id: str) -> bytes:
+        """The scenario's JSON exactly as stored. Raises KeyError for unknown ids."""
+        _, start, end = self._entries[self._positions[scenario_id]]
+        return self._read(start, end)
+
+    def get(self, scenario_id: str) -> Scenario:
+        return Scenario.model_validate_json(self.raw(scenario_id))
+
+    def __iter__(self) -> Iterator[Scenario]:
+        for _, start, end in self._entries:
+            yield Scenario.model_validate_json(self._read(start, end))
+
+    def to_project(self) -> Project:
+        return Project.model_validate({**self.header, "scenarios": list(self)})
+
+
+class ProjectWriter:
+    """
+    Write a project file one scenario at a time.
+
+    The file is written to <file>.tmp and moved into place on close, with the offset
+    index used by ProjectReader when save_index is set (None keeps an existing index
+    current); leaving the block with an exception discards the partial file.
+    """
+
+    def __init__(
+        self,
+        path,
+        name: str,
+        version: str = "1.0",
+        created: Optional[datetime] = None,
+        modified: Optional[datetime] = None,
+        save_index: Optional[bool] = None,
+    ):
+        self.path = os.fspath(path)
+        self.save_index = save_index
+        project = Project(name=name, version=version, created=created or datetime.now(), modified=modified or datetime.now())
+        self.header = project.model_dump(mode="json", exclude={"scenarios"})
+        self._entries: List[IndexEntry] = []
+        self._file = open(self.path + ".tmp", "wb")
+        self._offset = 0
+        self._put(json.dumps(self.header)[:-1].encode() + b', "scenarios": [\n')
+
+    def __enter__(self) -> "ProjectWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+            os.remove(self._file.name)
+
+    def _put(self, data: bytes):
+        self._file.write(data)
+        self._offset += len(data)
+
+    def write_raw(self, scenario_id: str, data: bytes):
+        """Append a scenario that is already serialized (e.g. ProjectReader.raw) without re-encoding it."""
+        if self._entries:
+            self._put(b",\n")
+        start = self._offset
+        self._put(data)
+        self._entries.append((scenario_id, start, self._offset))
+
+    def write(self, scenario: Scenario):
+        self.write_raw(scenario.id, scenario.model_dump_json().encode())
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._put(b"\n]}\n")
+        self._file.close()
+        os.replace(self._file.name, self.path)
+        if _wants_index(self.path, self.save_index):
+            _save_index(self.path, os.stat(self.path), self.header, self._entries)
+
+
+def update_project_file(path, scenarios: Iterable[Scenario]):
+    """
+    Replace scenarios with matching ids in a project file and append new ones; every
+    other scenario is copied over byte for byte without being decoded.
+    """
+    updates = {scenario.id: scenario for scenario in scenarios}
+    reader = ProjectReader(path)
+    try:
+        header = reader.header
+        writer = ProjectWriter(
+            path,
+            name=header.get("name", ""),
+            version=header.get("version", "1.0"),
+            created=header.get("created"),
+        )
+        with writer:
+            for scenario_id, start, end in reader._entries:
+                if scenario_id in updates:
+                    writer.write(updates.pop(scenario_id))
+                else:
+                    writer.write_raw(scenario_id, reader._read(start, end))
+            for scenario in updates.values():
+                writer.write(scenario)
+            # The original must be closed before it is replaced (Windows)
+            reader.close()
+    finally:
+        reader.close()
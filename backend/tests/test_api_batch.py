@@ -0,0 +1,93 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from hydro_agent.api.main import app
+from hydro_agent.api.ndjson import iter_json_records
+from hydro_agent.core.manning.channels import solve_normal_depth
+from hydro_agent.core.manning.schemas import ChannelInput
+
+client = TestClient(app)
+
+TRAPEZOID = {
+    "type": "trapezoidal",
+    "discharge": 10.0,
+    "bottom_width": 5.0,
+    "side_slope": 2.0,
+    "slope": 0.001,
+    "mannings_n": 0.013,
+    "units": "metric",
+}
+
+IRREGULAR = {
+    "type": "irregular",
+    "discharge": 100.0,
+    "station_elevation_points": [[0, 10], [20, 0], [30, 0], [50, 10]],
+    "slope": 0.001,
+    "mannings_n": 0.03,
+    "units": "metric",
+}
+
+
+def _lines(response):
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_solve_batch_json_array_with_row_errors():
+    flat = {**TRAPEZOID, "bottom_width": 0.0, "side_slope": 0.0}
+    records = [TRAPEZOID, {"type": "trapezoidal", "slope": -1}, IRREGULAR, {**TRAPEZOID, "discharge": None}, flat]
+    response = client.post("/api/manning/channels/solve-batch", json=records)
+    assert response.status_code == 200
+    lines = _lines(response)
+    assert [line["index"] for line in lines] == [0, 1, 2, 3, 4]
+
+    expected = solve_normal_depth(ChannelInput(**TRAPEZOID))
+    assert abs(lines[0]["result"]["depth"] - expected.depth) < 1e-6
+    assert isinstance(lines[1]["error"], list)
+    assert lines[2]["result"]["water_surface_elevation"] is not None
+    assert "Discharge Q is required" in lines[3]["error"]
+    # Rows the batch solver cannot solve fail as solve_normal_depth does
+    with pytest.raises(ValueError) as scalar:
+        solve_normal_depth(ChannelInput(**flat))
+    assert lines[4]["error"] == str(scalar.value)
+
+
+def test_solve_batch_ndjson_stream():
+    body = "\n".join([json.dumps(TRAPEZOID), "{not json", json.dumps({**TRAPEZOID, "discharge": 20.0})]) + "\n"
+    response = client.post(
+        "/api/manning/channels/solve-batch",
+        content=body,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    lines = _lines(response)
+    assert "result" in lines[0]
+    assert "Invalid JSON" in lines[1]["error"]
+    assert lines[2]["result"]["depth"] > lines[0]["result"]["depth"]
+
+
+def test_solve_batch_spans_multiple_chunks(monkeypatch):
+    monkeypatch.setattr("hydro_agent.api.main.BATCH_CHUNK_SIZE", 7)
+    records = [{**TRAPEZOID, "discharge": 1.0 + i} for i in range(25)]
+    lines = _lines(client.post("/api/manning/channels/solve-batch", json=records))
+    assert [line["index"] for line in lines] == list(range(25))
+    assert all("result" in line for line in lines)
+
+
+def test_record_reader_decodes_characters_split_across_chunks():
+    body = json.dumps([{**TRAPEZOID, "note": "m³"}, TRAPEZOID], ensure_ascii=False).encode("utf-8")
+    split = body.index("³".encode("utf-8")) + 1
+
+    async def chunks(data):
+        for part in data:
+            yield part
+
+    async def records(data, ndjson):
+        return [record async for record in iter_json_records(chunks(data), ndjson)]
+
+    assert asyncio.run(records([body[:split], body[split:]], False))[0]["note"] == "m³"
+    lines = b"\n".join(json.dumps(r, ensure_ascii=False).encode("utf-8") for r in json.loads(body))
+    line_split = lines.index("³".encode("utf-8")) + 1
+    assert [r.get("note") for r in asyncio.run(records([lines[:line_split], lines[line_split:]], True))] == ["m³", None]
+    assert "not valid UTF-8" in str(asyncio.run(records([body[:split]], False))[-1])
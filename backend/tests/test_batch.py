@@ -0,0 +1,67 @@
+import math
+
+import numpy as np
+import pytest
+
+from hydro_agent.core.manning.channels import solve_normal_depth, solve_normal_depth_batch
+from hydro_agent.core.manning.schemas import ChannelInput, ChannelType, Units
+
+
+def _scalar(channel_type, Q, b, zL, zR, S, n, units):
+    params = ChannelInput(
+        type=channel_type,
+        discharge=Q,
+        bottom_width=b,
+        left_side_slope=zL,
+        right_side_slope=zR,
+        slope=S,
+        mannings_n=n,
+        units=units,
+    )
+    return solve_normal_depth(params)
+
+
+@pytest.mark.parametrize("units", [Units.METRIC, Units.IMPERIAL])
+def test_batch_matches_scalar_solver(units):
+    rng = np.random.default_rng(42)
+    rows = 60
+    Q = rng.uniform(0.5, 500.0, rows)
+    b = rng.uniform(1.0, 40.0, rows)
+    zL = rng.uniform(0.0, 4.0, rows)
+    zR = rng.uniform(0.0, 4.0, rows)
+    S = rng.uniform(1e-4, 0.05, rows)
+    n = rng.uniform(0.011, 0.06, rows)
+    # Every third row rectangular, every sixth (offset by two) triangular
+    zL[::3] = zR[::3] = 0.0
+    b[2::6] = 0.0
+
+    batch = solve_normal_depth_batch(Q, b, zL, zR, S, n, units=units)
+    assert batch.converged.all()
+
+    for i in range(rows):
+        if zL[i] == 0 and zR[i] == 0:
+            channel_type = ChannelType.RECTANGULAR
+        elif b[i] == 0:
+            channel_type = ChannelType.TRIANGULAR
+        else:
+            channel_type = ChannelType.TRAPEZOIDAL
+        expected = _scalar(channel_type, Q[i], b[i], zL[i], zR[i], S[i], n[i], units)
+        assert math.isclose(batch.depth[i], expected.depth, rel_tol=1e-6)
+        assert math.isclose(batch.area[i], expected.area, rel_tol=1e-6)
+        assert math.isclose(batch.velocity[i], expected.velocity, rel_tol=1e-6)
+        assert math.isclose(batch.froude_number[i], expected.froude_number, rel_tol=1e-6)
+        assert math.isclose(batch.critical_depth[i], expected.critical_depth, rel_tol=1e-6)
+        assert math.isclose(batch.critical_slope[i], expected.critical_slope, rel_tol=1e-5)
+
+
+def test_batch_broadcasts_scalars():
+    batch = solve_normal_depth_batch([10.0, 20.0, 40.0], 5.0, 2.0, 2.0, 0.001, 0.013, units=Units.METRIC)
+    assert batch.depth.shape == (3,)
+    assert np.all(np.diff(batch.depth) > 0)
+
+
+def test_batch_flags_invalid_rows():
+    batch = solve_normal_depth_batch([10.0, -1.0, 10.0], [5.0, 5.0, 0.0], 0.0, 0.0, 0.001, 0.013)
+    assert batch.converged.tolist() == [True, False, False]
+    assert np.isfinite(batch.depth[0])
+    assert np.isnan(batch.depth[1:]).all()
@@ -0,0 +1,69 @@
+import json
+import time
+
+import numpy as np
+import pytest
+
+from benchmarks import run
+from benchmarks.run import BENCHMARKS, Measurement, compare, load_baseline, measure, save_baseline
+
+
+def _measurement(ops):
+    return Measurement(ops, 1 / ops, 1 / ops, 1 / ops, 1 / ops, 5)
+
+
+def test_measure_reports_throughput_and_percentiles():
+    calls = []
+    m = measure(lambda: calls.append(1), rows=10, min_time=0.01)
+    assert m.samples >= 5 and len(calls) > m.samples
+    assert m.p50 <= m.p95 <= m.p99
+    assert m.ops_per_sec * m.mean == pytest.approx(10)
+
+
+def test_compare_uses_the_most_specific_threshold():
+    baseline = {"threshold": 0.1, "benchmarks": {
+        "a": {"ops_per_sec": 100.0},
+        "b": {"ops_per_sec": 100.0, "threshold": 0.5},
+    }}
+    results = {"a": _measurement(85.0), "b": _measurement(60.0), "new": _measurement(1.0)}
+    by_name = {c.name: c for c in compare(results, baseline)}
+    assert set(by_name) == {"a", "b"}
+    assert by_name["a"].regressed and not by_name["b"].regressed
+    assert by_name["a"].ratio == 0.85
+    assert not any(c.regressed for c in compare(results, baseline, threshold=0.5))
+
+
+def test_save_baseline_keeps_thresholds_and_other_entries(tmp_path):
+    path = str(tmp_path / "baseline.json")
+    save_baseline({"a": _measurement(10.0), "b": _measurement(20.0)}, path)
+    data = load_baseline(path)
+    data["benchmarks"]["a"]["threshold"] = 0.6
+    tmp_path.joinpath("baseline.json").write_text(json.dumps(data))
+
+    save_baseline({"a": _measurement(30.0)}, path)
+    data = load_baseline(path)
+    assert data["benchmarks"]["a"]["ops_per_sec"] == 30.0 and data["benchmarks"]["a"]["threshold"] == 0.6
+    assert data["benchmarks"]["b"]["ops_per_sec"] == 20.0
+    assert load_baseline(str(tmp_path / "missing.json")) == {"benchmarks": {}}
+
+
+def test_baseline_covers_the_suite_and_workloads_run(monkeypatch):
+    assert set(load_baseline()["benchmarks"]) == {b.name for b in BENCHMARKS}
+    monkeypatch.setattr(run, "MIN_SAMPLE_TIME", 0.0)
+    results = run.run_benchmarks("channel.", min_time=0.0)
+    assert list(results) == ["channel.rectangular", "channel.trapezoidal", "channel.triangular", "channel.gutter"]
+    assert run.main(["-k", "spread.solve", "--min-time", "0", "--threshold", "0.99"]) == 0
+
+
+def test_latency_percentiles_are_single_calls(monkeypatch):
+    # One call in five sleeps; averaging batches of calls would hide it from p95
+    monkeypatch.setattr(run, "MIN_SAMPLE_TIME", 2e-5)
+    slow = iter(np.random.default_rng(0).random(100000) < 0.2)
+    next(slow)
+
+    def call():
+        if next(slow, False):
+            time.sleep(0.002)
+
+    m = measure(call, min_time=0.0, min_samples=60)
+    assert m.p95 >= 0.002 and m.p50 < 0.001
@@ -0,0 +1,124 @@
+import time
+
+import pytest
+
+from hydro_agent.core.cache import (
+    ResultCache,
+    channel_key,
+    curb_inlet_key,
+    solve_curb_inlet_on_grade_cached,
+    solve_normal_depth_cached,
+)
+from hydro_agent.core.curb_inlets.schemas import CurbInletOnGradeInput
+from hydro_agent.core.manning.channels import solve_normal_depth
+from hydro_agent.core.manning.schemas import ChannelInput, ChannelResult, ChannelType
+
+TRAPEZOID = dict(
+    type=ChannelType.TRAPEZOIDAL,
+    discharge=100.0,
+    bottom_width=10.0,
+    left_side_slope=2.0,
+    right_side_slope=2.0,
+    slope=0.001,
+    mannings_n=0.013,
+)
+
+CURB_INLET = dict(
+    discharge_cfs=10.0,
+    longitudinal_slope=0.005,
+    gutter_width_ft=2.0,
+    gutter_cross_slope=0.060,
+    road_cross_slope=0.020,
+    mannings_n=0.016,
+    curb_opening_length_ft=12.0,
+)
+
+
+def test_channel_key_is_canonical():
+    base = channel_key(ChannelInput(**TRAPEZOID))
+
+    # Deprecated side_slope is the same section as equal left/right slopes
+    legacy = dict(TRAPEZOID, left_side_slope=0.0, right_side_slope=0.0, side_slope=2.0)
+    assert channel_key(ChannelInput(**legacy)) == base
+
+    # Fields that do not apply to the channel type are ignored
+    assert channel_key(ChannelInput(**TRAPEZOID, gutter_width=2.0, known_wse=5.0)) == base
+    rect = dict(TRAPEZOID, type=ChannelType.RECTANGULAR)
+    assert channel_key(ChannelInput(**rect)) == channel_key(ChannelInput(**dict(rect, left_side_slope=3.0)))
+
+    # Anything that changes the answer changes the key
+    assert channel_key(ChannelInput(**dict(TRAPEZOID, discharge=101.0))) != base
+    assert channel_key(ChannelInput(**dict(TRAPEZOID, right_side_slope=3.0))) != base
+    assert channel_key(ChannelInput(**dict(TRAPEZOID, units="metric"))) != base
+
+
+def test_channel_key_sorts_station_points():
+    points = [(0.0, 10.0), (5.0, 0.0), (10.0, 10.0)]
+    a = ChannelInput(type=ChannelType.IRREGULAR, discharge=50.0, slope=0.001, mannings_n=0.03,
+                     station_elevation_points=points)
+    b = a.model_copy(update={"station_elevation_points": list(reversed(points))})
+    assert channel_key(a) == channel_key(b)
+
+
+def test_memory_hit_returns_same_result_with_fresh_timestamp():
+    cache = ResultCache(maxsize=8)
+    params = ChannelInput(**TRAPEZOID)
+    first = solve_normal_depth_cached(params, cache)
+    time.sleep(0.001)
+    second = solve_normal_depth_cached(params, cache)
+
+    assert second.model_dump(exclude={"timestamp"}) == first.model_dump(exclude={"timestamp"})
+    assert second.timestamp != first.timestamp
+    assert second.depth == pytest.approx(solve_normal_depth(params).depth)
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["size"] == 1
+
+
+def test_lru_eviction_is_size_bounded():
+    cache = ResultCache(maxsize=2)
+    for q in (10.0, 20.0, 30.0):
+        solve_normal_depth_cached(ChannelInput(**dict(TRAPEZOID, discharge=q)), cache)
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert stats["evictions"] == 1
+    # The oldest entry was evicted, the newest is still cached
+    assert cache.get(channel_key(ChannelInput(**dict(TRAPEZOID, discharge=10.0))), ChannelResult) is None
+    assert cache.get(channel_key(ChannelInput(**dict(TRAPEZOID, discharge=30.0))), ChannelResult) is not None
+
+
+def test_sqlite_tier_survives_a_new_process_cache(tmp_path):
+    db_path = str(tmp_path / "results.sqlite")
+    params = ChannelInput(**TRAPEZOID)
+    first = solve_normal_depth_cached(params, ResultCache(maxsize=8, db_path=db_path))
+
+    cache = ResultCache(maxsize=8, db_path=db_path)
+    second = solve_normal_depth_cached(params, cache)
+    assert second.depth == first.depth
+    assert cache.stats()["disk_hits"] == 1
+
+    # Promoted into memory: the next lookup does not go to disk
+    solve_normal_depth_cached(params, cache)
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.stats()["hits"] == 2
+
+
+def test_errors_are_not_cached():
+    cache = ResultCache(maxsize=8)
+    params = ChannelInput(type=ChannelType.IRREGULAR, discharge=50.0, slope=0.001, mannings_n=0.03)
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            solve_normal_depth_cached(params, cache)
+    assert cache.stats()["size"] == 0
+
+
+def test_curb_inlet_results_are_cached():
+    cache = ResultCache(maxsize=8)
+    params = CurbInletOnGradeInput(**CURB_INLET)
+    first = solve_curb_inlet_on_grade_cached(params, cache)
+    second = solve_curb_inlet_on_grade_cached(CurbInletOnGradeInput(**CURB_INLET), cache)
+    assert second.intercepted_flow_cfs == first.intercepted_flow_cfs
+    assert second.timestamp >= first.timestamp
+    assert cache.stats()["hits"] == 1
+    assert curb_inlet_key(params) != curb_inlet_key(CurbInletOnGradeInput(**dict(CURB_INLET, discharge_cfs=11.0)))
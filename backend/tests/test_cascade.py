@@ -0,0 +1,109 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from hydro_agent.api.main import app
+from hydro_agent.core.curb_inlets.cascade import cascade_levels, solve_curb_inlet_cascade
+from hydro_agent.core.curb_inlets.on_grade import solve_curb_inlet_on_grade, solve_curb_inlet_on_grade_batch
+from hydro_agent.core.curb_inlets.schemas import CascadeInlet, CurbInletCascadeInput, CurbInletOnGradeInput
+
+INLET = dict(
+    longitudinal_slope=0.005,
+    gutter_width_ft=2.0,
+    gutter_cross_slope=0.060,
+    road_cross_slope=0.020,
+    mannings_n=0.016,
+    curb_opening_length_ft=10.0,
+    local_depression_depth_in=1.0,
+)
+
+
+def test_batch_matches_scalar_solver():
+    discharge = np.array([0.5, 2.0, 6.5, 10.0, 25.0])
+    slope = np.array([0.005, 0.02, 0.005, 0.001, 0.04])
+    batch = solve_curb_inlet_on_grade_batch(
+        discharge, slope, 2.0, 0.06, 0.02, 0.016, np.array([5.0, 10.0, 12.0, 15.0, 20.0]), 0.6,
+    )
+    for i in range(discharge.size):
+        params = CurbInletOnGradeInput(
+            **dict(INLET, discharge_cfs=discharge[i], longitudinal_slope=slope[i],
+                   curb_opening_length_ft=[5.0, 10.0, 12.0, 15.0, 20.0][i], local_depression_depth_in=0.6)
+        )
+        expected = solve_curb_inlet_on_grade(params)
+        for name in ("efficiency_percent", "intercepted_flow_cfs", "bypass_flow_cfs", "spread_ft",
+                     "depth_ft", "flow_area_ft2", "velocity_fps", "equivalent_cross_slope"):
+            assert getattr(batch, name)[i] == pytest.approx(getattr(expected, name), rel=1e-9)
+
+
+def test_chain_carries_bypass_downstream():
+    inlets = [
+        CascadeInlet(id=f"I{k}", downstream_id=f"I{k + 1}" if k < 4 else None, local_inflow_cfs=3.0, **INLET)
+        for k in range(5)
+    ]
+    # Listed out of order: the solver must sort topologically
+    result = solve_curb_inlet_cascade(CurbInletCascadeInput(inlets=inlets[::-1]))
+    by_id = {inlet.id: inlet for inlet in result.inlets}
+
+    approach = 0.0
+    for k in range(5):
+        approach += 3.0
+        single = solve_curb_inlet_on_grade(CurbInletOnGradeInput(discharge_cfs=approach, **INLET))
+        inlet = by_id[f"I{k}"]
+        assert inlet.level == k
+        assert inlet.discharge_cfs == pytest.approx(approach)
+        assert inlet.intercepted_flow_cfs == pytest.approx(single.intercepted_flow_cfs, rel=1e-9)
+        assert inlet.spread_ft == pytest.approx(single.spread_ft, rel=1e-9)
+        approach = single.bypass_flow_cfs
+
+    assert result.total_inflow_cfs == pytest.approx(15.0)
+    assert result.total_intercepted_cfs + result.system_bypass_cfs == pytest.approx(15.0)
+    assert result.system_bypass_cfs == pytest.approx(by_id["I4"].bypass_flow_cfs)
+
+
+def test_tree_merges_branches_and_handles_dry_inlets():
+    inlets = [
+        CascadeInlet(id="a", downstream_id="c", local_inflow_cfs=4.0, **INLET),
+        CascadeInlet(id="b", downstream_id="c", local_inflow_cfs=6.0, **INLET),
+        CascadeInlet(id="dry", downstream_id="c", **INLET),
+        CascadeInlet(id="c", local_inflow_cfs=1.0, **INLET),
+    ]
+    result = solve_curb_inlet_cascade(CurbInletCascadeInput(inlets=inlets))
+    a, b, dry, c = result.inlets
+    assert dry.discharge_cfs == 0.0 and dry.spread_ft == 0.0 and dry.bypass_flow_cfs == 0.0
+    assert c.level == 1
+    assert c.discharge_cfs == pytest.approx(1.0 + a.bypass_flow_cfs + b.bypass_flow_cfs)
+
+
+def test_levels_and_layout_errors():
+    levels = cascade_levels(np.array([2, 2, 3, -1, 3]))
+    assert [sorted(level.tolist()) for level in levels] == [[0, 1, 4], [2], [3]]
+    with pytest.raises(ValueError):
+        cascade_levels(np.array([1, 0]))
+
+    with pytest.raises(ValueError):
+        solve_curb_inlet_cascade(CurbInletCascadeInput(inlets=[CascadeInlet(id="x", downstream_id="nowhere", **INLET)]))
+    with pytest.raises(ValueError):
+        solve_curb_inlet_cascade(CurbInletCascadeInput(inlets=[
+            CascadeInlet(id="x", **INLET), CascadeInlet(id="x", **INLET),
+        ]))
+
+
+def test_large_district_and_endpoint():
+    # 2000 inlets: 200 parallel streets of 10 inlets each
+    inlets = [
+        CascadeInlet(id=f"{s}-{k}", downstream_id=f"{s}-{k + 1}" if k < 9 else None, local_inflow_cfs=1.0 + s % 5, **INLET)
+        for s in range(200)
+        for k in range(10)
+    ]
+    result = solve_curb_inlet_cascade(CurbInletCascadeInput(inlets=inlets))
+    assert max(inlet.level for inlet in result.inlets) == 9
+    assert result.total_intercepted_cfs + result.system_bypass_cfs == pytest.approx(result.total_inflow_cfs)
+
+    client = TestClient(app)
+    body = {"inlets": [dict(INLET, id="a", downstream_id="b", local_inflow_cfs=5.0), dict(INLET, id="b", downstream_id="a")]}
+    response = client.post("/api/curb-inlets/on-grade/cascade", json=body)
+    assert response.status_code == 400
+    body["inlets"][1].pop("downstream_id")
+    response = client.post("/api/curb-inlets/on-grade/cascade", json=body)
+    assert response.status_code == 200
+    assert len(response.json()["inlets"]) == 2
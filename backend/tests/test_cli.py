@@ -0,0 +1,106 @@
+import io
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from hydro_agent.cli import OPERATIONS, handle_line, main, serve
+from hydro_agent.core.manning.channels import solve_normal_depth
+from hydro_agent.core.manning.schemas import ChannelInput
+
+BACKEND = Path(__file__).resolve().parents[1]
+CHANNEL = {"type": "trapezoidal", "discharge": 100, "bottom_width": 10, "side_slope": 2, "slope": 0.001, "mannings_n": 0.013}
+INLET = {
+    "discharge_cfs": 6.0, "longitudinal_slope": 0.01, "gutter_width_ft": 2.0, "gutter_cross_slope": 0.06,
+    "road_cross_slope": 0.02, "mannings_n": 0.016, "curb_opening_length_ft": 10.0,
+}
+
+
+def _run(argv, stdin=""):
+    out = io.StringIO()
+    code = main(argv, stdin=io.StringIO(stdin), stdout=out)
+    return code, out.getvalue()
+
+
+def test_single_shot_from_argument_and_stdin():
+    expected = solve_normal_depth(ChannelInput(**CHANNEL)).depth
+    code, out = _run(["manning.solve", json.dumps(CHANNEL)])
+    assert code == 0 and json.loads(out)["depth"] == expected
+    code, out = _run(["manning.solve"], stdin=json.dumps(CHANNEL))
+    assert code == 0 and json.loads(out)["depth"] == expected
+
+    code, out = _run(["manning.export", json.dumps(CHANNEL), "--format", "csv"])
+    assert code == 0 and json.loads(out)["content"].startswith("Category,Parameter")
+
+    code, out = _run(["manning.solve", '{"type": "rectangular"}'])
+    assert code == 1 and {e["loc"][0] for e in json.loads(out)["error"]} == {"slope", "mannings_n"}
+    code, out = _run(["manning.solve", "{not json"])
+    assert code == 1 and json.loads(out)["error"].startswith("Invalid JSON")
+
+    code, out = _run(["ops"])
+    assert out.split() == list(OPERATIONS)
+    with pytest.raises(SystemExit):
+        _run(["weirs.solve", "{}"])
+
+
+def test_single_shot_does_not_import_the_web_stack():
+    script = (
+        "import sys; from hydro_agent.cli import main; "
+        f"code = main(['manning.solve', {json.dumps(json.dumps(CHANNEL))}]); "
+        "print(sorted(m for m in sys.modules if m.split('.')[0] in ('fastapi', 'starlette', 'uvicorn')), code)"
+    )
+    out = subprocess.run([sys.executable, "-c", script], cwd=BACKEND, capture_output=True, text=True, check=True).stdout
+    assert out.splitlines()[-1] == "[] 0"
+
+
+def test_serve_answers_each_line_in_order():
+    requests = [
+        {"id": 1, "op": "manning.solve", "params": CHANNEL},
+        {"id": "inlet", "op": "curb_inlets.on_grade", "params": INLET},
+        {"id": 3, "op": "manning.solve", "params": {**CHANNEL, "slope": -1}},
+        {"id": 4, "op": "manning.solve_many", "params": [CHANNEL, {**CHANNEL, "type": "irregular"}]},
+        {"id": 5, "op": "weirs.solve", "params": {}},
+        {"id": 6, "op": "manning.export", "params": CHANNEL, "format": "pdf"},
+    ]
+    stdin = io.StringIO("\n".join(json.dumps(r) for r in requests) + "\n\nnot json\n[1]\n")
+    stdout = io.StringIO()
+    serve(stdin, stdout)
+    responses = [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+    assert [r["id"] for r in responses] == [1, "inlet", 3, 4, 5, 6, None, None]
+    assert responses[0]["result"]["depth"] == solve_normal_depth(ChannelInput(**CHANNEL)).depth
+    assert responses[1]["result"]["efficiency_percent"] > 0
+    assert responses[2]["error"][0]["loc"] == ["slope"]
+    assert "result" in responses[3]["result"][0] and "error" in responses[3]["result"][1]
+    assert responses[4]["error"].startswith("Unknown op") and responses[5]["error"].startswith("Invalid format")
+    assert responses[6]["error"].startswith("Invalid JSON") and responses[7]["error"] == "Request must be a JSON object"
+    assert handle_line("   ") is None
+
+
+def test_serve_logs_unexpected_errors(monkeypatch, capsys):
+    def broken(params):
+        raise RuntimeError("solver exploded")
+
+    monkeypatch.setitem(OPERATIONS, "manning.solve", broken)
+    response = json.loads(handle_line(json.dumps({"id": 7, "op": "manning.solve", "params": CHANNEL})))
+    assert response == {"id": 7, "error": "Internal error"}
+    err = capsys.readouterr().err
+    assert "request 7 failed" in err and "RuntimeError: solver exploded" in err and "Traceback" in err
+
+
+def test_module_entry_point_serves_over_pipes():
+    process = subprocess.Popen(
+        [sys.executable, "-m", "hydro_agent", "serve"], cwd=BACKEND, text=True,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+    )
+    try:
+        for i in range(3):
+            process.stdin.write(json.dumps({"id": i, "op": "manning.solve", "params": {**CHANNEL, "discharge": 50 + i}}) + "\n")
+            process.stdin.flush()
+            response = json.loads(process.stdout.readline())
+            assert response["id"] == i and response["result"]["discharge"] == 50 + i
+    finally:
+        process.stdin.close()
+        assert process.wait(timeout=10) == 0
@@ -0,0 +1,121 @@
+import math
+
+import numpy as np
+import pytest
+
+from hydro_agent.core.manning.channels import solve_normal_depth, solve_normal_depth_batch
+from hydro_agent.core.manning.critical import (
+    critical_depth,
+    critical_flow_batch,
+    critical_seed,
+    section_critical_depth,
+    section_critical_depths,
+)
+from hydro_agent.core.manning.htab import build_hydraulic_table
+from hydro_agent.core.manning.schemas import ChannelInput, ChannelType, Units
+from hydro_agent.core.manning.sections import PreparedSection
+
+G = 32.174
+
+# Main channel with wide, flat overbanks: A^3/T is not monotonic across the bank height
+COMPOUND = [(0.0, 10.0), (0.0, 4.0), (100.0, 4.0), (102.0, 0.0), (108.0, 0.0), (110.0, 4.0), (210.0, 4.0), (210.0, 10.0)]
+
+
+def _froude_one(geometry, Q, lo, hi):
+    """Reference critical depth by bisection on A^3/T - Q^2/g."""
+    for _ in range(200):
+        mid = 0.5 * (lo + hi)
+        A, _, T, _, _ = geometry(mid)
+        if A ** 3 / T < Q * Q / G:
+            lo = mid
+        else:
+            hi = mid
+    return 0.5 * (lo + hi)
+
+
+@pytest.mark.parametrize("Q,b,zL,zR", [(100.0, 10.0, 2.0, 2.0), (5.0, 20.0, 0.5, 3.0), (2000.0, 2.0, 1.5, 1.5), (0.5, 1.0, 4.0, 4.0)])
+def test_trapezoid_matches_bisection_from_straub_seed(Q, b, zL, zR):
+    z = zL + zR
+
+    def geometry(y):
+        return b * y + 0.5 * z * y * y, 0.0, b + z * y, 0.0, z
+
+    expected = _froude_one(geometry, Q, 0.0, 100.0)
+    root = critical_depth(Q, b, zL, zR, G)
+    assert root.converged
+    assert root.root == pytest.approx(expected, rel=1e-9)
+    assert root.iterations <= 4
+
+    seed, upper = critical_seed(Q, b, zL, zR, G)
+    assert 0 < seed <= upper
+    assert expected <= upper
+
+
+def test_rectangular_and_triangular_are_closed_form():
+    rect = critical_depth(100.0, 10.0, 0.0, 0.0, G)
+    assert rect.iterations == 0
+    assert rect.root == pytest.approx((100.0 ** 2 / (G * 100.0)) ** (1 / 3))
+
+    tri = critical_depth(10.0, 0.0, 1.0, 3.0, G)
+    assert tri.iterations == 0
+    A = 0.5 * 4.0 * tri.root ** 2
+    assert A ** 3 / (4.0 * tri.root) == pytest.approx(100.0 / G)
+
+    assert critical_depth(0.0, 10.0, 2.0, 2.0, G).root == 0.0
+    with pytest.raises(ValueError):
+        critical_depth(10.0, 0.0, 0.0, 0.0, G)
+
+
+def test_batch_matches_scalar_with_critical_slope():
+    Q = np.array([100.0, 10.0, 50.0, 0.0, 30.0, -1.0])
+    b = np.array([10.0, 0.0, 5.0, 5.0, 8.0, 5.0])
+    zL = np.array([2.0, 1.0, 0.0, 2.0, 1.0, 2.0])
+    zR = np.array([2.0, 3.0, 0.0, 2.0, 0.5, 2.0])
+    batch = critical_flow_batch(Q, b, zL, zR, 0.013, units=Units.IMPERIAL)
+
+    for i in range(4):
+        assert batch.depth[i] == pytest.approx(critical_depth(Q[i], b[i], zL[i], zR[i], G).root, rel=1e-12)
+    assert batch.depth[3] == 0.0 and batch.slope[3] == 0.0
+    assert math.isnan(batch.depth[5]) and not batch.converged[5]
+    assert batch.converged[:5].all()
+
+    params = ChannelInput(type=ChannelType.TRAPEZOIDAL, discharge=30.0, bottom_width=8.0,
+                          left_side_slope=1.0, right_side_slope=0.5, slope=0.001, mannings_n=0.013)
+    single = solve_normal_depth(params)
+    assert batch.depth[4] == pytest.approx(single.critical_depth, rel=1e-9)
+    assert batch.slope[4] == pytest.approx(single.critical_slope, rel=1e-9)
+
+
+def test_normal_depth_batch_uses_same_critical_flow():
+    batch = solve_normal_depth_batch([100.0, 50.0], [10.0, 0.0], [2.0, 1.5], [2.0, 1.5], 0.001, 0.013)
+    critical = critical_flow_batch([100.0, 50.0], [10.0, 0.0], [2.0, 1.5], [2.0, 1.5], 0.013)
+    assert np.allclose(batch.critical_depth, critical.depth)
+    assert np.allclose(batch.critical_slope, critical.slope)
+
+
+@pytest.mark.parametrize("Q", [1.0, 50.0, 400.0, 3000.0, 50000.0])
+def test_irregular_bracket_finds_lowest_critical_depth(Q):
+    section = PreparedSection(COMPOUND)
+    root = section_critical_depth(section, Q, G)
+    assert root.converged
+
+    # Lowest crossing: scan upwards on a fine grid, then bisect the first sign change
+    grid = np.linspace(1e-6, 30.0, 30001)
+    A, _, T, _, _ = section.geometry_array(grid)
+    first = np.flatnonzero(A ** 3 / T >= Q * Q / G)[0]
+    expected = _froude_one(section.geometry, Q, grid[first - 1], grid[first])
+    assert root.root == pytest.approx(expected, rel=1e-8)
+
+
+def test_irregular_vectorized_matches_scalar_and_table():
+    section = PreparedSection(COMPOUND)
+    Q = np.array([0.0, 1.0, 50.0, 400.0, 3000.0, 50000.0, 1e7])
+    batch = section_critical_depths(section, Q, G)
+    assert batch.converged.all()
+    assert batch.root[0] == 0.0
+    for q, yc in zip(Q[1:], batch.root[1:]):
+        assert yc == pytest.approx(section_critical_depth(section, q, G).root, rel=1e-9)
+
+    table = build_hydraulic_table(section, increments=5)
+    from_table = section_critical_depths(table, Q, G)
+    assert np.allclose(from_table.root, batch.root, rtol=1e-9)
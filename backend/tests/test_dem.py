@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+from hydro_agent.core.manning.channels import solve_normal_depth
+from hydro_agent.core.manning.schemas import ChannelInput, ChannelType
+from hydro_agent.gis.dem import DemRaster, cut_sections, open_dem, sample_cut_lines
+from hydro_agent.gis.schemas import CutLine
+
+CELL = 2.0
+X_MIN, Y_MAX = 1000.0, 3000.0
+
+
+def _centers(rows, cols):
+    x = X_MIN + (np.arange(cols) + 0.5) * CELL
+    y = Y_MAX - (np.arange(rows) + 0.5) * CELL
+    return np.meshgrid(x, y)
+
+
+def _valley(rows=200, cols=300):
+    """A V-shaped valley running north-south, 1V:4H banks, thalweg at a cell center x = 1201."""
+    x, y = _centers(rows, cols)
+    return 50.0 + np.abs(x - 1201.0) / 4.0 + 0.0 * y
+
+
+def test_npy_is_memory_mapped_and_bilinear_is_exact_on_planes(tmp_path):
+    x, y = _centers(120, 150)
+    path = tmp_path / "plane.npy"
+    np.save(path, 10.0 + 0.01 * x - 0.02 * y)
+    dem = open_dem(str(path), x_min=X_MIN, y_max=Y_MAX, cell_size=CELL)
+    assert isinstance(dem.data, np.memmap)
+    assert dem.extent == (1000.0, 2760.0, 1300.0, 3000.0)
+
+    rng = np.random.default_rng(0)
+    px, py = rng.uniform(1001, 1299, 1000), rng.uniform(2761, 2999, 1000)
+    assert dem.sample(px, py) == pytest.approx(10.0 + 0.01 * px - 0.02 * py, rel=1e-12)
+    assert np.isnan(dem.sample([999.0, 1100.0, 1301.0], [2900.0, 3001.0, 2900.0])).all()
+
+
+def test_cut_lines_are_sampled_along_polylines():
+    dem = DemRaster(_valley(), x_min=X_MIN, y_max=Y_MAX, cell_size=CELL)
+    lines = [
+        [(1101.0, 2900.0), (1301.0 - 2.0, 2900.0)],
+        [(1101.0, 2800.0), (1201.0, 2800.0), (1201.0, 2830.0)],
+    ]
+    samples = sample_cut_lines(dem, lines, spacing=[5.0, None])
+    assert samples.offsets.tolist() == [0, 41, 107]
+    first = slice(0, 41)
+    assert samples.station[first] == pytest.approx(np.linspace(0.0, 198.0, 41))
+    assert samples.elevation[first] == pytest.approx(50.0 + np.abs(samples.x[first] - 1201.0) / 4.0)
+
+    # The bent line: 100 along x then 30 north, in 65 steps of 130/65 = 2
+    second = slice(41, 107)
+    assert samples.station[second][-1] == pytest.approx(130.0)
+    assert samples.x[second][50] == pytest.approx(1201.0) and samples.y[second][-1] == pytest.approx(2830.0)
+    assert samples.y[second][:50] == pytest.approx(2800.0)
+
+
+def test_cut_sections_solve_like_the_equivalent_triangle(tmp_path):
+    stem = tmp_path / "valley"
+    data = _valley().astype(">f4")
+    data[10, 20] = -9999.0
+    data.tofile(str(stem) + ".flt")
+    (tmp_path / "valley.hdr").write_text(
+        "ncols 300\nnrows 200\nxllcorner 1000\nyllcorner 2600\ncellsize 2\nNODATA_value -9999\nbyteorder MSBFIRST\n"
+    )
+    dem = open_dem(str(stem) + ".hdr")
+    assert dem.y_max == Y_MAX and dem.nodata == -9999.0
+
+    lines = [
+        CutLine(name="XS 1", points=[(1101.0, 2900.0), (1301.0, 2900.0)]),
+        CutLine(points=[(1101.0, 2850.0), (1301.0, 2850.0)], channel={"discharge": 50.0}),
+        CutLine(name="off grid", points=[(900.0, 2900.0), (1100.0, 2900.0)]),
+        CutLine(name="nodata", points=[(1030.0, 2979.0), (1060.0, 2979.0)]),
+        CutLine(name="dot", points=[(1200.0, 2900.0), (1200.0, 2900.0)]),
+        CutLine(points=[(1101.0, 2800.0), (1301.0, 2800.0)], channel={"mannings_n": -1}),
+    ]
+    sections = cut_sections(dem, lines, discharge=120.0, slope=0.002, mannings_n=0.03)
+    first, second = sections[:2]
+    assert first.type == ChannelType.IRREGULAR and first.discharge == 120.0 and second.discharge == 50.0
+    assert "outside the DEM" in str(sections[2]) and "nodata" in str(sections[3])
+    assert "zero length" in str(sections[4]) and isinstance(sections[5], ValueError)
+
+    triangle = solve_normal_depth(ChannelInput(
+        type="triangular", discharge=120.0, left_side_slope=4.0, right_side_slope=4.0, slope=0.002, mannings_n=0.03,
+    ))
+    result = solve_normal_depth(first)
+    assert result.min_elevation == pytest.approx(50.0)
+    assert result.depth == pytest.approx(triangle.depth, rel=1e-9)
+    assert result.critical_depth == pytest.approx(triangle.critical_depth, rel=1e-6)
+
+
+def test_unsupported_rasters_are_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        open_dem(str(tmp_path / "dem.tif"))
+    with pytest.raises(ValueError):
+        DemRaster(np.zeros((1, 10)))
+    with pytest.raises(ValueError):
+        sample_cut_lines(DemRaster(np.zeros((4, 4))), [[(0.0, 0.0)]])
@@ -0,0 +1,135 @@
+import itertools
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from hydro_agent.api import main
+from hydro_agent.api.main import app
+from hydro_agent.core.manning import design
+from hydro_agent.core.manning.channels import solve_normal_depth
+from hydro_agent.core.manning.design import design_channel, pareto_front
+from hydro_agent.core.manning.schemas import (
+    ChannelDesignInput,
+    ChannelInput,
+    ChannelType,
+    DesignConstraints,
+    DesignObjective,
+    DesignRange,
+)
+
+# Sample project trapezoidal_channel_design.json: 2000 cfs, depth < 5 ft, velocity < 15 fps
+SAMPLE = dict(
+    discharge=2000.0,
+    bottom_width=DesignRange(min=20.0, max=50.0, count=7),
+    left_side_slope=DesignRange(values=[1.5, 2.0, 3.0]),
+    mannings_n=0.013,
+    slope=DesignRange(values=[0.001, 0.002]),
+    constraints=DesignConstraints(max_depth=5.0, max_velocity=15.0, freeboard=1.0),
+    workers=1,
+)
+
+
+def _brute_front(points):
+    points = np.asarray(points)
+    keep = []
+    for i, p in enumerate(points):
+        dominated = any(
+            np.all(q <= p) and (np.any(q < p) or j < i) for j, q in enumerate(points) if j != i
+        )
+        if not dominated:
+            keep.append(i)
+    return sorted(keep)
+
+
+@pytest.mark.parametrize("k", [2, 3])
+def test_pareto_front_matches_brute_force(k):
+    rng = np.random.default_rng(7)
+    points = np.round(rng.random((700, k)), 2)
+    assert sorted(pareto_front(points)) == _brute_front(points)
+    assert pareto_front(np.empty((0, k))).size == 0
+
+
+def test_sweep_matches_scalar_solves():
+    result = design_channel(ChannelDesignInput(**SAMPLE))
+    assert result.evaluated == 7 * 3 * 2
+
+    feasible = []
+    for b, z, S in itertools.product(np.linspace(20.0, 50.0, 7), [1.5, 2.0, 3.0], [0.001, 0.002]):
+        solved = solve_normal_depth(ChannelInput(
+            type=ChannelType.TRAPEZOIDAL, discharge=2000.0, bottom_width=b,
+            left_side_slope=z, right_side_slope=z, slope=S, mannings_n=0.013,
+        ))
+        if solved.depth <= 5.0 and solved.velocity <= 15.0:
+            y = solved.depth + 1.0
+            feasible.append((b * y + z * y * y, b, z, S, solved.depth))
+    assert result.feasible == len(feasible)
+
+    cost, b, z, S, depth = min(feasible)
+    best = result.best
+    assert (best.bottom_width, best.left_side_slope, best.right_side_slope, best.slope) == pytest.approx((b, z, z, S))
+    assert best.cost == pytest.approx(cost, rel=1e-9)
+    assert best.depth == pytest.approx(depth, rel=1e-9)
+    assert best.channel_depth == pytest.approx(depth + 1.0)
+
+    # Cost/velocity front: increasing cost buys strictly lower velocity
+    costs = [c.cost for c in result.pareto_front]
+    velocities = [c.velocity for c in result.pareto_front]
+    assert result.pareto_front[0].cost == pytest.approx(best.cost)
+    assert costs == sorted(costs)
+    assert all(a > b for a, b in zip(velocities, velocities[1:]))
+
+
+def test_parallel_sweep_matches_serial(monkeypatch):
+    params = ChannelDesignInput(**{
+        **SAMPLE,
+        "bottom_width": DesignRange(min=10.0, max=60.0, count=40),
+        "right_side_slope": DesignRange(min=0.0, max=4.0, count=9),
+        "mannings_n": DesignRange(values=[0.013, 0.025]),
+        "objectives": [DesignObjective.COST, DesignObjective.DEPTH, DesignObjective.TOP_WIDTH],
+    })
+    serial = design_channel(params)
+    monkeypatch.setattr(design, "DESIGN_CHUNK_SIZE", 300)
+    monkeypatch.setattr(design, "PARALLEL_THRESHOLD", 1)
+    parallel = design_channel(params.model_copy(update={"workers": 2}))
+
+    assert parallel.evaluated == serial.evaluated == 40 * 3 * 9 * 2 * 2
+    assert parallel.feasible == serial.feasible
+    assert parallel.best == serial.best
+    assert parallel.pareto_front == serial.pareto_front
+
+
+def test_infeasible_sweep_and_invalid_ranges():
+    result = design_channel(ChannelDesignInput(**{**SAMPLE, "constraints": DesignConstraints(max_depth=0.5)}))
+    assert result.feasible == 0 and result.best is None and result.pareto_front == []
+
+    with pytest.raises(ValueError):
+        design_channel(ChannelDesignInput(**{**SAMPLE, "bottom_width": DesignRange(min=10.0, max=5.0, count=3)}))
+    with pytest.raises(ValueError):
+        design_channel(ChannelDesignInput(**{**SAMPLE, "slope": DesignRange(count=3)}))
+
+
+def test_design_endpoint():
+    client = TestClient(app)
+    body = ChannelDesignInput(**SAMPLE).model_dump(mode="json")
+    response = client.post("/api/manning/channels/design", json=body)
+    assert response.status_code == 200
+    assert response.json()["best"]["depth"] <= 5.0
+
+    body["bottom_width"] = {"min": 10.0, "max": 5.0, "count": 3}
+    assert client.post("/api/manning/channels/design", json=body).status_code == 400
+
+
+def test_design_endpoint_limits_sweeps(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("API sweeps must not start a process pool")
+
+    monkeypatch.setattr(design, "ProcessPoolExecutor", no_pool)
+    monkeypatch.setattr(design, "PARALLEL_THRESHOLD", 1)
+    client = TestClient(app)
+    body = ChannelDesignInput(**{**SAMPLE, "workers": 8}).model_dump(mode="json")
+    assert client.post("/api/manning/channels/design", json=body).status_code == 200
+
+    monkeypatch.setattr(main, "DESIGN_MAX_CANDIDATES", 41)
+    response = client.post("/api/manning/channels/design", json=body)
+    assert response.status_code == 400 and "limit is 41" in response.json()["detail"]
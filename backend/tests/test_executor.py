@@ -0,0 +1,137 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from hydro_agent.api import main
+from hydro_agent.api.executor import ExecutorBusy, SolveExecutor, SolveTimeout
+from hydro_agent.core.manning.channels import solve_normal_depth
+from hydro_agent.core.manning.schemas import ChannelInput, ChannelType
+
+PARAMS = ChannelInput(type=ChannelType.TRAPEZOIDAL, discharge=75.0, bottom_width=6, side_slope=2, slope=0.001, mannings_n=0.013)
+RATING = {"channel": {"type": "rectangular", "bottom_width": 4, "slope": 0.005, "mannings_n": 0.013}, "max_depth": 3.0}
+
+
+def test_queue_limit_sheds_load():
+    async def scenario():
+        executor = SolveExecutor("thread", workers=1, max_queue=1, timeout=5)
+        release = threading.Event()
+        running = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        assert executor.in_flight == 2 and executor.queued() == 1
+        with pytest.raises(ExecutorBusy):
+            await executor.run(release.wait)
+        admitted = asyncio.ensure_future(executor.run(lambda: "late", wait=True))
+        release.set()
+        assert await asyncio.gather(*running) == [True, True] and await admitted == "late"
+        assert executor.in_flight == 0 and executor.rejected == 1
+        executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_timeout_keeps_the_slot_until_the_call_returns():
+    async def scenario():
+        executor = SolveExecutor("thread", workers=1, max_queue=0, timeout=0.05)
+        with pytest.raises(SolveTimeout):
+            await executor.run(time.sleep, 0.3)
+        assert executor.in_flight == 1 and executor.timeouts == 1
+        with pytest.raises(ExecutorBusy):
+            await executor.run(time.sleep, 0)
+        await asyncio.sleep(0.4)
+        assert executor.in_flight == 0
+        with pytest.raises(ValueError):
+            await executor.run(solve_normal_depth, ChannelInput(type=ChannelType.RECTANGULAR, discharge=1, slope=0.01, mannings_n=0.013))
+        executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("kind", ["thread", "process", "inline"])
+def test_kinds_return_solver_results(kind):
+    executor = SolveExecutor(kind, workers=1)
+    result = asyncio.run(executor.run(solve_normal_depth, PARAMS))
+    assert result.depth == pytest.approx(solve_normal_depth(PARAMS).depth, rel=1e-12)
+    executor.shutdown()
+    with pytest.raises(ValueError):
+        SolveExecutor("fiber")
+
+
+def test_slow_solve_does_not_block_other_requests(monkeypatch):
+    executor = SolveExecutor("thread", workers=1, max_queue=0, timeout=0.6)
+    monkeypatch.setattr(main, "default_executor", executor)
+    real = main.rating_curve
+    delays = iter([0.4, 1.0])
+
+    def slow_rating_curve(params):
+        time.sleep(next(delays))
+        return real(params)
+
+    monkeypatch.setattr(main, "rating_curve", slow_rating_curve)
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            slow = asyncio.ensure_future(client.post("/api/manning/channels/rating-curve", json=RATING))
+            await asyncio.sleep(0.05)
+            start = time.perf_counter()
+            health = await client.get("/api/health")
+            health_latency = time.perf_counter() - start
+            busy = await client.post("/api/manning/channels/rating-curve", json=RATING)
+            first = await slow
+            timed_out = await client.post("/api/manning/channels/rating-curve", json=RATING)
+            return health, health_latency, busy, first, timed_out
+
+    health, health_latency, busy, first, timed_out = asyncio.run(scenario())
+    assert health.status_code == 200 and health_latency < 0.2
+    assert busy.status_code == 503 and busy.headers["retry-after"] == "1"
+    assert first.status_code == 200 and first.json()["discharge"]
+    assert timed_out.status_code == 504
+    executor.shutdown(wait=True)
+
+
+def test_batch_requests_are_refused_when_the_queue_is_full(monkeypatch):
+    executor = SolveExecutor("thread", workers=1, max_queue=0, timeout=5)
+    monkeypatch.setattr(main, "default_executor", executor)
+    monkeypatch.setattr(main, "BATCH_CHUNK_SIZE", 2)
+    rows = [PARAMS.model_dump(mode="json")] * 5
+
+    async def scenario():
+        release = threading.Event()
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            blocker = asyncio.ensure_future(executor.run(release.wait))
+            await asyncio.sleep(0.05)
+            busy = await client.post("/api/manning/channels/solve-batch", json=rows)
+            busy_export = await client.post("/api/manning/channels/export-batch", json=rows)
+            release.set()
+            await blocker
+            ok = await client.post("/api/manning/channels/solve-batch", json=rows)
+            return busy, busy_export, ok
+
+    busy, busy_export, ok = asyncio.run(scenario())
+    assert busy.status_code == 503 and busy.headers["retry-after"] == "1"
+    assert busy_export.status_code == 503 and executor.rejected == 2
+    # Later chunks of an admitted request queue behind the first instead of being refused
+    assert ok.status_code == 200 and len(ok.text.splitlines()) == 5
+    executor.shutdown(wait=True)
+
+
+
+def test_unexpected_solver_errors_are_logged(monkeypatch, caplog):
+    def broken(params):
+        raise RuntimeError("solver exploded")
+
+    monkeypatch.setattr(main, "default_executor", SolveExecutor("inline"))
+    monkeypatch.setattr(main, "solve_normal_depth_many", broken)
+    with caplog.at_level("ERROR", logger=main.logger.name):
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(main.run_solver(broken, PARAMS))
+        response = TestClient(main.app).post("/api/manning/channels/solve-batch", json=[PARAMS.model_dump(mode="json")])
+    assert error.value.status_code == 500
+    assert response.status_code == 200 and "Internal server error" in response.text
+    assert caplog.text.count("RuntimeError: solver exploded") == 2
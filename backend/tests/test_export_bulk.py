@@ -0,0 +1,117 @@
+import csv
+import io
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from hydro_agent.api.main import app
+from hydro_agent.core.manning.channels import solve_normal_depth, solve_normal_depth_batch
+from hydro_agent.core.manning.schemas import ChannelInput, ChannelType
+from hydro_agent.export import formatters
+from hydro_agent.export.formatters import (
+    BULK_COLUMNS,
+    TableFormatter,
+    iter_export,
+    iter_export_columns,
+    write_export,
+)
+from hydro_agent.projects.models import Scenario
+from hydro_agent.projects.results_store import ResultsStore, write_results_store
+
+
+def _pairs(n):
+    pairs = []
+    for i in range(n):
+        params = ChannelInput(
+            type=ChannelType.TRAPEZOIDAL, discharge=50.0 + 10 * i, bottom_width=10, side_slope=2,
+            slope=0.001, mannings_n=0.013,
+        )
+        pairs.append((params, solve_normal_depth(params)))
+    return pairs
+
+
+@pytest.mark.parametrize("chunk", [1, 3, 10000])
+def test_csv_rows_match_results(monkeypatch, chunk):
+    monkeypatch.setattr(formatters, "EXPORT_CHUNK_SIZE", chunk)
+    pairs = _pairs(7)
+    pairs.append((pairs[0][0], ValueError("Depth did not\nconverge")))
+    chunks = list(iter_export(iter(pairs)))
+    assert len(chunks) == 1 + -(-8 // chunk)
+
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+    assert rows[0] == list(BULK_COLUMNS) and len(rows) == 9
+    for row, (params, result) in zip(rows[1:8], pairs):
+        record = dict(zip(BULK_COLUMNS, row))
+        assert float(record["depth"]) == result.depth
+        assert float(record["velocity"]) == result.velocity
+        assert record["left_side_slope"] == "2.0" and record["type"] == "trapezoidal"
+        assert record["error"] == ""
+    assert rows[8][-1] == "Depth did not converge" and rows[8][BULK_COLUMNS.index("depth")] == ""
+
+
+def test_markdown_and_text_tables():
+    pairs = _pairs(2) + [(None, ValueError("bad | row"))]
+    markdown = "".join(iter_export(pairs, "markdown")).splitlines()
+    assert markdown[0] == "|" + "|".join(BULK_COLUMNS) + "|"
+    assert markdown[1] == "|" + "|".join(["---"] * len(BULK_COLUMNS)) + "|"
+    assert len(markdown) == 5
+    assert markdown[4].startswith("||||") and markdown[4].endswith("|bad \\| row|")
+
+    text = "".join(iter_export(pairs, "text")).splitlines()
+    assert text[0].split("\t") == list(BULK_COLUMNS)
+    assert all(len(line.split("\t")) == len(BULK_COLUMNS) for line in text)
+
+    with pytest.raises(ValueError):
+        TableFormatter(BULK_COLUMNS, "xlsx")
+
+
+def test_export_columns_from_batch_and_results_store(monkeypatch, tmp_path):
+    monkeypatch.setattr(formatters, "EXPORT_CHUNK_SIZE", 4)
+    discharge = np.linspace(10, 100, 10)
+    batch = solve_normal_depth_batch(discharge, 10, 2, 2, 0.001, 0.013)
+    rows = list(csv.reader(io.StringIO("".join(iter_export_columns(batch, fields=["depth", "velocity"])))))
+    assert rows[0] == ["depth", "velocity"]
+    assert [float(r[0]) for r in rows[1:]] == batch.depth.tolist()
+
+    scenarios = [
+        Scenario(id=f"s{i}", title="s", inputs={}, results={"depth": float(i), "velocity": 2.0 * i})
+        for i in range(9)
+    ]
+    write_results_store(tmp_path / "p.results", scenarios)
+    store = ResultsStore(tmp_path / "p.results")
+    path = tmp_path / "out.txt"
+    written = write_export(iter_export_columns(store.frame(["depth", "velocity"]), "text"), path)
+    lines = path.read_text().splitlines()
+    assert written == len(path.read_text()) and len(lines) == 10
+    assert lines[3] == "2.0\t4.0"
+
+    with pytest.raises(ValueError):
+        list(iter_export_columns({"a": np.zeros(3), "b": np.zeros(4)}))
+
+
+def test_export_batch_endpoint():
+    client = TestClient(app)
+    rows = [
+        {"type": "rectangular", "discharge": 20.0, "bottom_width": 4, "slope": 0.002, "mannings_n": 0.015},
+        {"type": "rectangular", "discharge": 20.0, "slope": 0.002},
+        {"type": "trapezoidal", "discharge": 80.0, "bottom_width": 6, "side_slope": 3, "slope": 0.001, "mannings_n": 0.03},
+    ]
+    response = client.post("/api/manning/channels/export-batch", json=rows)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    table = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(table) == 3
+    expected = solve_normal_depth(ChannelInput.model_validate(rows[2]))
+    assert float(table[2]["depth"]) == pytest.approx(expected.depth)
+    assert table[0]["error"] == "" and table[1]["error"] and table[1]["depth"] == ""
+
+    ndjson = "\n".join(json.dumps(r) for r in rows)
+    response = client.post(
+        "/api/manning/channels/export-batch?format=markdown", content=ndjson,
+        headers={"content-type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200 and len(response.text.splitlines()) == 5
+
+    assert client.post("/api/manning/channels/export-batch?format=pdf", json=rows).status_code == 400
@@ -0,0 +1,154 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from hydro_agent.api.main import app
+from hydro_agent.core.manning.channels import solve_normal_depth
+from hydro_agent.core.manning.gvf import direct_step_profile, standard_step_profile
+from hydro_agent.core.manning.schemas import (
+    BoundaryType,
+    ChannelInput,
+    ChannelType,
+    DirectStepInput,
+    ProfileBoundary,
+    ProfileRegime,
+    ProfileSection,
+    StandardStepInput,
+)
+
+MILD = ChannelInput(
+    type=ChannelType.TRAPEZOIDAL, bottom_width=10.0, left_side_slope=2.0, right_side_slope=2.0,
+    slope=0.001, mannings_n=0.013,
+)
+STEEP = ChannelInput(type=ChannelType.RECTANGULAR, bottom_width=10.0, slope=0.02, mannings_n=0.013)
+VALLEY = [(0, 20), (20, 10), (40, 2), (45, 0), (55, 0), (60, 2), (80, 10), (100, 20)]
+
+
+def _reach(channel, count, spacing):
+    """Prismatic reach, upstream first, with the invert falling at the channel slope."""
+    return [
+        ProfileSection(channel=channel, reach_length=spacing, invert_elevation=channel.slope * spacing * (count - 1 - k))
+        for k in range(count)
+    ]
+
+
+def _normal(channel, Q):
+    return solve_normal_depth(channel.model_copy(update={"discharge": Q}))
+
+
+def test_normal_depth_boundary_stays_uniform():
+    result = standard_step_profile(StandardStepInput(
+        sections=_reach(MILD, 11, 100.0), discharges=[50.0, 100.0, 400.0],
+    ))
+    assert result.method == "standard_step"
+    for profile in result.profiles:
+        yn = _normal(MILD, profile.discharge).depth
+        assert np.allclose(profile.depth, yn, rtol=1e-9)
+        assert profile.station[0] == 1000.0 and profile.station[-1] == 0.0
+        assert not any(profile.critical_assumed)
+
+
+def test_standard_step_matches_direct_step_m1_backwater():
+    boundary = ProfileBoundary(type=BoundaryType.KNOWN_DEPTH, values=[5.0])
+    standard = standard_step_profile(StandardStepInput(
+        sections=_reach(MILD, 41, 50.0), discharges=[100.0], boundary=boundary,
+        contraction_coefficient=0.0, expansion_coefficient=0.0,
+    )).profiles[0]
+    direct = direct_step_profile(DirectStepInput(
+        channel=MILD, discharges=[100.0], length=2000.0, boundary=boundary,
+    )).profiles[0]
+
+    assert direct.station[0] == 0.0 and direct.station[-1] == 2000.0
+    yn = _normal(MILD, 100.0).depth
+    # M1: depth falls towards normal depth going upstream
+    assert all(a > b > yn for a, b in zip(direct.depth, direct.depth[1:]))
+    for station, depth in zip(standard.station[::5], standard.depth[::5]):
+        assert np.interp(station, direct.station, direct.depth) == pytest.approx(depth, rel=1e-3)
+
+
+def test_supercritical_profile_from_critical_depth():
+    boundary = ProfileBoundary(type=BoundaryType.CRITICAL_DEPTH)
+    standard = standard_step_profile(StandardStepInput(
+        sections=_reach(STEEP, 31, 20.0), discharges=[200.0], regime=ProfileRegime.SUPERCRITICAL,
+        boundary=boundary, contraction_coefficient=0.0, expansion_coefficient=0.0,
+    )).profiles[0]
+    direct = direct_step_profile(DirectStepInput(
+        channel=STEEP, discharges=[200.0], length=600.0, regime=ProfileRegime.SUPERCRITICAL, boundary=boundary,
+    )).profiles[0]
+
+    normal = _normal(STEEP, 200.0)
+    assert standard.depth[0] == pytest.approx(normal.critical_depth)
+    assert standard.depth[-1] == pytest.approx(normal.depth, rel=0.01)
+    assert all(fr > 1 for fr in standard.froude_number[1:])
+    station = direct.station[::-1]
+    depth = direct.depth[::-1]
+    for s, y in zip(standard.station[5::5], standard.depth[5::5]):
+        assert np.interp(s, station, depth) == pytest.approx(y, rel=5e-3)
+
+
+def test_drawdown_reaches_normal_depth_and_flags_critical():
+    direct = direct_step_profile(DirectStepInput(
+        channel=MILD, discharges=[100.0], length=5000.0,
+        boundary=ProfileBoundary(type=BoundaryType.KNOWN_DEPTH, values=[0.5]),
+    )).profiles[0]
+    normal = _normal(MILD, 100.0)
+    # A depth below critical is replaced by critical depth at a subcritical boundary
+    assert direct.critical_assumed[0]
+    assert direct.depth[0] == pytest.approx(normal.critical_depth)
+    assert direct.station[-1] == 5000.0
+    assert direct.depth[-1] == pytest.approx(normal.depth)
+
+
+def test_irregular_reach_vectorized_over_discharges():
+    sections = [
+        ProfileSection(
+            channel=ChannelInput(
+                type=ChannelType.IRREGULAR, slope=0.001, mannings_n=0.035,
+                station_elevation_points=[(x, z + 0.05 * (19 - k)) for x, z in VALLEY],
+            ),
+            reach_length=50.0,
+        )
+        for k in range(20)
+    ]
+    discharges = [50.0, 500.0, 2000.0]
+    batch = standard_step_profile(StandardStepInput(
+        sections=sections, discharges=discharges,
+        boundary=ProfileBoundary(type=BoundaryType.KNOWN_WSE, values=[4.0, 8.0, 12.0]),
+    ))
+    for Q, wse, profile in zip(discharges, [4.0, 8.0, 12.0], batch.profiles):
+        single = standard_step_profile(StandardStepInput(
+            sections=sections, discharges=[Q],
+            boundary=ProfileBoundary(type=BoundaryType.KNOWN_WSE, values=[wse]),
+        )).profiles[0]
+        assert profile.water_surface_elevation[-1] == pytest.approx(wse)
+        assert np.allclose(profile.depth, single.depth, rtol=1e-9)
+        # Energy grade rises upstream in a subcritical profile
+        assert all(a >= b for a, b in zip(profile.energy_grade_elevation, profile.energy_grade_elevation[1:]))
+
+
+def test_invalid_profiles_raise():
+    with pytest.raises(ValueError):
+        standard_step_profile(StandardStepInput(
+            sections=_reach(MILD, 3, 10.0), discharges=[100.0],
+            boundary=ProfileBoundary(type=BoundaryType.KNOWN_WSE),
+        ))
+    with pytest.raises(ValueError):
+        standard_step_profile(StandardStepInput(
+            sections=_reach(MILD, 3, 10.0) + _reach(MILD.model_copy(update={"units": "metric"}), 1, 0.0),
+            discharges=[100.0],
+        ))
+
+
+def test_profile_endpoints():
+    client = TestClient(app)
+    body = {
+        "channel": MILD.model_dump(mode="json"), "discharges": [100.0], "length": 1000.0,
+        "boundary": {"type": "known_depth", "values": [4.0]},
+    }
+    response = client.post("/api/manning/profiles/direct-step", json=body)
+    assert response.status_code == 200
+    assert response.json()["profiles"][0]["depth"][0] == 4.0
+
+    body = {"sections": [s.model_dump(mode="json") for s in _reach(MILD, 3, 100.0)], "discharges": [-1.0]}
+    response = client.post("/api/manning/profiles/standard-step", json=body)
+    assert response.status_code == 400
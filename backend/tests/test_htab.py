@@ -0,0 +1,103 @@
+import math
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from hydro_agent.core.manning.channels import calculate_irregular_geometry, solve_normal_depth
+from hydro_agent.core.manning import htab
+from hydro_agent.core.manning.htab import (
+    HydraulicTable,
+    build_hydraulic_table,
+    clear_table_cache,
+    get_hydraulic_table,
+    section_key,
+)
+from hydro_agent.core.manning.schemas import ChannelInput, ChannelType, Units
+from hydro_agent.projects.models import Project, Scenario
+
+POINTS = [
+    (0.0, 28.77), (6.7, 28.61), (13.47, 25.25), (21.95, 23.9), (31.19, 23.69),
+    (31.74, 23.59), (42.2, 19.54), (58.04, 18.04), (86.0, 17.45), (115.7, 17.67),
+    (139.77, 16.98), (169.64, 16.76), (187.41, 14.62), (188.56, 11.85), (199.34, 10.7),
+    (206.49, 9.79), (219.48, 8.49), (229.36, 7.65), (239.39, 7.44), (254.45, 7.33),
+    (269.64, 8.15), (283.8, 7.7), (300.43, 6.46), (311.14, 6.04), (320.12, 7.92),
+    (330.35, 8.88), (339.18, 8.77), (350.08, 8.1), (359.61, 8.29), (365.68, 9.72),
+    (370.56, 14.04), (379.36, 16.27), (384.52, 25.42), (405.55, 27.73),
+]
+
+
+def test_table_reproduces_exact_geometry_between_rows():
+    table = build_hydraulic_table(POINTS, increments=10)
+    for y in np.linspace(0.01, 30.0, 257):
+        expected = calculate_irregular_geometry(float(y), POINTS)
+        actual = table.geometry(float(y))
+        for e, a in zip(expected[:3], actual[:3]):
+            assert math.isclose(a, e, rel_tol=1e-9, abs_tol=1e-9)
+
+    A, P, T, _, _ = table.geometry_array(np.array([0.0, 5.0, 14.29]))
+    assert A[0] == 0.0
+    assert math.isclose(T[2], calculate_irregular_geometry(14.29, POINTS)[2], rel_tol=1e-9)
+
+
+def test_table_keeps_jumps_at_horizontal_segments():
+    # Flat bed and flat overbanks: top width jumps at depths 0 and 4
+    points = [(0.0, 10.0), (0.0, 4.0), (100.0, 4.0), (102.0, 0.0), (108.0, 0.0), (110.0, 4.0), (210.0, 4.0), (210.0, 10.0)]
+    table = build_hydraulic_table(points, increments=5)
+    for y in [0.05, 0.5, 2.0, 3.99, 4.01, 4.5, 9.0, 12.0]:
+        expected = calculate_irregular_geometry(y, points)
+        actual = table.geometry(y)
+        for e, a in zip(expected[:3], actual[:3]):
+            assert math.isclose(a, e, rel_tol=1e-9, abs_tol=1e-9)
+
+
+def test_solve_with_table_matches_point_solver():
+    params = ChannelInput(
+        type=ChannelType.IRREGULAR,
+        station_elevation_points=POINTS,
+        discharge=20000.0,
+        slope=0.002,
+        mannings_n=0.035,
+        units=Units.IMPERIAL,
+    )
+    expected = solve_normal_depth(params)
+    result = solve_normal_depth(params, section=get_hydraulic_table(POINTS))
+    assert math.isclose(result.depth, expected.depth, rel_tol=1e-7)
+    assert math.isclose(result.critical_depth, expected.critical_depth, rel_tol=1e-7)
+    assert result.water_surface_elevation == pytest.approx(expected.water_surface_elevation)
+
+
+def test_table_cache_and_key():
+    clear_table_cache()
+    first = get_hydraulic_table(POINTS)
+    assert get_hydraulic_table(list(reversed(POINTS))) is first
+    assert first.key == section_key(POINTS)
+    assert get_hydraulic_table(POINTS, increments=5) is not first
+
+
+def test_table_round_trips_through_project(tmp_path):
+    table = build_hydraulic_table(POINTS)
+    project = Project(name="HTAB", scenarios=[
+        Scenario(id="xs-1", title="XS 1", inputs={}, hydraulic_table=table.to_dict()),
+    ])
+    path = tmp_path / "project.json"
+    project.save_to_file(str(path))
+
+    loaded = HydraulicTable.from_dict(Project.load_from_file(str(path)).scenarios[0].hydraulic_table)
+    assert loaded.key == table.key
+    assert np.allclose(loaded.conveyance, table.conveyance)
+    assert loaded.geometry(12.3) == pytest.approx(table.geometry(12.3))
+
+
+def test_table_cache_is_thread_safe(monkeypatch):
+    monkeypatch.setattr(htab, "TABLE_CACHE_SIZE", 2)
+    sections = [[(0.0, 5.0 + i), (10.0, 0.0), (20.0, 0.0), (30.0, 5.0)] for i in range(6)]
+
+    def lookup(i):
+        return get_hydraulic_table(sections[i % 6], increments=5).key
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        keys = list(pool.map(lookup, range(600)))
+    assert keys[:6] == [section_key(s) for s in sections]
+    assert len(htab._table_cache) <= 2
+    clear_table_cache()
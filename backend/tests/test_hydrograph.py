@@ -0,0 +1,80 @@
+import base64
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from hydro_agent.api.main import app
+from hydro_agent.core.manning.channels import solve_normal_depth
+from hydro_agent.core.manning.hydrograph import solve_hydrograph
+from hydro_agent.core.manning.schemas import ChannelInput, HydrographInput
+
+TRAPEZOID = ChannelInput(type="trapezoidal", bottom_width=5.0, side_slope=2.0, slope=0.001, mannings_n=0.013)
+GUTTER = ChannelInput(
+    type="gutter", gutter_width=2.0, gutter_cross_slope=0.08, road_cross_slope=0.02, slope=0.01, mannings_n=0.016,
+)
+
+
+def _storm(steps=20000, peak=40.0, seed=0):
+    """A base flow with a rounded, noisy flood wave and a dry start."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(steps)
+    q = 2.0 + peak * np.exp(-((t - steps / 3) / (steps / 10)) ** 2) * rng.uniform(0.8, 1.2, steps)
+    q = np.round(q, 2)
+    q[:500] = 0.0
+    return q
+
+
+def _check_against_scalar(channel, discharge, result, fields=("depth", "velocity", "froude_number")):
+    for i in np.random.default_rng(1).choice(np.flatnonzero(discharge > 0), 25, replace=False):
+        expected = solve_normal_depth(channel.model_copy(update={"discharge": float(discharge[i])}))
+        for field in fields:
+            assert getattr(result, field)[i] == pytest.approx(getattr(expected, field), rel=1e-9, abs=1e-12)
+
+
+def test_prismatic_hydrograph_matches_scalar_solves():
+    q = _storm()
+    result = solve_hydrograph(HydrographInput(channel=TRAPEZOID, discharge=q))
+    assert result.depth.shape == q.shape and result.water_surface_elevation is None and result.spread is None
+    assert result.unique_discharges == np.unique(q[q > 0]).size < q.size
+    assert (result.depth[:500] == 0).all() and (result.velocity[:500] == 0).all()
+    assert (np.diff(result.depth[np.argsort(q)]) >= 0).all()
+    _check_against_scalar(TRAPEZOID, q, result)
+
+
+def test_irregular_and_gutter_hydrographs():
+    x = np.linspace(0.0, 300.0, 2000)
+    z = 100.0 + 12.0 * ((x - 150.0) / 150.0) ** 2 + np.sin(x / 7.0)
+    channel = ChannelInput(type="irregular", stations=x, elevations=z, slope=0.002, mannings_n=0.035)
+    q = _storm(peak=2000.0)
+    result = solve_hydrograph(HydrographInput(channel=channel, discharge=q))
+    wet = q > 0
+    assert result.water_surface_elevation[wet] == pytest.approx(result.depth[wet] + z.min())
+    assert (result.depth[~wet] == 0).all() and (result.velocity[~wet] == 0).all()
+    assert (result.water_surface_elevation[~wet] == z.min()).all()
+    _check_against_scalar(channel, q, result, fields=("depth", "water_surface_elevation", "velocity", "froude_number"))
+
+    q = _storm(peak=3.0)
+    result = solve_hydrograph(HydrographInput(channel=GUTTER, discharge=q))
+    assert (result.spread[:500] == 0).all()
+    _check_against_scalar(GUTTER, q, result, fields=("spread", "depth", "velocity", "froude_number"))
+
+
+def test_hydrograph_edge_cases():
+    dry = solve_hydrograph(HydrographInput(channel=TRAPEZOID, discharge=[0.0, 0.0]))
+    assert dry.depth.tolist() == [0.0, 0.0] and dry.unique_discharges == 0
+    single = solve_hydrograph(HydrographInput(channel=TRAPEZOID, discharge=[10.0, 10.0, 0.0]))
+    expected = solve_normal_depth(TRAPEZOID.model_copy(update={"discharge": 10.0})).depth
+    assert single.depth.tolist() == pytest.approx([expected, expected, 0.0], rel=1e-12)
+    with pytest.raises(ValueError):
+        HydrographInput(channel=TRAPEZOID, discharge=[1.0, -1.0])
+
+
+def test_hydrograph_endpoint_accepts_base64():
+    q = _storm(5000)
+    client = TestClient(app)
+    body = {"channel": TRAPEZOID.model_dump(mode="json"), "discharge": base64.b64encode(q.astype("<f8").tobytes()).decode()}
+    response = client.post("/api/manning/channels/hydrograph", json=body)
+    assert response.status_code == 200
+    assert response.json()["depth"] == pytest.approx(solve_hydrograph(HydrographInput(channel=TRAPEZOID, discharge=q)).depth.tolist())
+    assert client.post("/api/manning/channels/hydrograph", json={**body, "discharge": [1.0, -2.0]}).status_code == 422
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from hydro_agent.api.main import app
+from hydro_agent.core import metrics
+from hydro_agent.core.manning.channels import solve_normal_depth, solve_normal_depth_batch
+from hydro_agent.core.manning.schemas import ChannelInput, ChannelType
+from hydro_agent.core.metrics import (
+    BATCH_ROWS,
+    IRREGULAR_POINTS,
+    SOLVER_DURATION,
+    SOLVER_FAILURES,
+    SOLVER_ITERATIONS,
+    MetricsRegistry,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.registry.clear()
+    yield
+    metrics.registry.enabled = True
+    metrics.registry.clear()
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, 'a"b')
+    histogram.observe_many(np.array([0.2, np.nan, 2.0]), 'a"b')
+    registry.counter("requests_total", "Requests.").inc(amount=2)
+    text = registry.render()
+    assert '# TYPE latency_seconds histogram' in text
+    assert 'latency_seconds_bucket{route="a\\"b",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{route="a\\"b",le="1"} 4' in text
+    assert 'latency_seconds_bucket{route="a\\"b",le="+Inf"} 6' in text
+    assert 'latency_seconds_count{route="a\\"b"} 6' in text
+    assert "requests_total 2" in text
+    assert registry.histogram("latency_seconds", "Again.") is histogram
+
+
+def test_solvers_record_rows_iterations_and_failures():
+    points = [(0, 10), (20, 2), (25, 0), (35, 0), (40, 2), (60, 10)]
+    result = solve_normal_depth(ChannelInput(
+        type=ChannelType.IRREGULAR, discharge=300, slope=0.002, mannings_n=0.03, station_elevation_points=points,
+    ))
+    assert SOLVER_DURATION.count("normal_depth", "irregular") == 1
+    assert SOLVER_ITERATIONS.count("normal_depth", "irregular") == 1
+    assert IRREGULAR_POINTS.count() == 1
+    assert f"hydro_agent_solver_iterations_sum{{solver=\"normal_depth\",type=\"irregular\"}} {result.iterations}" in metrics.registry.render()
+
+    with pytest.raises(ValueError):
+        solve_normal_depth(ChannelInput(type=ChannelType.RECTANGULAR, discharge=1, slope=0.01, mannings_n=0.013))
+    assert SOLVER_FAILURES.value("normal_depth", "rectangular", "invalid") == 1
+
+    solve_normal_depth_batch([10.0, 20.0, -1.0], 5.0, 1.0, 1.0, 0.001, 0.013)
+    assert BATCH_ROWS.value("normal_depth_batch", "prismatic") == 3
+    assert SOLVER_FAILURES.value("normal_depth_batch", "prismatic", "convergence") == 1
+    assert SOLVER_ITERATIONS.count("normal_depth_batch", "prismatic") == 2
+
+
+def test_disabled_registry_records_nothing():
+    metrics.registry.enabled = False
+    solve_normal_depth(ChannelInput(type=ChannelType.RECTANGULAR, discharge=10, bottom_width=4, slope=0.01, mannings_n=0.013))
+    assert SOLVER_DURATION.count("normal_depth", "rectangular") == 0
+    client = TestClient(app)
+    assert client.get("/api/health").status_code == 200
+    assert client.get("/api/metrics").status_code == 404
+    assert "hydro_agent_http_request_duration_seconds_count" not in metrics.registry.render()
+
+
+def test_metrics_endpoint():
+    client = TestClient(app)
+    body = {"type": "trapezoidal", "discharge": 123.456789, "bottom_width": 6, "side_slope": 2, "slope": 0.001, "mannings_n": 0.013}
+    assert client.post("/api/manning/channels/solve", json=body).status_code == 200
+    assert client.post("/api/manning/channels/solve", json={"type": "rectangular"}).status_code == 422
+    assert client.post("/api/manning/channels/solve-batch", json=[body, {"type": "x"}]).status_code == 200
+    assert client.post("/api/manning/channels/export-batch", json=[body]).status_code == 200
+    client.get("/api/no-such-route")
+
+    response = client.get("/api/metrics")
+    assert response.status_code == 200 and response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert 'hydro_agent_http_request_duration_seconds_count{method="POST",route="/api/manning/channels/solve",status="200"} 1' in text
+    assert 'route="/api/manning/channels/solve",status="422"' in text
+    assert 'route="unmatched",status="404"' in text
+    assert 'hydro_agent_request_phase_duration_seconds_count{route="/api/manning/channels/solve-batch",phase="validate"} 1' in text
+    assert 'hydro_agent_request_phase_duration_seconds_count{route="/api/manning/channels/export-batch",phase="solve"} 1' in text
+    assert "hydro_agent_cache_hit_ratio " in text and "hydro_agent_cache_misses_total " in text
+    assert 'hydro_agent_solver_duration_seconds_count{solver="normal_depth",type="trapezoidal"} 1' in text
@@ -0,0 +1,140 @@
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from hydro_agent.api.main import app
+from hydro_agent.core.curb_inlets.on_grade import solve_curb_inlet_on_grade
+from hydro_agent.core.curb_inlets.schemas import CurbInletOnGradeInput
+from hydro_agent.core.manning.channels import solve_normal_depth
+from hydro_agent.core.manning.htab import get_hydraulic_table
+from hydro_agent.core.manning.schemas import ChannelInput, ChannelType
+from hydro_agent.projects import solver
+from hydro_agent.projects.models import Project, Scenario
+from hydro_agent.projects.solver import input_hash, scenario_input
+
+SAMPLE = Path(__file__).resolve().parents[2] / "trapezoidal_channel_design.json"
+
+# Inputs as saved by the calculator (App.jsx DEFAULT_INLET)
+INLET = {
+    "inletType": "curb_on_grade", "discharge": 10, "slope": 0.005, "gutterWidth": 2.0,
+    "gutterCrossSlope": 0.06, "roadCrossSlope": 0.02, "manningsN": 0.016, "curbOpeningLength": 12.0,
+    "localDepressionDepth": 0.6, "localDepressionWidth": 2.0, "units": "imperial", "notes": "",
+}
+VALLEY = [[0, 10], [20, 2], [25, 0], [35, 0], [40, 2], [60, 10]]
+
+
+def _channel(i, discharge):
+    return Scenario(id=f"c{i}", title=f"Channel {i}", inputs={
+        "type": "trapezoidal", "solveFor": "depth", "discharge": discharge, "width": 10, "sideSlope": 2,
+        "leftSideSlope": 2, "rightSideSlope": 2, "slope": 0.001, "manningsN": 0.013, "units": "imperial",
+        "irregularData": "", "irregularPoints": [], "spread": 5.0,
+    })
+
+
+def test_sample_project_matches_direct_solves():
+    project = Project.load_from_file(SAMPLE)
+    summary = project.solve_all()
+    assert summary.solved == ["design-35ft", "design-40ft"] and summary.failed == []
+
+    expected = solve_normal_depth(ChannelInput(
+        type=ChannelType.TRAPEZOIDAL, discharge=2000, bottom_width=35, left_side_slope=2,
+        right_side_slope=2, slope=0.001, mannings_n=0.013,
+    ))
+    assert project.scenarios[0].results["depth"] == pytest.approx(expected.depth, rel=1e-9)
+    assert project.scenarios[0].results["depth"] < 5.0
+
+
+def test_calculator_inputs_are_adapted():
+    inlet = scenario_input("curb_inlets.on_grade", INLET)
+    assert inlet == CurbInletOnGradeInput(
+        discharge_cfs=10, longitudinal_slope=0.005, gutter_width_ft=2.0, gutter_cross_slope=0.06,
+        road_cross_slope=0.02, mannings_n=0.016, curb_opening_length_ft=12.0,
+        local_depression_depth_in=0.6, local_depression_width_in=2.0,
+    )
+    channel = scenario_input("manning.channels", {
+        "type": "gutter", "solveFor": "discharge", "discharge": 3.0, "slope": 0.01, "manningsN": 0.016,
+        "gutterWidth": 2.0, "gutterCrossSlope": 0.06, "roadCrossSlope": 0.02, "spread": 6.0,
+        "irregularPoints": [[0, 1], [1, 0]], "waterSurfaceElevation": "",
+    })
+    assert channel.discharge is None and channel.spread == 6.0
+    assert channel.station_elevation_points == [] and channel.known_wse is None
+    # snake_case inputs pass through unchanged
+    assert scenario_input("manning.channels", {"type": "rectangular", "discharge": 5, "bottom_width": 2,
+                                              "slope": 0.01, "mannings_n": 0.013}).bottom_width == 2
+    with pytest.raises(ValueError):
+        scenario_input("weirs.broad_crested", {})
+
+
+def test_only_changed_scenarios_are_resolved():
+    project = Project(name="p", scenarios=[_channel(i, 50.0 + i) for i in range(20)] + [
+        Scenario(id="inlet", title="Inlet", module="curb_inlets.on_grade", inputs=INLET),
+        Scenario(id="bad", title="Bad", inputs={"type": "rectangular", "discharge": 10, "width": 5, "slope": -1, "manningsN": 0.013}),
+    ])
+    first = project.solve_all(workers=1)
+    assert len(first.solved) == 22 and first.unchanged == 0 and first.failed == ["bad"]
+    assert project.scenarios[-1].results is None and project.scenarios[-1].error
+    assert project.scenarios[-2].results["efficiency_percent"] == pytest.approx(
+        solve_curb_inlet_on_grade(scenario_input("curb_inlets.on_grade", INLET)).efficiency_percent
+    )
+
+    stamp = project.scenarios[0].results["timestamp"]
+    project.scenarios[3].inputs["discharge"] = 500.0
+    second = project.solve_all(workers=1)
+    assert second.solved == ["c3"] and second.unchanged == 21 and second.failed == []
+    assert project.scenarios[0].results["timestamp"] == stamp
+    assert project.scenarios[3].input_hash == input_hash(project.scenarios[3])
+    assert project.scenarios[3].results["discharge"] == 500.0
+
+    assert project.solve_all().solved == []
+    assert len(project.solve_all(force=True).solved) == 22
+
+
+@pytest.mark.parametrize("pool", ["process", "thread"])
+def test_pool_matches_inline(monkeypatch, pool):
+    inline = Project(name="p", scenarios=[_channel(i, 10.0 + 7 * i) for i in range(40)])
+    pooled = inline.model_copy(deep=True)
+    inline.solve_all(workers=1)
+    monkeypatch.setattr(solver, "PARALLEL_THRESHOLD", 1)
+    monkeypatch.setattr(solver, "PROJECT_CHUNK_SIZE", 7)
+    pooled.solve_all(workers=2, pool=pool)
+    for a, b in zip(inline.scenarios, pooled.scenarios):
+        assert a.input_hash == b.input_hash
+        assert a.results["depth"] == b.results["depth"]
+
+
+def test_saved_table_is_used_only_for_matching_points(monkeypatch):
+    table = get_hydraulic_table([tuple(p) for p in VALLEY]).to_dict()
+    inputs = {"type": "irregular", "solveFor": "depth", "discharge": 300.0, "slope": 0.002,
+              "manningsN": 0.03, "irregularPoints": VALLEY}
+    project = Project(name="p", scenarios=[
+        Scenario(id="same", title="a", inputs=inputs, hydraulic_table=table),
+        Scenario(id="edited", title="b", inputs={**inputs, "irregularPoints": [[0, 12]] + VALLEY[1:]}, hydraulic_table=table),
+    ])
+    x, z = zip(*VALLEY)
+    arrays = {**inputs, "irregularPoints": [], "stations": list(x), "elevations": list(z)}
+    project.scenarios.append(Scenario(id="arrays", title="c", inputs=arrays, hydraulic_table=table))
+    # Scenarios with a matching saved table are solved from it, without preparing their section
+    prepared = []
+    solve_many = solver.solve_normal_depth_many
+    monkeypatch.setattr(solver, "solve_normal_depth_many", lambda params: prepared.extend(params) or solve_many(params))
+    project.solve_all(workers=1)
+    assert [p.station_elevation_points[0] for p in prepared] == [(0, 12)]
+    exact = solve_normal_depth(scenario_input("manning.channels", inputs))
+    assert project.scenarios[0].results["depth"] == pytest.approx(exact.depth, rel=1e-9)
+    assert project.scenarios[2].results["depth"] == pytest.approx(exact.depth, rel=1e-9)
+    edited = solve_normal_depth(scenario_input("manning.channels", project.scenarios[1].inputs))
+    assert project.scenarios[1].results["max_elevation"] == edited.max_elevation == 12
+
+
+def test_project_solve_endpoint():
+    client = TestClient(app)
+    body = json.loads(SAMPLE.read_text())
+    response = client.post("/api/projects/solve", json=body)
+    assert response.status_code == 200
+    solved = response.json()
+    assert all(s["results"]["depth"] > 0 and s["input_hash"] for s in solved["scenarios"])
+
+    again = client.post("/api/projects/solve", json=solved).json()
+    assert [s["results"]["timestamp"] for s in again["scenarios"]] == [s["results"]["timestamp"] for s in solved["scenarios"]]
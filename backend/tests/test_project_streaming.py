@@ -0,0 +1,123 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from hydro_agent.projects import streaming
+from hydro_agent.projects.models import Project, Scenario
+from hydro_agent.projects.streaming import ProjectReader, ProjectWriter, update_project_file
+
+SAMPLE = Path(__file__).resolve().parents[2] / "trapezoidal_channel_design.json"
+
+
+def _project():
+    scenarios = [
+        Scenario(id=f"s{i}", title=f"Sección {i}", inputs={"type": "irregular", "discharge": 10.0 + i,
+                 "irregularPoints": [[x, (x - 5) ** 2 / 10] for x in range(11)]})
+        for i in range(30)
+    ]
+    # Strings that look like structure must not confuse the scan
+    scenarios[4].notes = 'He said "[{ not a bracket }]" \\ and left\\'
+    scenarios[7].inputs = {"id": "nested", "notes": "\\\"}]", "list": [{"id": 1}]}
+    scenarios[9].id = 'quoted "id" \\ with ] brackets'
+    return Project(name="Big ∑ project", scenarios=scenarios)
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_round_trip_by_id_and_iteration(tmp_path, stream):
+    project = _project()
+    path = tmp_path / "p.json"
+    project.save_to_file(path, stream=stream)
+    if not stream:
+        assert path.read_text() == project.model_dump_json(indent=2)
+
+    with ProjectReader(path) as reader:
+        assert len(reader) == 30 and reader.ids() == [s.id for s in project.scenarios]
+        assert reader.header["name"] == project.name
+        assert reader.get(project.scenarios[9].id) == project.scenarios[9]
+        assert reader.get("s7").inputs["list"] == [{"id": 1}]
+        assert list(reader) == project.scenarios
+        assert reader.to_project() == project
+        assert "s99" not in reader
+        with pytest.raises(KeyError):
+            reader.get("s99")
+    assert Project.load_from_file(str(path)) == project
+    # The offset index is only written on request
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 64, 4096])
+def test_scan_matches_across_chunk_boundaries(tmp_path, monkeypatch, chunk):
+    project = _project()
+    path = tmp_path / "pretty.json"
+    # Indented, with "id" not first in one scenario, like a hand-edited file
+    data = json.loads(project.model_dump_json())
+    data["scenarios"][3] = {"title": "t", "id": "late", "inputs": {}}
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    monkeypatch.setattr(streaming, "READ_CHUNK_SIZE", chunk)
+    with ProjectReader(path, use_index=False, save_index=False) as reader:
+        assert reader.ids() == [s["id"] for s in data["scenarios"]]
+        assert [s.model_dump(mode="json") for s in reader] == [
+            Scenario.model_validate(s).model_dump(mode="json") for s in data["scenarios"]
+        ]
+        assert reader.header == {k: v for k, v in data.items() if k != "scenarios"}
+
+
+def test_sample_project_and_invalid_files(tmp_path):
+    with ProjectReader(SAMPLE, save_index=False) as reader:
+        assert reader.ids() == ["design-35ft", "design-40ft"]
+        assert reader.get("design-40ft").inputs["width"] == 40
+
+    for text in ('{"name": "x", "scenarios": [{"id": "a"}', '{"name": "x", "scenarios": [{"id": "a}]}', "[1, 2]"):
+        path = tmp_path / "bad.json"
+        path.write_text(text)
+        with pytest.raises(ValueError):
+            ProjectReader(path, use_index=False)
+
+
+def test_saved_index_is_reused_until_the_file_changes(tmp_path, monkeypatch):
+    path = tmp_path / "p.json"
+    _project().save_to_file(path, stream=True, save_index=True)
+    assert Path(str(path) + streaming.INDEX_SUFFIX).exists()
+
+    def no_scan(file):
+        raise AssertionError("index should have been used")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(streaming, "_scan", no_scan)
+        with ProjectReader(path) as reader:
+            assert reader.get("s20").title == "Sección 20"
+
+    # Rewritten by another tool: the stale index is ignored and replaced
+    path.write_text(Project(name="other", scenarios=[Scenario(id="only", title="x", inputs={})]).model_dump_json())
+    with ProjectReader(path) as reader:
+        assert reader.ids() == ["only"]
+
+
+def test_update_copies_untouched_scenarios(tmp_path):
+    project = _project()
+    path = tmp_path / "p.json"
+    project.save_to_file(path)
+    with ProjectReader(path) as reader:
+        before = {scenario_id: reader.raw(scenario_id) for scenario_id in reader.ids()}
+
+    edited = project.scenarios[5].model_copy(update={"notes": "edited"})
+    added = Scenario(id="new", title="New", inputs={"discharge": 1.0})
+    update_project_file(path, [edited, added])
+
+    with ProjectReader(path, use_index=False) as reader:
+        assert reader.ids() == [s.id for s in project.scenarios] + ["new"]
+        assert reader.get("s5").notes == "edited"
+        assert reader.get("new") == added
+        assert all(reader.raw(i) == before[i] for i in before if i != "s5")
+        assert reader.header["created"] == project.created.isoformat()
+
+
+def test_writer_discards_partial_file_on_error(tmp_path):
+    path = tmp_path / "p.json"
+    with pytest.raises(RuntimeError):
+        with ProjectWriter(path, name="p") as writer:
+            writer.write(Scenario(id="a", title="a", inputs={}))
+            raise RuntimeError("boom")
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from hydro_agent.api.main import app
+from hydro_agent.core.manning.channels import solve_normal_depth
+from hydro_agent.core.manning.rating import rating_curve
+from hydro_agent.core.manning.schemas import ChannelInput, ChannelType, RatingCurveInput, SolveFor, Units
+
+POINTS = [(0, 10), (10, 5), (20, 0), (30, 0), (40, 5), (60, 10)]
+
+
+def test_trapezoidal_rating_matches_discharge_solver():
+    channel = ChannelInput(
+        type=ChannelType.TRAPEZOIDAL, bottom_width=5.0, side_slope=2.0,
+        slope=0.001, mannings_n=0.013, units=Units.METRIC,
+    )
+    curve = rating_curve(RatingCurveInput(channel=channel, max_depth=4.0, num_points=5))
+    assert curve.depth[0] == 0.0 and curve.discharge[0] == 0.0
+    for y, q, yc in list(zip(curve.depth, curve.discharge, curve.critical_depth))[1::3]:
+        expected = solve_normal_depth(channel.model_copy(update={"solve_for": SolveFor.DISCHARGE, "known_depth": y}))
+        assert q == pytest.approx(expected.discharge, rel=1e-9)
+        assert yc == pytest.approx(expected.critical_depth, rel=1e-6)
+
+
+def test_irregular_rating_refines_and_meets_tolerance():
+    channel = ChannelInput(
+        type=ChannelType.IRREGULAR, station_elevation_points=POINTS,
+        slope=0.001, mannings_n=0.03, units=Units.METRIC,
+    )
+    params = RatingCurveInput(channel=channel, min_wse=0.0, max_wse=10.0, num_points=3, tolerance=0.002)
+    curve = rating_curve(params)
+    depths = np.array(curve.depth)
+    # Breakpoint elevations of the section are always sampled
+    assert 5.0 in curve.depth
+    assert len(depths) > 3
+    assert curve.water_surface_elevation == pytest.approx(curve.depth)
+
+    for y in np.linspace(0.5, 9.5, 19):
+        exact = solve_normal_depth(channel.model_copy(update={"solve_for": SolveFor.DISCHARGE, "known_wse": y})).discharge
+        assert np.interp(y, depths, curve.discharge) == pytest.approx(exact, rel=0.01)
+
+
+def test_gutter_rating_reports_spread():
+    channel = ChannelInput(
+        type=ChannelType.GUTTER, slope=0.005, mannings_n=0.016,
+        gutter_width=2.0, gutter_cross_slope=0.06, road_cross_slope=0.02,
+    )
+    curve = rating_curve(RatingCurveInput(channel=channel, max_depth=0.5, num_points=6))
+    for T, q in zip(curve.spread[1:], curve.discharge[1:]):
+        expected = solve_normal_depth(channel.model_copy(update={"solve_for": SolveFor.DISCHARGE, "spread": T}))
+        assert q == pytest.approx(expected.discharge, rel=1e-9)
+
+
+def test_rating_curve_endpoint_requires_range_for_prismatic():
+    client = TestClient(app)
+    channel = {"type": "rectangular", "bottom_width": 3.0, "slope": 0.01, "mannings_n": 0.013}
+    response = client.post("/api/manning/channels/rating-curve", json={"channel": channel})
+    assert response.status_code == 400
+
+    response = client.post("/api/manning/channels/rating-curve", json={"channel": channel, "max_depth": 2.0})
+    assert response.status_code == 200
+    assert len(response.json()["discharge"]) >= 25
@@ -0,0 +1,80 @@
+import math
+
+import numpy as np
+import pytest
+
+from hydro_agent.projects.models import Project, Scenario
+from hydro_agent.projects.results_store import ResultsStore, result_fields, results_store_path, write_results_store
+from hydro_agent.projects.streaming import ProjectReader
+
+INLET = {
+    "discharge": 6.0, "slope": 0.01, "gutterWidth": 2.0, "gutterCrossSlope": 0.06, "roadCrossSlope": 0.02,
+    "manningsN": 0.016, "curbOpeningLength": 10.0,
+}
+
+
+def _solved_project():
+    scenarios = [
+        Scenario(id=f"c{i}", title="c", inputs={"type": "trapezoidal", "discharge": 20.0 * (i + 1), "width": 4,
+                 "leftSideSlope": 2, "rightSideSlope": 2, "slope": 0.002, "manningsN": 0.015})
+        for i in range(25)
+    ]
+    scenarios.append(Scenario(id="inlet", title="i", module="curb_inlets.on_grade", inputs=INLET))
+    scenarios.append(Scenario(id="bad", title="b", inputs={"type": "rectangular", "discharge": 1, "width": 0, "slope": 0.01, "manningsN": 0.013}))
+    project = Project(name="p", scenarios=scenarios)
+    project.solve_all(workers=1)
+    return project
+
+
+def test_columns_match_scenario_results(tmp_path):
+    project = _solved_project()
+    path = tmp_path / "p.json"
+    project.save_to_file(path)
+    assert project.save_results_store(path) == 27
+
+    store = ResultsStore(results_store_path(path))
+    assert len(store) == 27 and store.ids == [s.id for s in project.scenarios]
+    assert store.fields == result_fields()
+    velocity = store["velocity"]
+    assert isinstance(velocity, np.memmap) and velocity.dtype == np.float64
+
+    channels = [s.results for s in project.scenarios[:25]]
+    assert np.nanmax(velocity) == max(r["velocity"] for r in channels)
+    assert np.array_equal(store["depth"][:25], [r["depth"] for r in channels])
+    assert np.isnan(store["efficiency_percent"][:25]).all()
+    assert store["efficiency_percent"][25] == project.scenarios[25].results["efficiency_percent"]
+    # Failed scenario: no results, every column NaN
+    assert all(math.isnan(store[name][26]) for name in store.fields)
+
+    assert store.module_mask("manning.channels").sum() == 26
+    assert store.module_mask("curb_inlets.on_grade").tolist() == [False] * 25 + [True, False]
+    assert not store.module_mask("weirs").any()
+
+    row = store.row("c3")
+    assert row["depth"] == channels[3]["depth"] and row["water_surface_elevation"] is None
+    with pytest.raises(KeyError):
+        store.row("missing")
+    with pytest.raises(KeyError):
+        store["flow_regime"]
+
+
+def test_store_written_from_reader_and_replaced(tmp_path):
+    project = _solved_project()
+    path = tmp_path / "p.json"
+    project.save_to_file(path)
+    target = results_store_path(path)
+    with ProjectReader(path) as reader:
+        write_results_store(target, reader)
+    first = ResultsStore(target)
+    assert first.row("c0")["depth"] == project.scenarios[0].results["depth"]
+
+    project.scenarios[0].inputs["discharge"] = 500.0
+    project.solve_all(workers=1)
+    write_results_store(target, project.scenarios[:5])
+    second = ResultsStore(target)
+    assert len(second) == 5
+    assert second.row("c0")["discharge"] == 500.0
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["p.json", "p.json.results"]
+
+    with pytest.raises(ValueError):
+        ResultsStore(tmp_path / "nothing.results")
@@ -0,0 +1,60 @@
+import math
+
+import numpy as np
+import pytest
+
+from hydro_agent.core.manning.channels import solve_normal_depth
+from hydro_agent.core.manning.schemas import ChannelInput, ChannelType
+from hydro_agent.core.roots import bracketed_newton, bracketed_newton_batch, expand_bracket
+
+
+def test_bracketed_newton_survives_bad_derivative():
+    # Newton alone diverges on atan from x0 = 3; the bracket forces bisection instead
+    func = lambda x: (math.atan(x - 1.0), 1.0 / (1.0 + (x - 1.0) ** 2))
+    root = bracketed_newton(func, -10.0, 10.0, x0=3.0)
+    assert root.converged
+    assert root.root == pytest.approx(1.0, abs=1e-9)
+    assert root.residual < 1e-9
+    assert 0 < root.iterations < 100
+
+
+def test_expand_bracket_raises_without_sign_change():
+    with pytest.raises(ValueError):
+        expand_bracket(lambda x: (-1.0, 0.0), 0.0, 1.0, max_expansions=5)
+
+
+def test_bracketed_newton_batch_masks_rows():
+    targets = np.array([0.5, 2.0, 100.0, np.nan])
+
+    def func(idx, x):
+        return x ** 3 - targets[idx], 3 * x ** 2
+
+    lo = np.where(np.isfinite(targets), 0.0, np.nan)
+    hi = np.where(np.isfinite(targets), 10.0, np.nan)
+    result = bracketed_newton_batch(func, lo, hi)
+    assert result.converged.tolist() == [True, True, True, False]
+    assert np.allclose(result.root[:3], np.cbrt(targets[:3]))
+    assert np.isnan(result.root[3])
+
+
+@pytest.mark.parametrize(
+    "inputs",
+    [
+        dict(type=ChannelType.RECTANGULAR, discharge=0.001, bottom_width=5000.0, slope=0.5, mannings_n=0.011),
+        dict(type=ChannelType.TRAPEZOIDAL, discharge=1e6, bottom_width=0.01, side_slope=0.01, slope=1e-6, mannings_n=0.1),
+        dict(
+            type=ChannelType.IRREGULAR,
+            discharge=0.01,
+            station_elevation_points=[(0, 10), (1, 0.0), (5000, 0.001), (5001, 10)],
+            slope=0.3,
+            mannings_n=0.011,
+        ),
+    ],
+)
+def test_extreme_sections_converge_with_diagnostics(inputs):
+    result = solve_normal_depth(ChannelInput(**inputs))
+    assert result.iterations is not None and result.iterations < 100
+    assert result.residual < 1e-6
+    # Critical depth must stay inside the section for the wide flat irregular case
+    if inputs["type"] == ChannelType.IRREGULAR:
+        assert result.critical_depth < 0.01
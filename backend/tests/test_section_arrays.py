@@ -0,0 +1,89 @@
+import base64
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from hydro_agent.api.main import app
+from hydro_agent.core.cache import channel_key
+from hydro_agent.core.manning.channels import solve_normal_depth
+from hydro_agent.core.manning.rating import rating_curve
+from hydro_agent.core.manning.schemas import ChannelInput, HydrographInput, ProfileSection, RatingCurveInput
+
+VALLEY = [(0, 10), (20, 2), (25, 0), (35, 0), (40, 2), (60, 10)]
+BASE = {"type": "irregular", "discharge": 300.0, "slope": 0.002, "mannings_n": 0.03}
+
+
+def _b64(values):
+    return base64.b64encode(np.asarray(values, dtype="<f8").tobytes()).decode()
+
+
+def _encodings():
+    x, z = zip(*VALLEY)
+    return {
+        "points": ChannelInput(**BASE, station_elevation_points=VALLEY),
+        "arrays": ChannelInput(**BASE, stations=list(x), elevations=list(z)),
+        "base64": ChannelInput(**BASE, stations=_b64(x), elevations=_b64(z)),
+    }
+
+
+def test_encodings_decode_to_arrays_and_solve_alike():
+    channels = _encodings()
+    assert isinstance(channels["base64"].stations, np.ndarray) and channels["base64"].stations.dtype == np.float64
+    assert channels["arrays"].point_count() == channels["points"].point_count() == 6
+
+    expected = solve_normal_depth(channels["points"])
+    for channel in channels.values():
+        result = solve_normal_depth(channel)
+        assert result.depth == expected.depth and result.critical_depth == expected.critical_depth
+        assert result.water_surface_elevation == expected.water_surface_elevation
+    assert len({channel_key(channel) for channel in channels.values()}) == 1
+
+    # Station order does not matter, as for station_elevation_points
+    shuffled = ChannelInput(**BASE, stations=[60, 0, 40, 20, 35, 25], elevations=[10, 10, 2, 2, 0, 0])
+    assert channel_key(shuffled) == channel_key(channels["points"])
+    assert channel_key(channels["arrays"]) != channel_key(ChannelInput(**BASE, stations=[0, 60], elevations=[5, 0]))
+
+    table = rating_curve(RatingCurveInput(channel=channels["base64"], max_depth=5.0))
+    assert table.discharge == rating_curve(RatingCurveInput(channel=channels["points"], max_depth=5.0)).discharge
+    assert channels["base64"].model_dump()["stations"] == [0.0, 20.0, 25.0, 35.0, 40.0, 60.0]
+
+
+@pytest.mark.parametrize("fields", [
+    {"stations": [0, 1, 2]},
+    {"stations": [0, 1, 2], "elevations": [1, 0]},
+    {"stations": [0, 1], "elevations": [1, 0], "station_elevation_points": [(0, 1), (1, 0)]},
+    {"stations": "not base64!", "elevations": [1, 0]},
+    {"stations": base64.b64encode(b"\0" * 12).decode(), "elevations": [1, 0]},
+    {"stations": [0, float("nan")], "elevations": [1, 0]},
+    {"stations": [[0, 1]], "elevations": [1, 0]},
+    {"stations": ["a", "b"], "elevations": [1, 0]},
+])
+def test_invalid_arrays_are_rejected(fields):
+    with pytest.raises(ValidationError):
+        ChannelInput(**BASE, **fields)
+
+
+def test_solve_endpoint_accepts_base64_sections():
+    client = TestClient(app)
+    x = np.linspace(0.0, 200.0, 5000)
+    z = 10.0 * ((x - 100.0) / 100.0) ** 2
+    body = {**BASE, "discharge": 812.5, "stations": _b64(x), "elevations": _b64(z)}
+    response = client.post("/api/manning/channels/solve", json=body)
+    assert response.status_code == 200
+    expected = solve_normal_depth(ChannelInput(**{**BASE, "discharge": 812.5}, station_elevation_points=list(zip(x, z))))
+    assert response.json()["depth"] == pytest.approx(expected.depth, rel=1e-12)
+
+    assert client.post("/api/manning/channels/solve", json={**body, "elevations": _b64(z[:-1])}).status_code == 422
+    too_few = {**BASE, "stations": [0.0], "elevations": [1.0]}
+    assert client.post("/api/manning/channels/solve", json=too_few).status_code == 400
+
+
+def test_array_inputs_compare_by_value():
+    first, second = _encodings()["arrays"], _encodings()["base64"]
+    assert first == second and first is not second
+    assert first != first.model_copy(update={"elevations": first.elevations + 1.0})
+    assert first != _encodings()["points"] and first != first.model_copy(update={"mannings_n": 0.04})
+    assert ProfileSection(channel=first, reach_length=100.0) == ProfileSection(channel=second, reach_length=100.0)
+    assert HydrographInput(channel=first, discharge=[1.0, 2.0]) == HydrographInput(channel=second, discharge=_b64([1.0, 2.0]))
@@ -0,0 +1,71 @@
+import math
+
+import numpy as np
+import pytest
+
+from hydro_agent.core.manning.channels import calculate_irregular_geometry, solve_normal_depth
+from hydro_agent.core.manning.schemas import ChannelInput, ChannelType, Units
+from hydro_agent.core.manning.sections import PreparedSection
+
+
+def _random_points(rng, count):
+    stations = np.sort(rng.uniform(0.0, 200.0, count))
+    elevations = rng.uniform(100.0, 115.0, count)
+    # Flat runs and a vertical wall exercise the degenerate segment cases
+    elevations[3:6] = elevations[3]
+    stations[8] = stations[7]
+    return list(zip(stations.tolist(), elevations.tolist()))
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_prepared_geometry_matches_point_walk(seed):
+    rng = np.random.default_rng(seed)
+    points = _random_points(rng, 40)
+    section = PreparedSection(points)
+
+    depths = np.concatenate([rng.uniform(0.0, 20.0, 50), section.breakpoints])
+    for y in depths:
+        expected = calculate_irregular_geometry(float(y), points)
+        actual = section.geometry(float(y))
+        for e, a in zip(expected, actual):
+            assert math.isclose(a, e, rel_tol=1e-9, abs_tol=1e-9)
+
+    arrays = section.geometry_array(depths)
+    for k, y in enumerate(depths):
+        assert [col[k] for col in arrays] == pytest.approx(section.geometry(float(y)))
+
+
+def test_prepared_section_from_arrays():
+    section = PreparedSection.from_arrays([0.0, 5.0, 10.0], [10.0, 0.0, 10.0])
+    assert section.point_count == 3
+    assert section.min_elevation == 0.0
+    assert section.breakpoints.tolist() == [0.0, 10.0]
+    area, _, top_width, _, _ = section.geometry(5.0)
+    assert area == pytest.approx(12.5)
+    assert top_width == pytest.approx(5.0)
+
+
+def test_prepared_section_rejects_bad_points():
+    with pytest.raises(ValueError):
+        PreparedSection([(0.0, 1.0)])
+    with pytest.raises(ValueError):
+        PreparedSection([(0.0, 1.0), (1.0, float("nan"))])
+
+
+def test_solver_reuses_prepared_section():
+    points = [(0, 10), (10, 5), (20, 0), (30, 0), (40, 5), (60, 10)]
+    section = PreparedSection(points)
+    for discharge in (10.0, 100.0, 400.0):
+        params = ChannelInput(
+            type=ChannelType.IRREGULAR,
+            station_elevation_points=points,
+            discharge=discharge,
+            slope=0.001,
+            mannings_n=0.03,
+            units=Units.METRIC,
+        )
+        expected = solve_normal_depth(params)
+        result = solve_normal_depth(params, section=section)
+        assert result.depth == pytest.approx(expected.depth, rel=1e-9)
+        assert result.critical_depth == pytest.approx(expected.critical_depth, rel=1e-9)
+        assert result.min_elevation == 0.0
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from hydro_agent.api import sessions
+from hydro_agent.api.main import app
+from hydro_agent.api.sessions import SessionStore
+from hydro_agent.core.manning.channels import solve_normal_depth
+from hydro_agent.core.manning.schemas import ChannelInput
+
+client = TestClient(app)
+
+TRAPEZOID = {"type": "trapezoidal", "discharge": 100.0, "bottom_width": 5.0, "side_slope": 2.0, "slope": 0.001, "mannings_n": 0.013}
+
+
+def _survey(n=2000):
+    x = np.linspace(0.0, 300.0, n)
+    return x, 12.0 * ((x - 150.0) / 150.0) ** 2 + np.sin(x / 7.0)
+
+
+def _open():
+    response = client.post("/api/manning/sessions")
+    assert response.status_code == 201
+    return response.json()["session_id"]
+
+
+def test_warm_starts_match_cold_solves_in_fewer_iterations():
+    cold = solve_normal_depth(ChannelInput(**TRAPEZOID))
+    for discharge in (101.0, 110.0, 150.0, 60.0, 1.0):
+        params = ChannelInput(**{**TRAPEZOID, "discharge": discharge})
+        expected = solve_normal_depth(params)
+        warm = solve_normal_depth(params, initial_depth=cold.depth, initial_critical_depth=cold.critical_depth)
+        assert warm.depth == pytest.approx(expected.depth, rel=1e-12)
+        assert warm.critical_depth == pytest.approx(expected.critical_depth, rel=1e-12)
+    unchanged = solve_normal_depth(ChannelInput(**TRAPEZOID), initial_depth=cold.depth, initial_critical_depth=cold.critical_depth)
+    assert unchanged.iterations < cold.iterations
+
+
+def test_session_edits_reuse_the_section():
+    x, z = _survey()
+    full = {"type": "irregular", "discharge": 2000.0, "slope": 0.002, "mannings_n": 0.035, "stations": x.tolist(), "elevations": z.tolist()}
+    session_id = _open()
+    first = client.post(f"/api/manning/sessions/{session_id}/solve", json=full)
+    assert first.status_code == 200
+    section = sessions.default_session_store.get(session_id).section
+    assert section is not None
+
+    # Roughness edits send one field; the section is kept and the depth warm-started
+    for n in (0.036, 0.04):
+        response = client.post(f"/api/manning/sessions/{session_id}/solve", json={"mannings_n": n})
+        assert response.status_code == 200
+        expected = solve_normal_depth(ChannelInput(**{**full, "mannings_n": n}))
+        assert response.json()["depth"] == pytest.approx(expected.depth, rel=1e-12)
+        assert response.json()["iterations"] <= expected.iterations
+        assert sessions.default_session_store.get(session_id).section is section
+
+    moved = client.post(f"/api/manning/sessions/{session_id}/solve", json={"elevations": (z + 10.0).tolist()})
+    assert moved.status_code == 422
+    moved = client.post(f"/api/manning/sessions/{session_id}/solve", json={"station_elevation_points": list(zip(x[::50], z[::50] + 10.0))})
+    assert moved.status_code == 200 and moved.json()["min_elevation"] == pytest.approx(z[::50].min() + 10.0)
+    assert sessions.default_session_store.get(session_id).section is not section
+
+
+def test_session_errors():
+    session_id = _open()
+    url = f"/api/manning/sessions/{session_id}/solve"
+    assert client.post(url, json={"discharge": 10.0}).status_code == 422
+    assert client.post(url, json=TRAPEZOID).status_code == 200
+    assert client.post(url, json={"mannings_n": -1}).status_code == 422
+    assert client.post(url, json={"discharge": None}).status_code == 400
+    response = client.post(url, json={"discharge": 50.0})
+    assert response.json()["depth"] == pytest.approx(solve_normal_depth(ChannelInput(**{**TRAPEZOID, "discharge": 50.0})).depth)
+
+    assert client.delete(f"/api/manning/sessions/{session_id}").status_code == 204
+    assert client.post(url, json=TRAPEZOID).status_code == 404
+    assert client.delete(f"/api/manning/sessions/{session_id}").status_code == 404
+    assert "hydro_agent_sessions_open" in client.get("/api/metrics").text
+
+
+def test_store_expires_and_evicts(monkeypatch):
+    store = SessionStore(max_sessions=2, ttl=60.0)
+    clock = [1000.0]
+    monkeypatch.setattr(sessions.time, "monotonic", lambda: clock[0])
+    a, b = store.open(), store.open()
+    clock[0] += 30.0
+    assert store.get(a.id) is a
+    c = store.open()
+    assert store.get(b.id) is None and store.evicted == 1
+    clock[0] += 45.0
+    assert store.get(c.id) is c
+    clock[0] += 20.0
+    assert store.get(a.id) is None and store.expired == 1
+    assert len(store) == 1 and store.close(c.id) and len(store) == 0
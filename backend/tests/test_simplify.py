@@ -0,0 +1,157 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from hydro_agent.api.main import app
+from hydro_agent.core.cache import channel_key
+from hydro_agent.core.manning import simplify
+from hydro_agent.core.manning.channels import irregular_section, solve_normal_depth
+from hydro_agent.core.manning.rating import rating_curve
+from hydro_agent.core.manning.schemas import ChannelInput, RatingCurveInput
+from hydro_agent.core.manning.sections import PreparedSection
+
+BASE = {"type": "irregular", "discharge": 2000.0, "slope": 0.002, "mannings_n": 0.035}
+
+
+def _survey(n, vertices=40, seed=0):
+    """A TIN-like section: a valley polyline with `vertices` vertices resampled at n stations."""
+    rng = np.random.default_rng(seed)
+    xv = np.linspace(0.0, 300.0, vertices)
+    zv = 12.0 * ((xv - 150.0) / 150.0) ** 2 + 2.0 * np.sin(xv / 20.0) + rng.normal(0.0, 0.3, vertices)
+    x = np.linspace(0.0, 300.0, n)
+    return x, np.interp(x, xv, zv)
+
+
+def _reference_keep(x, z, scale, epsilon, forced):
+    """Recursive Douglas-Peucker with scaled distances, splitting each segment at its farthest point."""
+    keep = forced.copy()
+    keep[0] = keep[-1] = True
+
+    def split(i, j):
+        if j - i < 2:
+            return
+        dx, dz = x[j] - x[i], z[j] - z[i]
+        distance = np.abs(dx * (z[i + 1:j] - z[i]) - dz * (x[i + 1:j] - x[i])) / np.hypot(dx, dz) / scale[i + 1:j]
+        k = int(np.argmax(distance))
+        if distance[k] > epsilon:
+            keep[i + 1 + k] = True
+            split(i, i + 1 + k)
+            split(i + 1 + k, j)
+
+    anchors = np.flatnonzero(keep)
+    for i, j in zip(anchors[:-1], anchors[1:]):
+        split(i, j)
+    return keep
+
+
+def test_significance_matches_douglas_peucker():
+    rng = np.random.default_rng(3)
+    x = np.sort(rng.uniform(0, 100, 400))
+    z = np.cumsum(rng.normal(0, 0.5, 400))
+    scale = rng.uniform(0.5, 2.0, 400)
+    forced = np.zeros(400, dtype=bool)
+    forced[[int(np.argmin(z)), int(np.argmax(z))]] = True
+    significance = simplify._significance(x, z, scale, forced, floor=1e-3)
+    for epsilon in (1e-3, 0.01, 0.1, 1.0):
+        assert np.array_equal(significance > epsilon, _reference_keep(x, z, scale, epsilon, forced))
+
+
+def test_dense_survey_is_decimated_within_tolerance():
+    x, z = _survey(20000)
+    exact = ChannelInput(**BASE, stations=x, elevations=z)
+    simplified = ChannelInput(**BASE, stations=x, elevations=z, simplify_tolerance=0.001)
+
+    section = irregular_section(simplified)
+    report = section.simplification
+    assert report.original_points == 20000 and report.points <= 60
+    assert max(report.max_area_error, report.max_perimeter_error, report.max_conveyance_error) <= 0.001
+    original = PreparedSection.from_arrays(x, z)
+    assert simplify.section_errors(original, section) == pytest.approx(
+        (report.max_area_error, report.max_perimeter_error, report.max_conveyance_error)
+    )
+    assert (section.min_elevation, section.max_elevation) == (original.min_elevation, original.max_elevation)
+    # Down to the thalweg, area errors stay within the tolerance of the area at ERROR_DEPTH_FRACTION
+    height = original.max_elevation - original.min_elevation
+    shallow = np.linspace(0.0, simplify.ERROR_DEPTH_FRACTION * height, 200)
+    floor = original.geometry_array(shallow[-1:])[0]
+    assert (np.abs(section.geometry_array(shallow)[0] - original.geometry_array(shallow)[0]) <= 0.001 * floor).all()
+
+    assert irregular_section(simplified) is section
+    simplify.clear_simplified_cache()
+    assert irregular_section(simplified) is not section
+
+    expected = solve_normal_depth(exact)
+    result = solve_normal_depth(simplified)
+    assert result.simplification == report
+    assert result.depth == pytest.approx(expected.depth, rel=1e-3)
+    assert result.critical_depth == pytest.approx(expected.critical_depth, rel=1e-3)
+    assert expected.simplification is None
+
+    table = rating_curve(RatingCurveInput(channel=simplified, max_depth=8.0))
+    full = rating_curve(RatingCurveInput(channel=exact, max_depth=8.0))
+    assert len(table.depth) < len(full.depth) and table.simplification.points == report.points
+    # Errors are relative from ERROR_DEPTH_FRACTION of the section height up
+    depth = np.array(full.depth)
+    measured = depth >= simplify.ERROR_DEPTH_FRACTION * (original.max_elevation - original.min_elevation)
+    discharge = np.interp(depth[measured], table.depth, table.discharge)
+    assert discharge == pytest.approx(np.array(full.discharge)[measured], rel=0.01)
+
+
+def test_noisy_survey_keeps_its_wetted_perimeter():
+    # Survey noise is real perimeter, so the error bound keeps the points that carry it
+    rng = np.random.default_rng(1)
+    x = np.linspace(0.0, 300.0, 3000)
+    z = 12.0 * ((x - 150.0) / 150.0) ** 2 + 0.02 * rng.standard_normal(3000)
+    section = irregular_section(ChannelInput(**BASE, stations=x, elevations=z, simplify_tolerance=0.001))
+    assert section.simplification.max_perimeter_error <= 0.001
+    assert simplify.section_errors(PreparedSection.from_arrays(x, z), section)[1] <= 0.001
+
+
+def test_unsimplifiable_section_is_not_modified():
+    section = PreparedSection([(0.0, 10.0), (5.0, 0.0), (10.0, 10.0)])
+    unchanged = simplify.simplify_section(section, 0.001)
+    assert unchanged is not section and section.simplification is None
+    assert unchanged.simplification.points == unchanged.simplification.original_points == 3
+    assert unchanged.geometry(4.0) == section.geometry(4.0)
+
+
+def test_server_default_applies_to_large_sections_only(monkeypatch):
+    x, z = _survey(2000)
+    small = ChannelInput(**BASE, station_elevation_points=list(zip(x[::100], z[::100])))
+    large = ChannelInput(**BASE, stations=x, elevations=z)
+    assert simplify.section_tolerance(large) == 0.0
+    key = channel_key(large)
+
+    monkeypatch.setattr(simplify, "DEFAULT_TOLERANCE", 0.005)
+    monkeypatch.setattr(simplify, "MIN_POINTS", 1000)
+    assert simplify.section_tolerance(large) == 0.005 and simplify.section_tolerance(small) == 0.0
+    assert simplify.section_tolerance(ChannelInput(**BASE, stations=x, elevations=z, simplify_tolerance=0)) == 0.0
+    assert irregular_section(large).simplification.tolerance == 0.005
+    assert irregular_section(small).simplification is None
+    assert channel_key(large) != key
+
+
+def test_solve_endpoint_reports_simplification():
+    x, z = _survey(5000)
+    body = {**BASE, "stations": x.tolist(), "elevations": z.tolist(), "simplify_tolerance": 0.002}
+    response = TestClient(app).post("/api/manning/channels/solve", json=body)
+    assert response.status_code == 200
+    report = response.json()["simplification"]
+    assert report["original_points"] == 5000 and report["points"] < 100
+    assert report["max_conveyance_error"] <= 0.002
+    assert TestClient(app).post("/api/manning/channels/solve", json={**body, "simplify_tolerance": 1.5}).status_code == 422
+
+
+def test_simplified_cache_is_thread_safe(monkeypatch):
+    monkeypatch.setattr(simplify, "SIMPLIFY_CACHE_SIZE", 2)
+    sections = [PreparedSection.from_arrays(*_survey(200, seed=seed)) for seed in range(6)]
+
+    def lookup(i):
+        return simplify.get_simplified_section(sections[i % 6], 0.01).simplification.original_points
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert set(pool.map(lookup, range(600))) == {200}
+    assert len(simplify._simplified_cache) <= 2
+    simplify.clear_simplified_cache()
@@ -0,0 +1,101 @@
+import math
+
+import numpy as np
+import pytest
+
+from hydro_agent.core.curb_inlets.on_grade import _flow_and_geometry_for_spread
+from hydro_agent.core.manning.channels import solve_normal_depth
+from hydro_agent.core.manning.schemas import ChannelInput, ChannelType, SolveFor
+from hydro_agent.core.spread import gutter_discharge, gutter_flow_parts, solve_spread, solve_spread_batch
+
+
+def _bisect_spread(Q, S, n, W, Sg, Sx):
+    lo, hi = 0.0, max(W, 1.0)
+    while _flow_and_geometry_for_spread(hi, S, n, W, Sg, Sx)[0] < Q:
+        hi *= 1.5
+    for _ in range(100):
+        mid = 0.5 * (lo + hi)
+        if _flow_and_geometry_for_spread(mid, S, n, W, Sg, Sx)[0] < Q:
+            lo = mid
+        else:
+            hi = mid
+    return 0.5 * (lo + hi)
+
+
+def test_gutter_discharge_matches_curb_inlet_geometry():
+    for T in (0.5, 1.5, 7.5, 30.0):
+        q, dq = gutter_discharge(T, 0.005, 0.016, 2.0, 0.06, 0.02)
+        assert q == pytest.approx(_flow_and_geometry_for_spread(T, 0.005, 0.016, 2.0, 0.06, 0.02)[0], rel=1e-12)
+        h = 1e-6 * T
+        q_hi, _ = gutter_discharge(T + h, 0.005, 0.016, 2.0, 0.06, 0.02)
+        q_lo, _ = gutter_discharge(T - h, 0.005, 0.016, 2.0, 0.06, 0.02)
+        assert dq == pytest.approx((q_hi - q_lo) / (2 * h), rel=1e-5)
+
+
+def test_gutter_flow_parts_match_curb_inlet_geometry():
+    # One section per row, spreads on both sides of the gutter width
+    T = np.array([0.5, 1.5, 7.5, 30.0, 4.0])
+    W = np.array([2.0, 2.0, 2.0, 3.0, 0.0])
+    Sg = np.array([0.06, 0.06, 0.08, 0.05, 0.04])
+    Sx = np.array([0.02, 0.02, 0.02, 0.03, 0.02])
+    flow = gutter_flow_parts(T, 0.005, 0.016, W, Sg, Sx)
+    for i in range(T.size):
+        q, q_gutter, _, y, y_w, depression, area = _flow_and_geometry_for_spread(T[i], 0.005, 0.016, W[i], Sg[i], Sx[i])
+        expected = (q, q_gutter, y, y_w, depression, area)
+        assert [part[i] for part in flow] == pytest.approx(expected, rel=1e-12)
+
+
+def test_solve_spread_matches_bisection():
+    rng = np.random.default_rng(7)
+    for _ in range(200):
+        Q = 10 ** rng.uniform(-2, 2)
+        S = 10 ** rng.uniform(-4, -1)
+        n = rng.uniform(0.012, 0.02)
+        W = rng.choice([0.0, 1.0, 2.0, 3.0])
+        Sg = rng.uniform(0.03, 0.1)
+        Sx = rng.uniform(0.01, 0.04)
+        root = solve_spread(Q, S, n, W, Sg, Sx)
+        assert root.converged
+        assert root.iterations <= 10
+        assert root.root == pytest.approx(_bisect_spread(Q, S, n, W, Sg, Sx), rel=1e-9)
+
+
+def test_uniform_case_is_closed_form():
+    root = solve_spread(0.05, 0.01, 0.016, 2.0, 0.08, 0.02)
+    assert root.iterations == 0
+    assert root.root <= 2.0
+
+
+def test_solve_spread_rejects_zero_cross_slope():
+    with pytest.raises(ValueError):
+        solve_spread(1.0, 0.01, 0.016, 2.0, 0.0, 0.02)
+
+
+def test_gutter_channel_reports_solver_diagnostics():
+    params = ChannelInput(
+        type=ChannelType.GUTTER,
+        solve_for=SolveFor.SPREAD,
+        discharge=10.0,
+        slope=0.005,
+        mannings_n=0.016,
+        gutter_width=2.0,
+        gutter_cross_slope=0.06,
+        road_cross_slope=0.02,
+    )
+    result = solve_normal_depth(params)
+    assert math.isclose(result.spread, _bisect_spread(10.0, 0.005, 0.016, 2.0, 0.06, 0.02), rel_tol=1e-9)
+    assert result.iterations is not None
+    assert result.residual < 1e-9
+
+
+def test_batch_matches_scalar_spread():
+    Q = np.array([0.5, 3.0, 10.0, 40.0, 0.0, 5.0, 5.0])
+    Sg = np.array([0.06, 0.06, 0.06, 0.06, 0.06, 0.01, -0.02])
+    batch = solve_spread_batch(Q, 0.005, 0.016, 2.0, Sg, 0.02)
+    for i in range(4):
+        expected = solve_spread(Q[i], 0.005, 0.016, 2.0, Sg[i], 0.02)
+        assert batch.root[i] == pytest.approx(expected.root, rel=1e-10)
+    # Sg < Sx: the row is solved on the composite branch like the scalar solver
+    assert batch.root[5] == pytest.approx(solve_spread(5.0, 0.005, 0.016, 2.0, 0.01, 0.02).root, rel=1e-10)
+    assert batch.root[4] == 0.0 and batch.converged[4]
+    assert math.isnan(batch.root[6]) and not batch.converged[6]
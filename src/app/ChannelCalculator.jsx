@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { 
   Info, 
   AlertCircle, 
@@ -10,6 +10,13 @@ import {
 } from 'lucide-react';
 
 const API_BASE = 'http://127.0.0.1:8000/api';
+const NO_POINTS = [];
+
+// Fields of body that differ from the last body sent to the session (arrays by reference)
+const changedFields = (body, sent) => {
+  if (!sent) return body;
+  return Object.fromEntries(Object.entries(body).filter(([key, value]) => value !== sent[key]));
+};
 
 const parseIrregularData = (text) => {
   if (!text) return [];
@@ -260,6 +267,34 @@ const ChannelCalculator = ({ scenario, onUpdate, precision, handlePrecisionChang
   const [isCalculating, setIsCalculating] = useState(false);
   const [showIrregularModal, setShowIrregularModal] = useState(false);
   const [tempIrregularData, setTempIrregularData] = useState('');
+  // Solve session on the server: { id, sent } with the last full body sent to it
+  const sessionRef = useRef(null);
+
+  const openSession = async () => {
+    const response = await fetch(`${API_BASE}/manning/sessions`, { method: 'POST' });
+    if (!response.ok) throw new Error('Could not open a solve session');
+    sessionRef.current = { id: (await response.json()).session_id, sent: null };
+  };
+
+  // Send only the fields that changed since the last edit; reopen and resend everything if the session expired
+  const solveInSession = async (body) => {
+    const post = (payload) => fetch(`${API_BASE}/manning/sessions/${sessionRef.current.id}/solve`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(payload)
+    });
+    if (!sessionRef.current) await openSession();
+    const changes = changedFields(body, sessionRef.current.sent);
+    sessionRef.current.sent = body;
+    let response = await post(changes);
+    if (response.status === 404) {
+      await openSession();
+      sessionRef.current.sent = body;
+      response = await post(body);
+    }
+    if (!response.ok) sessionRef.current.sent = null;
+    return response;
+  };
 
   const solveNormalDepth = async () => {
     const { 
@@ -317,28 +352,24 @@ const ChannelCalculator = ({ scenario, onUpdate, precision, handlePrecisionChang
 
     setIsCalculating(true);
     try {
-      const response = await fetch(`${API_BASE}/manning/channels/solve`, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({
-          type, 
-          solve_for: solveFor || 'depth',
-          discharge: solveFor === 'discharge' ? null : discharge, 
-          bottom_width: width, 
-          side_slope: sideSlope,
-          left_side_slope: leftSideSlope, 
-          right_side_slope: rightSideSlope,
-          slope, 
-          mannings_n: manningsN, 
-          units,
-          station_elevation_points: type === 'irregular' ? irregularPoints : [],
-          gutter_width: gutterWidth,
-          gutter_cross_slope: gutterCrossSlope,
-          road_cross_slope: roadCrossSlope,
-          spread: spread,
-          known_depth: normalDepth,
-          known_wse: waterSurfaceElevation
-        })
+      const response = await solveInSession({
+        type, 
+        solve_for: solveFor || 'depth',
+        discharge: solveFor === 'discharge' ? null : discharge, 
+        bottom_width: width, 
+        side_slope: sideSlope,
+        left_side_slope: leftSideSlope, 
+        right_side_slope: rightSideSlope,
+        slope, 
+        mannings_n: manningsN, 
+        units,
+        station_elevation_points: type === 'irregular' ? irregularPoints : NO_POINTS,
+        gutter_width: gutterWidth,
+        gutter_cross_slope: gutterCrossSlope,
+        road_cross_slope: roadCrossSlope,
+        spread: spread,
+        known_depth: normalDepth,
+        known_wse: waterSurfaceElevation
       });
       if (!response.ok) {
         const errData = await response.json();
@@ -368,6 +399,12 @@ const ChannelCalculator = ({ scenario, onUpdate, precision, handlePrecisionChang
     return () => clearTimeout(timer);
   }, [scenario]);
 
+  useEffect(() => () => {
+    if (sessionRef.current) {
+      fetch(`${API_BASE}/manning/sessions/${sessionRef.current.id}`, { method: 'DELETE', keepalive: true }).catch(() => {});
+    }
+  }, []);
+
   const handleInputChange = (e) => {
     const { name, value } = e.target;
     onUpdate({ [name]: parseFloat(value) || 0 });